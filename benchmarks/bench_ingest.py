@@ -0,0 +1,109 @@
+"""수집(process_*) 벤치마크: 행 단위 루프 구현 대비 컬럼 단위 매핑 구현의 처리 시간 비교
+
+    python -m benchmarks.bench_ingest --rows 300000
+
+투자성과 시트 rows행과 사업화/기술료 시트 각 rows/5행의 합성 원본을 만들어 두 구현의 결과가
+같은지 확인한 뒤 함수별 소요시간을 출력한다.
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_loader
+from benchmarks import legacy_data_loader
+
+AREAS = {
+    '온실가스 감축': ['재생에너지', '에너지저장'],
+    '기후변화 적응': ['물관리', '농업적응'],
+    '환경': ['대기', '수질']
+}
+
+def make_raw_sheets(rows, seed=0):
+    """엑셀 시트를 읽은 것과 같은 형식의 투자성과/사업화/기술료 원본 데이터 생성"""
+    rng = np.random.default_rng(seed)
+    areas = rng.choice(list(AREAS), rows)
+    medium = np.resize(np.array([rng.choice(AREAS[area]) for area in areas[:1000]]), rows)
+    institutes = np.array([
+        f"{prefix}{suffix}"
+        for prefix, suffix in zip(rng.choice(['서울', '부산', '대전', '경기', '한국', 'KA', '충북'], 5000),
+                                  rng.choice(['대학교', '연구원', '테크', '산업'], 5000))
+    ])
+    institutes = np.resize(institutes, rows).astype(object)
+    institutes[rng.random(rows) < 0.02] = np.nan
+    
+    investment = pd.DataFrame({
+        '유형': rng.choice(['투자', '논문', '특허', '기타'], rows, p=[.5, .25, .2, .05]),
+        '과제수행년도': rng.integers(2014, 2026, rows),
+        '성과발생년도': rng.integers(2015, 2026, rows),
+        '사업_부처명': rng.choice(np.array(['과기부', '산업부', '환경부', np.nan], dtype=object), rows),
+        '대분류': areas,
+        '중분류': medium,
+        '소분류': np.char.add(medium.astype(str), rng.choice(['A', 'B'], rows)),
+        '연구개발단계': rng.choice(['기초연구', '응용연구', '개발연구', '기타'], rows),
+        '연구수행주체': institutes,
+        '정부연구비(억원)': rng.random(rows) * 10,
+        '기여율(%)': rng.random(rows) * 100,
+        '과제고유번호': rng.integers(1e9, 2e9, rows).astype(str),
+        '과제명': '과제'
+    })
+    
+    other_rows = rows // 5
+    common = {
+        '과제수행년도': rng.integers(2015, 2025, other_rows),
+        '성과발생년도': rng.integers(2015, 2025, other_rows),
+        '성과발생부처': rng.choice(['과기부', '산업부'], other_rows),
+        '분류명': rng.choice(list(AREAS), other_rows),
+        '연구수행주체': np.resize(institutes, other_rows),
+        '과제고유번호': 'P',
+        '과제명-국문': '과제'
+    }
+    commercialization = pd.DataFrame({
+        **common,
+        '연구개발단계': '개발연구',
+        '당해년도매출액(백만원)': rng.random(other_rows) * 100,
+        '업체명': '업체',
+        '고용창출인원수(명)': rng.integers(0, 5, other_rows)
+    })
+    technology_fee = pd.DataFrame({
+        **common,
+        '연구개발단계': '응용연구',
+        '당해연도 기술료(백만원)': rng.random(other_rows) * 100,
+        '기술실시계약명': '계약'
+    })
+    return {
+        'process_investment_performance_data': investment,
+        'process_commercialization_data': commercialization,
+        'process_technology_fee_data': technology_fee
+    }
+
+def _best_time(func, df, repeat):
+    """repeat번 실행 중 가장 짧은 소요시간과 마지막 결과"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    parser = argparse.ArgumentParser(description="수집(process_*) 벤치마크")
+    parser.add_argument('--rows', type=int, default=300_000, help="투자성과 시트 행 수 (사업화/기술료는 1/5)")
+    parser.add_argument('--repeat', type=int, default=3, help="벡터화 구현 반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+    
+    print(f"pandas {pd.__version__}, numpy {np.__version__}")
+    for name, raw in make_raw_sheets(args.rows).items():
+        # 행 단위 루프는 느리므로 한 번만 실행
+        legacy_seconds, expected = _best_time(getattr(legacy_data_loader, name), raw, 1)
+        seconds, result = _best_time(getattr(data_loader, name), raw, args.repeat)
+        pd.testing.assert_frame_equal(result, expected)
+        print(f"{name}: {len(raw):,}행 → {len(result):,}행, "
+              f"{legacy_seconds:.2f}초 → {seconds:.3f}초 ({legacy_seconds / seconds:,.0f}배)")
+
+if __name__ == "__main__":
+    main()
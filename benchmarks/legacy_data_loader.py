@@ -0,0 +1,101 @@
+"""벡터화 이전 process_* 구현 (행 단위 iterrows 루프)
+
+동등성 테스트(tests/test_data_loader.py)와 수집 벤치마크(bench_ingest.py)의 비교 기준으로만 사용한다.
+"""
+import pandas as pd
+
+def process_investment_performance_data(df):
+    """투자성과 데이터 처리"""
+    processed_data = []
+    
+    for _, row in df.iterrows():
+        record_type = row['유형']
+        
+        if record_type == '투자':
+            processed_data.append({
+                'year': row['과제수행년도'],
+                'ministry': row.get('사업_부처명', ''),
+                'research_area': row.get('대분류', '기타'),
+                'research_area_medium': row.get('중분류', ''),
+                'research_area_small': row.get('소분류', ''),
+                'project_type': row.get('연구개발단계', '기타'),
+                'institute': row.get('연구수행주체', '기타'),
+                'budget_billion': float(row.get('정부연구비(억원)', 0)),
+                'project_count': 1,
+                'performance_type': '투자',
+                'performance_value': float(row.get('정부연구비(억원)', 0)),
+                'performance_year': row['과제수행년도'],
+                'project_id': row.get('과제고유번호', ''),
+                'project_name': row.get('과제명', '')
+            })
+        
+        elif record_type in ['논문', '특허']:
+            processed_data.append({
+                'year': row['과제수행년도'],
+                'ministry': row.get('사업_부처명', ''),
+                'research_area': row.get('대분류', '기타'),
+                'research_area_medium': row.get('중분류', ''),
+                'research_area_small': row.get('소분류', ''),
+                'project_type': row.get('연구개발단계', '기타'),
+                'institute': row.get('연구수행주체', '기타'),
+                'budget_billion': 0,
+                'project_count': 1,
+                'performance_type': record_type,
+                'performance_value': float(row.get('기여율(%)', 0)),
+                'performance_year': row['성과발생년도'],
+                'project_id': row.get('과제고유번호', ''),
+                'project_name': row.get('과제명', '')
+            })
+    
+    return pd.DataFrame(processed_data)
+
+def process_commercialization_data(df):
+    """사업화 데이터 처리"""
+    processed_data = []
+    
+    for _, row in df.iterrows():
+        processed_data.append({
+            'year': row['과제수행년도'],
+            'ministry': row.get('성과발생부처', ''),
+            'research_area': row.get('분류명', '기타'),
+            'research_area_medium': '',
+            'research_area_small': '',
+            'project_type': row.get('연구개발단계', '기타'),
+            'institute': row.get('연구수행주체', '기타'),
+            'budget_billion': 0,
+            'project_count': 1,
+            'performance_type': '사업화',
+            'performance_value': float(row.get('당해년도매출액(백만원)', 0)),
+            'performance_year': row['성과발생년도'],
+            'project_id': row.get('과제고유번호', ''),
+            'project_name': row.get('과제명-국문', ''),
+            'company_name': row.get('업체명', ''),
+            'employment': row.get('고용창출인원수(명)', 0)
+        })
+    
+    return pd.DataFrame(processed_data)
+
+def process_technology_fee_data(df):
+    """기술료 데이터 처리"""
+    processed_data = []
+    
+    for _, row in df.iterrows():
+        processed_data.append({
+            'year': row['과제수행년도'],
+            'ministry': row.get('성과발생부처', ''),
+            'research_area': row.get('분류명', '기타'),
+            'research_area_medium': '',
+            'research_area_small': '',
+            'project_type': row.get('연구개발단계', '기타'),
+            'institute': row.get('연구수행주체', '기타'),
+            'budget_billion': 0,
+            'project_count': 1,
+            'performance_type': '기술료',
+            'performance_value': float(row.get('당해연도 기술료(백만원)', 0)),
+            'performance_year': row['성과발생년도'],
+            'project_id': row.get('과제고유번호', ''),
+            'project_name': row.get('과제명-국문', ''),
+            'contract_name': row.get('기술실시계약명', '')
+        })
+    
+    return pd.DataFrame(processed_data)
@@ -4,6 +4,13 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from utils.aggregation import group_sum, bucket_top_k
+from utils.time_series import year_panel, year_over_year, panel_frame
+
+# 차트별 상위 항목 수 (나머지는 '기타'로 합산하여 조각·범주 수 제한)
+TOP_K = {
+    'climate_institute': 10
+}
 
 def render_climate_analysis(filtered_df, filter_config):
     """기후변화 대응 기술 분석 렌더링"""
@@ -42,13 +49,10 @@ def render_climate_analysis(filtered_df, filter_config):
         'colorway': ocean_colors
     }
     
-    # 감축/적응 직접 필터링
-    if 'research_area' in climate_df.columns:
-        # 감축, 적응 키워드가 있는 데이터만 필터링
-        climate_df['category'] = climate_df['research_area'].apply(
-            lambda x: '감축' if '감축' in x else ('적응' if '적응' in x else None)
-        )
-        climate_df = climate_df[climate_df['category'].notna()]  # 감축/적응 분류된 데이터만 유지
+    # 감축/적응 필터링 (climate_category: 수집 시 연구분야 키워드로 태그한 범주형 컬럼)
+    if 'climate_category' in climate_df.columns:
+        climate_df = climate_df[climate_df['climate_category'].notna()]  # 감축/적응 분류된 데이터만 유지
+        climate_df = climate_df.assign(category=climate_df['climate_category'])
     
     if climate_df.empty:
         st.warning("감축/적응 관련 데이터가 없습니다.")
@@ -59,18 +63,13 @@ def render_climate_analysis(filtered_df, filter_config):
     with col1:
         # 1. 연도별 기후변화 투자 추이 (바차트 + 연평균증가율 꺾은선)
         # 연도별 감축/적응별 투자액 집계
-        yearly_category = climate_df.groupby(['year', 'category'])['budget_billion'].sum().reset_index()
-        yearly_total = climate_df.groupby('year')['budget_billion'].sum().reset_index()
-        
-        # 연평균증가율 계산
-        yearly_total = yearly_total.sort_values('year')
-        yearly_total['growth_rate'] = 0.0
+        yearly_category = group_sum(climate_df, ['year', 'category'], ['budget_billion']).reset_index()
+        yearly_total = group_sum(climate_df, ['year'], ['budget_billion']).reset_index()
         
-        for i in range(1, len(yearly_total)):
-            prev_value = yearly_total.iloc[i-1]['budget_billion']
-            curr_value = yearly_total.iloc[i]['budget_billion']
-            if prev_value > 0:
-                yearly_total.loc[yearly_total.index[i], 'growth_rate'] = (curr_value / prev_value - 1) * 100
+        # 연평균증가율 계산 (데이터가 있는 직전 연도 대비, 계산할 수 없으면 0)
+        total_panel = year_panel(yearly_total, None, 'budget_billion')
+        growth_rate = np.nan_to_num(year_over_year(total_panel, skip_missing=True))
+        yearly_total = panel_frame(total_panel, growth_rate=growth_rate)
         
         # 서브플롯 생성 (두 개의 y축)
         fig1 = make_subplots(specs=[[{"secondary_y": True}]])
@@ -161,8 +160,8 @@ def render_climate_analysis(filtered_df, filter_config):
     
     with col2:
         # 2. 부처별 감축/적응 투자 (그룹 바)
-        ministry_category = climate_df.groupby(['ministry', 'category'])['budget_billion'].sum().reset_index()
-        ministry_total = climate_df.groupby('ministry')['budget_billion'].sum().reset_index()
+        ministry_category = group_sum(climate_df, ['ministry', 'category'], ['budget_billion']).reset_index()
+        ministry_total = group_sum(climate_df, ['ministry'], ['budget_billion']).reset_index()
         ministry_total = ministry_total.sort_values('budget_billion', ascending=False)
         
         # 상위 10개 부처만 선택
@@ -256,7 +255,8 @@ def render_climate_analysis(filtered_df, filter_config):
         # 감축 파이차트
         mitigation_df = climate_df[climate_df['category'] == '감축']
         if not mitigation_df.empty:
-            mitigation_inst = mitigation_df.groupby('institute')['budget_billion'].sum().reset_index()
+            mitigation_inst = group_sum(mitigation_df, ['institute'], ['budget_billion']).reset_index()
+            mitigation_inst = bucket_top_k(mitigation_inst, 'institute', 'budget_billion', TOP_K['climate_institute'])
             fig3.add_trace(
                 go.Pie(
                     labels=mitigation_inst['institute'],
@@ -275,7 +275,8 @@ def render_climate_analysis(filtered_df, filter_config):
         # 적응 파이차트
         adaptation_df = climate_df[climate_df['category'] == '적응']
         if not adaptation_df.empty:
-            adaptation_inst = adaptation_df.groupby('institute')['budget_billion'].sum().reset_index()
+            adaptation_inst = group_sum(adaptation_df, ['institute'], ['budget_billion']).reset_index()
+            adaptation_inst = bucket_top_k(adaptation_inst, 'institute', 'budget_billion', TOP_K['climate_institute'])
             fig3.add_trace(
                 go.Pie(
                     labels=adaptation_inst['institute'],
@@ -305,7 +306,7 @@ def render_climate_analysis(filtered_df, filter_config):
         # 연구단계별 분포 (감축/적응 분할)
         if 'project_type' in climate_df.columns:
             # 연구단계 x 감축/적응 교차 테이블
-            type_category = climate_df.groupby(['project_type', 'category'])['budget_billion'].sum().reset_index()
+            type_category = group_sum(climate_df, ['project_type', 'category'], ['budget_billion']).reset_index()
             
             fig4 = px.bar(
                 type_category, 
@@ -318,7 +319,7 @@ def render_climate_analysis(filtered_df, filter_config):
             )
             
             # Y축 범위 계산 (최대값의 약 120%로 설정)
-            max_budget = type_category.groupby('project_type')['budget_billion'].sum().max()
+            max_budget = group_sum(type_category, ['project_type'], ['budget_billion'])['budget_billion'].max()
             y_max = max_budget * 1.2
             
             fig4.update_traces(
@@ -1,73 +1,192 @@
+import math
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import datetime
+from utils.aggregation import ROW_COUNT, build_cube, cube_series
+from utils.data_filters import cached_value
 
-def render_data_table(filtered_df):
-    """상세 투자 데이터 테이블 렌더링"""
+# 데이터 테이블 요약 지표에 사용하는 집계 (차원, 측정값)
+AGGREGATES = [
+    (['year'], 'budget_billion'),
+    (['year'], 'project_count'),
+    (['year'], ROW_COUNT)
+]
+
+# 컬럼명 한글화
+COLUMN_LABELS = {
+    'year': '연도',
+    'ministry': '부처',
+    'research_area': '연구분야(대)',
+    'research_area_medium': '연구분야(중)',
+    'research_area_small': '연구분야(소)',
+    'project_type': '연구단계',
+    'institute': '수행주체',
+    'budget_billion': '투자예산(억원)',
+    'project_count': '과제수',
+    'performance_type': '성과유형',
+    'performance_value': '성과값',
+    'performance_year': '성과발생년도',
+    'project_id': '과제번호',
+    'project_name': '과제명',
+    'region': '지역',
+    'region_confidence': '지역판정',
+    'climate_category': '기후분류',
+    'climate_related': '기후관련',
+    'success_rate': '성공률'
+}
+
+# 기본 정렬 (연도 → 투자예산)
+DEFAULT_SORT = ['year', 'budget_billion']
+DEFAULT_SORT_LABEL = "기본 (연도 → 투자예산)"
+
+# 한 페이지에 표시할 행 수 선택지
+PAGE_SIZES = [25, 50, 100, 200, 500]
+DEFAULT_PAGE_SIZE = 50
+
+def render_data_table(filtered_df, cube=None, cache=None, filter_key=None):
+    """상세 투자 데이터 테이블 렌더링 (cube: 공유 집계 큐브, cache/filter_key: 정렬 순서·검색 결과 캐시)"""
     st.subheader("📋 상세 투자 데이터")
     
-    # Raw 데이터 표시
-    display_df = filtered_df.copy()
-    display_df = display_df.sort_values(['year', 'budget_billion'], ascending=[False, False])
+    if cube is None:
+        cube = build_cube(filtered_df, AGGREGATES)
     
-    # 컬럼명 한글화
-    column_mapping = {
-        'year': '연도',
-        'ministry': '부처', 
-        'research_area': '연구분야(대)',
-        'research_area_medium': '연구분야(중)',
-        'research_area_small': '연구분야(소)',
-        'project_type': '연구단계',
-        'institute': '수행주체',
-        'budget_billion': '투자예산(억원)',
-        'project_count': '과제수',
-        'performance_type': '성과유형',
-        'performance_value': '성과값',
-        'performance_year': '성과발생년도',
-        'project_id': '과제번호',
-        'project_name': '과제명'
-    }
+    render_table_page(filtered_df, cache, filter_key)
     
-    # 존재하는 컬럼만 매핑
-    existing_columns = {k: v for k, v in column_mapping.items() if k in display_df.columns}
-    display_df = display_df.rename(columns=existing_columns)
+    # 요약 정보 (표시용 복사본 대신 집계 큐브에서 조회)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("표시된 레코드", f"{cube_series(cube, ['year'], ROW_COUNT).sum():,}개")
+    with col2:
+        total_budget = cube_series(cube, ['year'], 'budget_billion').sum() if 'budget_billion' in filtered_df.columns else 0
+        st.metric("총 투자예산", f"{total_budget:,.0f}억원")
+    with col3:
+        total_projects = cube_series(cube, ['year'], 'project_count').sum() if 'project_count' in filtered_df.columns else 0
+        st.metric("총 과제수", f"{total_projects:,}개")
+
+def _cached(cache, key, compute, sizeof):
+    """캐시가 있으면 cached_value로 재사용, 없으면 바로 계산"""
+    if cache is None:
+        return compute()
+    return cached_value(cache, key, compute, sizeof)
+
+def sort_permutation(df, columns, ascending):
+    """columns 기준 정렬 순서 (행 위치 배열, 같은 값은 원래 순서 유지, 결측값은 마지막)"""
+    keys = pd.DataFrame({column: df[column].to_numpy() for column in columns})
+    try:
+        order = keys.sort_values(columns, ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+    except TypeError:
+        # 서로 비교할 수 없는 값이 섞인 컬럼은 문자열 기준으로 정렬
+        keys = keys.astype(str).where(keys.notna())
+        order = keys.sort_values(columns, ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+    order = order.astype(np.int32) if len(order) < np.iinfo(np.int32).max else order
+    order.flags.writeable = False
+    return order
+
+def _display_values(column, values):
+    """표시용 값 변환 (성공률은 퍼센트)"""
+    if column == 'success_rate':
+        return (values * 100).round(1)
+    return values
+
+def search_mask(df, columns, term):
+    """검색어가 어느 컬럼 값에든 포함된 행 (대소문자 무시, 컬럼별 고유값만 문자열 검사)"""
+    mask = np.zeros(len(df), dtype=bool)
+    for column in columns:
+        codes, uniques = pd.factorize(df[column])
+        if not len(uniques):
+            continue
+        labels = pd.Index(_display_values(column, pd.Series(uniques))).astype(str)
+        hits = np.asarray(labels.str.contains(term, case=False, regex=False), dtype=bool)
+        mask |= (codes >= 0) & hits[np.maximum(codes, 0)]
+    return mask
+
+def display_frame(df, rows, columns):
+    """선택한 행(위치)과 컬럼만 잘라 표시용으로 변환 (컬럼명 한글화, 성공률 퍼센트)"""
+    page_df = df.iloc[rows][columns].reset_index(drop=True)
+    if 'success_rate' in page_df.columns:
+        page_df['success_rate'] = _display_values('success_rate', page_df['success_rate'])
+    return page_df.rename(columns={k: v for k, v in COLUMN_LABELS.items() if k in page_df.columns})
+
+@st.fragment
+def render_table_page(filtered_df, cache=None, filter_key=None):
+    """검색·정렬·컬럼 선택과 현재 페이지 테이블 (프래그먼트: 페이지 이동 시 이 패널만 갱신)
     
-    # 성공률이 있으면 퍼센트로 표시
-    if 'success_rate' in filtered_df.columns:
-        display_df = display_df.rename(columns={'success_rate': '성공률'})
-        display_df['성공률'] = (display_df['성공률'] * 100).round(1)
+    정렬 순서와 검색 결과는 행 위치 배열로 (필터 상태, 정렬/검색 조건)별 캐시에 보관하고,
+    화면에는 현재 페이지 행만 잘라 보낸다.
+    """
+    all_columns = list(filtered_df.columns)
+    column_label = lambda column: COLUMN_LABELS.get(column, column)
     
     # 검색 기능
     search_term = st.text_input("데이터 검색 (부처, 연구분야, 연구단계 등)", "")
     
-    if search_term:
-        search_mask = display_df.astype(str).apply(
-            lambda row: row.str.contains(search_term, case=False, na=False).any(), axis=1
-        )
-        filtered_display_df = display_df[search_mask]
-        st.dataframe(filtered_display_df, use_container_width=True, hide_index=True)
-    else:
-        st.dataframe(display_df, use_container_width=True, hide_index=True)
-    
-    # 요약 정보
-    col1, col2, col3 = st.columns(3)
+    sort_options = ([DEFAULT_SORT_LABEL] if all(c in all_columns for c in DEFAULT_SORT) else []) + all_columns
+    col1, col2, col3 = st.columns([2, 1, 1])
     with col1:
-        st.metric("표시된 레코드", f"{len(display_df):,}개")
+        sort_column = st.selectbox(
+            "정렬 기준",
+            sort_options,
+            format_func=lambda option: option if option == DEFAULT_SORT_LABEL else column_label(option),
+            key='data_table_sort'
+        )
     with col2:
-        st.metric("총 투자예산", f"{display_df.get('투자예산(억원)', pd.Series([0])).sum():,.0f}억원")
+        descending = st.toggle("내림차순", value=True, key='data_table_descending')
     with col3:
-        st.metric("총 과제수", f"{display_df.get('과제수', pd.Series([0])).sum():,}개")
+        page_size = st.selectbox("페이지 크기", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE), key='data_table_page_size')
     
-    # 다운로드 기능
-    @st.cache_data
-    def convert_df(df):
-        return df.to_csv(index=False).encode('utf-8')
+    columns = st.multiselect(
+        "표시할 컬럼",
+        all_columns,
+        default=all_columns,
+        format_func=column_label,
+        key='data_table_columns'
+    ) or all_columns
     
-    csv = convert_df(display_df)
+    # 정렬 순서 (필터 상태·정렬 조건별로 한 번 계산)
+    sort_columns = DEFAULT_SORT if sort_column == DEFAULT_SORT_LABEL else [sort_column]
+    order = _cached(
+        cache,
+        f"table_sort:{filter_key}:{sort_columns}:{descending}",
+        lambda: sort_permutation(filtered_df, sort_columns, not descending),
+        lambda order: order.nbytes
+    )
     
-    st.download_button(
-        label="📥 데이터 CSV 다운로드",
-        data=csv,
-        file_name=f'국가연구개발투자분석_{datetime.now().strftime("%Y%m%d")}.csv',
-        mime='text/csv'
-    )
\ No newline at end of file
+    # 검색 결과를 정렬 순서에 적용
+    if search_term:
+        mask = _cached(
+            cache,
+            f"table_search:{filter_key}:{search_term}",
+            lambda: search_mask(filtered_df, all_columns, search_term),
+            lambda mask: mask.nbytes
+        )
+        order = order[mask[order]]
+
+    # 검색어/정렬/페이지 크기가 바뀌면 첫 페이지로
+    n_pages = max(math.ceil(len(order) / page_size), 1)
+    view_state = (search_term, sort_column, descending, page_size)
+    if st.session_state.get('data_table_view') != view_state or st.session_state.get('data_table_page', 1) > n_pages:
+        st.session_state['data_table_page'] = 1
+    st.session_state['data_table_view'] = view_state
+    
+    page = st.number_input("페이지", min_value=1, max_value=n_pages, step=1, key='data_table_page')
+    start = (page - 1) * page_size
+    rows = order[start:start + page_size]
+    
+    st.dataframe(display_frame(filtered_df, rows, columns), use_container_width=True, hide_index=True)
+    st.caption(f"전체 {len(order):,}개 중 {min(start + 1, len(order)):,}–{start + len(rows):,}번째 (페이지 {page:,}/{n_pages:,})")
+    
+    # 다운로드 기능 (요청할 때만 현재 검색·정렬 결과 전체를 CSV로 변환)
+    if st.checkbox("CSV 다운로드 준비 (현재 검색·정렬 결과 전체)", key='data_table_csv'):
+        csv = _cached(
+            cache,
+            f"table_csv:{filter_key}:{search_term}:{sort_columns}:{descending}:{columns}",
+            lambda: display_frame(filtered_df, order, columns).to_csv(index=False).encode('utf-8'),
+            len
+        )
+        st.download_button(
+            label="📥 데이터 CSV 다운로드",
+            data=csv,
+            file_name=f'국가연구개발투자분석_{datetime.now().strftime("%Y%m%d")}.csv',
+            mime='text/csv'
+        )
@@ -1,17 +1,50 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+from scipy import sparse
 import plotly.express as px
 import plotly.graph_objects as go
+from utils.data_processing import TAXONOMY_LEVELS
+from utils.aggregation import OTHER_LABEL, build_cube, cube_frame, bucket_top_k
+from utils.chart_helpers import plotly_chart_cached, year_stepper_chart
+from utils.data_filters import cached_value, create_selection_cache
 
-def render_landscape_analysis(filtered_df, filter_config):
-    """R&D 투자 Landscape 분석 렌더링 - 사이드바 설정 기반"""
+# 분석 차원 (x 컬럼, y 컬럼) - 기술분야는 연구분야 트리의 각 수준
+LANDSCAPE_PAIRS = [
+    (tech_col, y_col)
+    for _, tech_col in TAXONOMY_LEVELS
+    for y_col in ['institute', 'project_type']
+] + [('ministry', 'project_type')]
+
+# 차원 쌍 피벗에 담는 측정값
+PAIR_MEASURES = ['budget_billion', 'project_count']
+
+# 히트맵/3D Surface에 표시할 최대 행(y)/열(x) 수 - 나머지는 '기타' 한 칸으로 합산
+LANDSCAPE_MAX_ROWS = 30
+LANDSCAPE_MAX_COLUMNS = 30
+
+# 버블/애니메이션 차트별 최대 (x, y) 항목 수 - 나머지는 '기타' 한 항목으로 합산
+TOP_K = {
+    'landscape_bubble': (LANDSCAPE_MAX_COLUMNS, LANDSCAPE_MAX_ROWS),
+    'landscape_animation': (20, 20)
+}
+
+# Landscape 분석에서 사용하는 집계 (차원, 측정값) - 차원 쌍마다 (x, y, 연도) 합계 하나
+AGGREGATES = [
+    ([x_col, y_col, 'year'], measure)
+    for x_col, y_col in LANDSCAPE_PAIRS
+    for measure in PAIR_MEASURES
+]
+
+def render_landscape_analysis(filtered_df, filter_config, cube=None, cache=None, filter_key=None):
+    """R&D 투자 Landscape 분석 렌더링 - 사이드바 설정 기반 (cube: 공유 집계 큐브, 없으면 직접 계산, cache/filter_key: 차원 쌍 피벗 캐시)"""
     st.header("🌐 R&D 투자 Landscape 분석")
     st.markdown("### 다차원 투자 패턴 분석")
 
     selected_years = filter_config['selected_years']
     is_multi_year = len(selected_years) > 1
     
-    # 사이드바에서 선택된 기술분야 수준 가져오기
+    # 사이드바에서 선택된 기술분야 수준 가져오기 (연구분야 트리 기준)
     tech_levels = filter_config.get('tech_levels', ['대분류'])
     
     if not tech_levels:
@@ -19,11 +52,7 @@ def render_landscape_analysis(filtered_df, filter_config):
         return
     
     # 기술 분야 수준별 컬럼 매핑
-    tech_column_mapping = {
-        "대분류": "research_area",
-        "중분류": "research_area_medium", 
-        "소분류": "research_area_small"
-    }
+    tech_column_mapping = dict(TAXONOMY_LEVELS)
     
     # 모든 분석 차원 정의
     all_dimensions = ["기술분야 × 수행주체", "기술분야 × 연구단계", "부처 × 연구단계"]
@@ -31,6 +60,12 @@ def render_landscape_analysis(filtered_df, filter_config):
     # 모든 시각화 방식 정의
     all_viz_methods = ["Heatmap", "Bubble Plot", "3D Surface", "Animation"]
     
+    if cube is None:
+        cube = build_cube(filtered_df, AGGREGATES)
+    if cache is None:
+        # 공유 캐시가 없으면 이번 렌더링 동안만 쓰는 캐시로 차원 쌍 피벗을 네 가지 보기가 공유
+        cache = create_selection_cache()
+    
     analysis_count = 1
     
     # 모든 분석 차원에 대해 처리
@@ -56,19 +91,19 @@ def render_landscape_analysis(filtered_df, filter_config):
                     full_dimension = f"기술분야({tech_level}) × 연구단계"
                 
                 st.subheader(f"{analysis_count}. {full_dimension}")
-                _render_dimension_analysis(filtered_df, tech_col, y_col, full_dimension, all_viz_methods, is_multi_year)
+                _render_dimension_analysis(filtered_df, tech_col, y_col, full_dimension, all_viz_methods, is_multi_year, cube, cache, filter_key)
                 analysis_count += 1
         
         # 부처 × 연구단계
         elif dimension == "부처 × 연구단계":
             if 'project_type' in filtered_df.columns:
                 st.subheader(f"{analysis_count}. 부처 × 연구단계")
-                _render_dimension_analysis(filtered_df, "ministry", "project_type", "부처 × 연구단계", all_viz_methods, is_multi_year)
+                _render_dimension_analysis(filtered_df, "ministry", "project_type", "부처 × 연구단계", all_viz_methods, is_multi_year, cube, cache, filter_key)
                 analysis_count += 1
             else:
                 st.info("연구단계 데이터가 없어서 부처 × 연구단계 분석을 건너뜁니다.")
 
-def _render_dimension_analysis(filtered_df, x_col, y_col, dimension_name, viz_methods, is_multi_year):
+def _render_dimension_analysis(filtered_df, x_col, y_col, dimension_name, viz_methods, is_multi_year, cube, cache, filter_key):
     """특정 차원에 대한 모든 시각화 분석 - 2x2 격자 배치"""
     
     # 데이터 확인
@@ -76,9 +111,9 @@ def _render_dimension_analysis(filtered_df, x_col, y_col, dimension_name, viz_me
         st.warning(f"{dimension_name} 분석을 위한 데이터가 없습니다.")
         return
     
-    # 결측값 제거
-    analysis_df = filtered_df.dropna(subset=[x_col, y_col])
-    if len(analysis_df) == 0:
+    # 두 차원 모두 값이 있는 행이 있는지만 확인 (쌍마다 프레임을 복사하지 않음)
+    # 결측 차원 행은 큐브/groupby 집계에서 키가 결측이라 제외되므로 원본을 그대로 넘긴다
+    if not (filtered_df[x_col].notna() & filtered_df[y_col].notna()).any():
         st.warning(f"{dimension_name} 분석을 위한 유효한 데이터가 없습니다.")
         return
     
@@ -87,26 +122,148 @@ def _render_dimension_analysis(filtered_df, x_col, y_col, dimension_name, viz_me
     
     with col1:
         st.subheader("📊 Heatmap")
-        _render_heatmap(analysis_df, x_col, y_col, dimension_name)
+        _render_heatmap(filtered_df, x_col, y_col, dimension_name, cube, cache, filter_key)
         
         st.subheader("🎯 3D Surface")
-        _render_3d_surface(analysis_df, x_col, y_col, dimension_name)
+        _render_3d_surface(filtered_df, x_col, y_col, dimension_name, cube, cache, filter_key)
     
     with col2:
         st.subheader("🫧 Bubble Plot")
-        _render_bubble_plot(analysis_df, x_col, y_col, dimension_name)
+        _render_bubble_plot(filtered_df, x_col, y_col, dimension_name, cube, cache, filter_key)
         
         st.subheader("🎬 Animation")
         if is_multi_year:
-            _render_animation(analysis_df, x_col, y_col, dimension_name)
+            _render_animation(filtered_df, x_col, y_col, dimension_name, cube, cache, filter_key)
         else:
             st.info("애니메이션을 보려면 사이드바에서 여러 연도를 선택해주세요.")
 
-def _render_heatmap(df, x_col, y_col, title):
+def _pair_pivot(cube, df, x_col, y_col, cache, filter_key):
+    """차원 쌍의 (x, y, 연도) 합계와 (y × x) 희소 합계 행렬 (쌍마다 한 번 만들어 네 가지 보기가 공유)
+    
+    cells는 값이 있는 (x, y, 연도) 칸만 담은 긴 형식이고, totals는 연도를 합친 측정값별 y × x CSR 행렬,
+    counts는 칸별 (x, y, 연도) 조합 수 CSR 행렬이다 (0보다 크면 값이 있는 칸).
+    피벗은 공유 큐브에 붙이지 않고 필터 상태 해시별로 cache에 따로 보관하여 캐시 한도에 포함시킨다.
+    """
+    measures = [measure for measure in PAIR_MEASURES if measure in df.columns]
+    return cached_value(
+        cache,
+        f"landscape_pivot:{filter_key}:{x_col}:{y_col}:{measures}",
+        lambda: _build_pair_pivot(cube, x_col, y_col, measures),
+        _pivot_nbytes
+    )
+
+def _build_pair_pivot(cube, x_col, y_col, measures):
+    cells = cube_frame(cube, [x_col, y_col, 'year'], measures)
+    x_codes, x_labels = pd.factorize(cells[x_col], sort=True)
+    y_codes, y_labels = pd.factorize(cells[y_col], sort=True)
+    shape = (len(y_labels), len(x_labels))
+    
+    # COO → CSR 변환 시 같은 (y, x) 칸의 연도별 값이 합산됨
+    def to_csr(values):
+        return sparse.coo_matrix((values, (y_codes, x_codes)), shape=shape).tocsr()
+    
+    return {
+        'x': pd.Index(x_labels, name=x_col),
+        'y': pd.Index(y_labels, name=y_col),
+        'cells': cells,
+        'totals': {measure: to_csr(cells[measure].to_numpy(dtype=np.float64)) for measure in measures},
+        'counts': to_csr(np.ones(len(cells), dtype=np.int64)),
+        'dtypes': {
+            measure: cells[measure].dtype if cells[measure].dtype.kind == 'f' else np.dtype(np.int64)
+            for measure in measures
+        }
+    }
+
+def _pivot_nbytes(pivot):
+    """피벗이 차지하는 메모리 (캐시 한도 계산용)"""
+    matrices = list(pivot['totals'].values()) + [pivot['counts']]
+    return (
+        int(pivot['cells'].memory_usage(index=True, deep=False).sum())
+        + sum(m.data.nbytes + m.indices.nbytes + m.indptr.nbytes for m in matrices)
+        + int(pivot['x'].memory_usage()) + int(pivot['y'].memory_usage())
+    )
+
+def _top_k_groups(labels, totals, k):
+    """합계 상위 k개 라벨은 원래 순서대로 두고 나머지는 '기타' 한 칸으로 묶는 (새 라벨, 원래 코드 → 새 코드)
+    
+    라벨이 k개 이하이면 그대로 반환한다. '기타' 라벨이 상위 k개에 있으면 나머지를 그 칸에 합친다.
+    """
+    if len(labels) <= k:
+        return labels, np.arange(len(labels))
+    
+    keep = np.sort(np.argsort(-totals, kind='stable')[:k])
+    kept_labels = [str(label) for label in labels.take(keep)]
+    if OTHER_LABEL in kept_labels:
+        other_code = kept_labels.index(OTHER_LABEL)
+    else:
+        other_code = len(kept_labels)
+        kept_labels.append(OTHER_LABEL)
+    
+    mapping = np.full(len(labels), other_code)
+    mapping[keep] = np.arange(len(keep))
+    return pd.Index(kept_labels, name=labels.name), mapping
+
+def _pivot_table(pivot, measure, max_rows=LANDSCAPE_MAX_ROWS, max_columns=LANDSCAPE_MAX_COLUMNS):
+    """피벗의 y × x 합계 밀집 행렬 (pivot_table(..., aggfunc='sum', fill_value=0) 형식)
+    
+    행/열이 많으면 합계 상위 max_rows행 × max_columns열만 남기고 나머지를 '기타'로 합산하여
+    카디널리티와 관계없이 (max_rows + 1) × (max_columns + 1) 이하로 제한한다.
+    """
+    matrix = pivot['totals'][measure]
+    y_labels, y_mapping = _top_k_groups(pivot['y'], np.asarray(matrix.sum(axis=1)).ravel(), max_rows)
+    x_labels, x_mapping = _top_k_groups(pivot['x'], np.asarray(matrix.sum(axis=0)).ravel(), max_columns)
+    
+    # 원래 행/열 → 새 행/열 0-1 행렬로 희소 행렬을 그대로 축약
+    row_map = sparse.csr_matrix(
+        (np.ones(len(y_mapping)), (y_mapping, np.arange(len(y_mapping)))),
+        shape=(len(y_labels), len(y_mapping))
+    )
+    column_map = sparse.csr_matrix(
+        (np.ones(len(x_mapping)), (np.arange(len(x_mapping)), x_mapping)),
+        shape=(len(x_mapping), len(x_labels))
+    )
+    values = (row_map @ matrix @ column_map).toarray().astype(pivot['dtypes'][measure])
+    return pd.DataFrame(values, index=y_labels, columns=x_labels)
+
+def _caption_truncation(pivot):
+    """상위 항목만 표시한 경우 안내 문구"""
+    n_rows, n_columns = len(pivot['y']), len(pivot['x'])
+    if n_rows > LANDSCAPE_MAX_ROWS or n_columns > LANDSCAPE_MAX_COLUMNS:
+        st.caption(
+            f"투자예산 상위 {min(n_rows, LANDSCAPE_MAX_ROWS)}개 {pivot['y'].name} × "
+            f"{min(n_columns, LANDSCAPE_MAX_COLUMNS)}개 {pivot['x'].name}만 표시하고 나머지는 '{OTHER_LABEL}'로 합산"
+            f" (전체 {n_rows:,} × {n_columns:,})"
+        )
+
+def _pair_totals(pivot, measures):
+    """피벗의 (x, y) 칸별 합계 (groupby([x, y]).sum().reset_index()와 같은 형식, x→y 순)"""
+    present = pivot['counts'].T.tocsr()
+    present.sort_indices()
+    x_codes = np.repeat(np.arange(present.shape[0]), np.diff(present.indptr))
+    y_codes = present.indices
+    columns = {
+        pivot['x'].name: pivot['x'].take(x_codes),
+        pivot['y'].name: pivot['y'].take(y_codes)
+    }
+    for measure in measures:
+        values = np.asarray(pivot['totals'][measure][y_codes, x_codes]).ravel()
+        columns[measure] = values.astype(pivot['dtypes'][measure])
+    return pd.DataFrame(columns)
+
+def _bucket_pair(frame, x_col, y_col, rank_by, chart):
+    """x, y 항목을 각각 rank_by 합계 상위 TOP_K[chart]개로 제한하고 나머지는 '기타'로 합산"""
+    max_x, max_y = TOP_K[chart]
+    measures = [col for col in frame.columns if col not in (x_col, y_col, 'year')]
+    frame = bucket_top_k(frame, x_col, measures, max_x, rank_by=rank_by)
+    return bucket_top_k(frame, y_col, measures, max_y, rank_by=rank_by)
+
+def _render_heatmap(df, x_col, y_col, title, cube, cache, filter_key):
     """히트맵 렌더링"""
     # budget_billion이 있으면 사용, 없으면 카운트
     if 'budget_billion' in df.columns:
-        pivot_df = pd.pivot_table(df, values='budget_billion', index=y_col, columns=x_col, aggfunc='sum', fill_value=0)
+        pivot = _pair_pivot(cube, df, x_col, y_col, cache, filter_key)
+        pivot_df = _pivot_table(pivot, 'budget_billion')
+        _caption_truncation(pivot)
         value_label = "투자예산 (억원)"
     else:
         # 카운트로 피벗 테이블 생성
@@ -117,18 +274,27 @@ def _render_heatmap(df, x_col, y_col, title):
         st.warning("히트맵을 위한 데이터가 없습니다.")
         return
     
-    fig = px.imshow(
-        pivot_df,
-        labels=dict(x=x_col, y=y_col, color=value_label),
-        text_auto='.0f',
-        aspect="auto",
-        color_continuous_scale='Viridis',
-        title=f"{title} - 히트맵"
+    # 입력 집계가 같으면 캐시된 그림 재사용
+    def build_figure():
+        fig = px.imshow(
+            pivot_df,
+            labels=dict(x=x_col, y=y_col, color=value_label),
+            text_auto='.0f',
+            aspect="auto",
+            color_continuous_scale='Viridis',
+            title=f"{title} - 히트맵"
+        )
+        fig.update_layout(height=500)
+        return fig
+    
+    plotly_chart_cached(
+        'landscape_heatmap',
+        [pivot_df, x_col, y_col, value_label, title],
+        build_figure,
+        use_container_width=True
     )
-    fig.update_layout(height=500)
-    st.plotly_chart(fig, use_container_width=True)
 
-def _render_bubble_plot(df, x_col, y_col, title):
+def _render_bubble_plot(df, x_col, y_col, title, cube, cache, filter_key):
     """버블 플롯 렌더링 - project_count 없을 때도 작동"""
     # 필요한 컬럼 확인 및 대체 로직
     agg_dict = {}
@@ -143,11 +309,13 @@ def _render_bubble_plot(df, x_col, y_col, title):
         count_col = 'project_count'
     else:
         # 카운트 컬럼 추가
-        df['count'] = 1
+        df = df.assign(count=1)
         agg_dict['count'] = 'sum'
     
-    # 데이터 집계
-    if agg_dict:
+    # 데이터 집계 (예산/과제수 합계는 공유 집계 큐브에서 조회)
+    if count_col == 'project_count':
+        grouped_data = _pair_totals(_pair_pivot(cube, df, x_col, y_col, cache, filter_key), list(agg_dict))
+    elif agg_dict:
         grouped_data = df.groupby([x_col, y_col]).agg(agg_dict).reset_index()
     else:
         # 기본 집계
@@ -160,26 +328,38 @@ def _render_bubble_plot(df, x_col, y_col, title):
     
     # 사이즈 컬럼 결정
     size_col = 'budget_billion' if 'budget_billion' in grouped_data.columns else count_col
+    grouped_data = _bucket_pair(grouped_data, x_col, y_col, size_col, 'landscape_bubble')
     
-    fig = px.scatter(
-        grouped_data,
-        x=x_col,
-        y=y_col,
-        size=size_col,
-        color=size_col,
-        hover_data={col: True for col in grouped_data.columns},
-        size_max=60,
-        color_continuous_scale='Viridis',
-        title=f"{title} - 버블 플롯"
+    # 입력 집계가 같으면 캐시된 그림 재사용
+    def build_figure():
+        fig = px.scatter(
+            grouped_data,
+            x=x_col,
+            y=y_col,
+            size=size_col,
+            color=size_col,
+            hover_data={col: True for col in grouped_data.columns},
+            size_max=60,
+            color_continuous_scale='Viridis',
+            title=f"{title} - 버블 플롯"
+        )
+        fig.update_layout(height=500)
+        return fig
+    
+    plotly_chart_cached(
+        'landscape_bubble',
+        [grouped_data, x_col, y_col, size_col, title],
+        build_figure,
+        use_container_width=True
     )
-    fig.update_layout(height=500)
-    st.plotly_chart(fig, use_container_width=True)
 
-def _render_3d_surface(df, x_col, y_col, title):
+def _render_3d_surface(df, x_col, y_col, title, cube, cache, filter_key):
     """3D Surface 렌더링"""
     # budget_billion이 있으면 사용, 없으면 카운트
     if 'budget_billion' in df.columns:
-        pivot_df = pd.pivot_table(df, values='budget_billion', index=y_col, columns=x_col, aggfunc='sum', fill_value=0)
+        pivot = _pair_pivot(cube, df, x_col, y_col, cache, filter_key)
+        pivot_df = _pivot_table(pivot, 'budget_billion')
+        _caption_truncation(pivot)
         z_label = "투자예산 (억원)"
     else:
         # 카운트로 피벗 테이블 생성
@@ -190,55 +370,87 @@ def _render_3d_surface(df, x_col, y_col, title):
         st.warning("3D Surface를 위한 데이터가 없습니다.")
         return
     
-    fig = go.Figure(data=[
-        go.Surface(
-            z=pivot_df.values,
-            x=pivot_df.columns.tolist(),
-            y=pivot_df.index.tolist(),
-            colorscale='Viridis',
-            opacity=0.8
+    # 입력 집계가 같으면 캐시된 그림 재사용
+    def build_figure():
+        fig = go.Figure(data=[
+            go.Surface(
+                z=pivot_df.values,
+                x=pivot_df.columns.tolist(),
+                y=pivot_df.index.tolist(),
+                colorscale='Viridis',
+                opacity=0.8
+            )
+        ])
+        
+        fig.update_layout(
+            title=f"{title} - 3D Surface",
+            scene=dict(
+                xaxis_title=x_col,
+                yaxis_title=y_col,
+                zaxis_title=z_label,
+                xaxis=dict(tickangle=-45),
+                yaxis=dict(tickangle=-45)
+            ),
+            height=600
         )
-    ])
-    
-    fig.update_layout(
-        title=f"{title} - 3D Surface",
-        scene=dict(
-            xaxis_title=x_col,
-            yaxis_title=y_col,
-            zaxis_title=z_label,
-            xaxis=dict(tickangle=-45),
-            yaxis=dict(tickangle=-45)
-        ),
-        height=600
+        return fig
+    
+    plotly_chart_cached(
+        'landscape_surface',
+        [pivot_df, x_col, y_col, z_label, title],
+        build_figure,
+        use_container_width=True
     )
-    st.plotly_chart(fig, use_container_width=True)
 
-def _render_animation(df, x_col, y_col, title):
+def _render_animation(df, x_col, y_col, title, cube, cache, filter_key):
     """애니메이션 렌더링"""
     # 값 컬럼 선택
     value_col = 'budget_billion' if 'budget_billion' in df.columns else 'performance_value'
     if value_col not in df.columns:
         # 어떤 값 컬럼도 없으면 카운트 사용
-        df['count'] = 1
+        df = df.assign(count=1)
         value_col = 'count'
         
-    animation_df = df.groupby([x_col, y_col, 'year'])[value_col].sum().reset_index()
+    if value_col == 'budget_billion':
+        animation_df = _pair_pivot(cube, df, x_col, y_col, cache, filter_key)['cells'][[x_col, y_col, 'year', value_col]]
+    else:
+        animation_df = df.groupby([x_col, y_col, 'year'])[value_col].sum().reset_index()
     
     if len(animation_df) == 0:
         st.warning("애니메이션을 위한 데이터가 없습니다.")
         return
     
-    fig = px.scatter(
+    # 항목 순위는 전체 기간 합계 기준 (연도마다 '기타'에 들어가는 항목이 바뀌지 않음)
+    animation_df = _bucket_pair(animation_df, x_col, y_col, value_col, 'landscape_animation')
+    
+    # 한 연도 그림만 보내되 축 범주·색상 범위는 전체 기간 기준으로 고정
+    x_order = animation_df[x_col].astype(str).unique().tolist()
+    y_order = animation_df[y_col].astype(str).unique().tolist()
+    value_max = animation_df[value_col].max()
+    
+    def build_figure(year_frame, year):
+        fig = px.scatter(
+            year_frame,
+            x=x_col,
+            y=y_col,
+            size=value_col,
+            color=value_col,
+            title=f"{title} - 연도별 변화",
+            size_max=60,
+            color_continuous_scale='Viridis',
+            range_color=[0, value_max],
+            category_orders={x_col: x_order, y_col: y_order}
+        )
+        # 버블 크기 기준도 전체 기간 최댓값으로 맞춤 (px는 그림 안의 최댓값 기준)
+        fig.update_traces(marker=dict(sizeref=value_max / 60 ** 2))
+        fig.update_layout(height=600)
+        return fig
+    
+    year_stepper_chart(
+        f"landscape_animation:{title}",
         animation_df,
-        x=x_col,
-        y=y_col,
-        size=value_col,
-        color=value_col,
-        animation_frame='year',
-        title=f"{title} - 연도별 변화",
-        size_max=60,
-        color_continuous_scale='Viridis',
-        range_color=[0, animation_df[value_col].max()]
-    )
-    fig.update_layout(height=600)
-    st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+        sorted(animation_df['year'].unique().tolist()),
+        build_figure,
+        inputs=[x_col, y_col, value_col, x_order, y_order, value_max, title],
+        use_container_width=True
+    )
\ No newline at end of file
@@ -35,9 +35,9 @@ def display_metrics(filtered_df):
             st.metric("성과 데이터", "정보 없음")
 
     with col4:
-        # 기후변화 관련 데이터 확인
-        if 'research_area' in filtered_df.columns:
-            climate_data = filtered_df[filtered_df['research_area'].str.contains('기후|환경|에너지', na=False, case=False)]
+        # 기후변화 관련 데이터 확인 (climate_related: 수집 시 연구분야 키워드로 태그한 bool 컬럼)
+        if 'climate_related' in filtered_df.columns:
+            climate_data = filtered_df[filtered_df['climate_related']]
             if not climate_data.empty and 'budget_billion' in filtered_df.columns:
                 climate_budget = climate_data['budget_billion'].sum()
                 climate_ratio = (climate_budget / total_budget * 100) if total_budget > 0 else 0
@@ -3,11 +3,38 @@ import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 from plotly.subplots import make_subplots
+from utils.aggregation import build_cube, cube_frame, cube_series, bucket_top_k
+from utils.time_series import year_panel, year_over_year, shares, panel_frame
+from utils.chart_helpers import year_stepper_chart
 
-def render_ministry_analysis(filtered_df, filter_config):
-    """부처별 분석 렌더링"""
+# 부처별 분석에서 사용하는 집계 (차원, 측정값[, 결측 제외 컬럼])
+AGGREGATES = [
+    (['ministry'], 'budget_billion'),
+    (['ministry', 'year'], 'budget_billion'),
+    (['ministry', 'research_area', 'year'], 'budget_billion'),
+    (['ministry', 'research_area'], 'budget_billion'),
+    (['research_area'], 'budget_billion', ['ministry']),
+    (['ministry', 'institute', 'year'], 'budget_billion'),
+    (['ministry', 'institute'], 'budget_billion'),
+    (['project_type', 'ministry', 'year'], 'budget_billion'),
+    (['project_type', 'ministry'], 'budget_billion'),
+    (['ministry', 'project_type'], 'budget_billion')
+]
+
+# 차트별 상위 항목 수 (나머지는 '기타'로 합산하여 트레이스·범주 수 제한)
+TOP_K = {
+    'ministry_share': 10,
+    'ministry_budget_year': 15,
+    'ministry_institute': 10
+}
+
+def render_ministry_analysis(filtered_df, filter_config, cube=None):
+    """부처별 분석 렌더링 (cube: 공유 집계 큐브, 없으면 직접 계산)"""
     st.header("🔍 부처별 분석")
     
+    if cube is None:
+        cube = build_cube(filtered_df, AGGREGATES)
+    
     # NaN 및 문자열 'nan' 부처 제외
     filtered_df = filtered_df.dropna(subset=['ministry'])
     filtered_df = filtered_df[filtered_df['ministry'] != 'nan']
@@ -45,7 +72,7 @@ def render_ministry_analysis(filtered_df, filter_config):
 
     with col1:
         # 부처별 투자 총액
-        ministry_budget = filtered_df.groupby('ministry')['budget_billion'].sum().reset_index()
+        ministry_budget = cube_frame(cube, ['ministry'], ['budget_billion'])
         ministry_budget = ministry_budget.sort_values('budget_billion', ascending=False)
         
         fig1 = px.bar(
@@ -87,8 +114,10 @@ def render_ministry_analysis(filtered_df, filter_config):
 
     with col2:
         # 부처별 투자 비중 (파이 차트)
+        ministry_share = bucket_top_k(ministry_budget, 'ministry', 'budget_billion', TOP_K['ministry_share'])
+        
         fig2 = px.pie(
-            ministry_budget, 
+            ministry_share, 
             values='budget_billion', 
             names='ministry',
             title="부처별 R&D 투자 비중", 
@@ -123,11 +152,19 @@ def render_ministry_analysis(filtered_df, filter_config):
         st.subheader("📈 부처별 투자 추이")
         
         # 부처별 연도별 집계
-        ministry_year = filtered_df.groupby(['ministry', 'year'])['budget_billion'].sum().reset_index()
+        ministry_year = cube_frame(cube, ['ministry', 'year'], ['budget_billion'])
+        
+        # 전체 부처의 전년 대비 증감률/연도별 비중을 한 번에 계산
+        ministry_panel = year_panel(ministry_year, 'ministry', 'budget_billion')
+        ministry_trend = panel_frame(
+            ministry_panel,
+            yoy=year_over_year(ministry_panel, skip_missing=True),
+            share=shares(ministry_panel)
+        )
         
         # 상위 8개 부처만 선택
         top_ministries = ministry_budget.nlargest(8, 'budget_billion')['ministry'].tolist()
-        ministry_year_filtered = ministry_year[ministry_year['ministry'].isin(top_ministries)]
+        ministry_year_filtered = ministry_trend[ministry_trend['ministry'].isin(top_ministries)]
         
         # 추이 시각화 1: 시계열 차트
         fig3 = px.line(
@@ -137,7 +174,9 @@ def render_ministry_analysis(filtered_df, filter_config):
             color='ministry',
             title="부처별 연도별 투자 추이", 
             markers=True, 
-            line_shape='spline'
+            line_shape='spline',
+            hover_data={'yoy': ':.1f', 'share': ':.1f'},
+            labels={'yoy': '전년 대비 증감률(%)', 'share': '연도별 비중(%)'}
         )
         
         fig3.update_traces(
@@ -176,92 +215,36 @@ def render_ministry_analysis(filtered_df, filter_config):
         )
         st.plotly_chart(fig3, use_container_width=True)
         
-        # 추이 시각화 2: 애니메이션 바 차트
-        st.subheader("🎬 부처별 투자 애니메이션")
+        # 추이 시각화 2: 연도 선택 바 차트
+        st.subheader("🎬 연도별 부처 투자")
+        
+        # 부처가 많으면 상위 부처 외에는 '기타'로 합산 (category_orders에 없는 '기타'는 마지막에 표시)
+        ministry_year = bucket_top_k(ministry_year, 'ministry', 'budget_billion', TOP_K['ministry_budget_year'])
         
         # 연도를 문자열로 변환
         ministry_year['year'] = ministry_year['year'].astype(str)
         
-        fig_anim = px.bar(
-            ministry_year, 
-            x='ministry', 
-            y='budget_billion',
-            color='ministry',
-            animation_frame='year',
-            title="연도별 부처 투자액 변화",
-            category_orders={
-                'ministry': ministry_list,
-                'year': [str(y) for y in year_list]  # 연도 순서 지정
-            }
-        )
-        
-        fig_anim.update_traces(
-            texttemplate='<b>%{y:,.0f}</b>',
-            textposition='outside',
-            textfont=dict(size=14, color='#333333')
-        )
-        
-        fig_anim.update_layout(
-            height=500,
-            margin=dict(t=80, b=100, l=50, r=50),
-            title_x=0.5,
-            title_y=0.95,
-            **graph_config,
-            xaxis=dict(
-                title='부처',
-                title_font=dict(size=16),
-                tickfont=dict(size=14),
-                tickangle=-45
-            ),
-            yaxis=dict(
-                title='투자액 (억원)',
-                title_font=dict(size=16),
-                tickfont=dict(size=14),
-                tickformat=","  # 천단위 콤마
-            ),
-            showlegend=False
-        )
-        
-        # 연도 슬라이더 스타일 수정
-        fig_anim.layout.sliders[0].currentvalue = {"prefix": "연도: "}
-        
-        st.plotly_chart(fig_anim, use_container_width=True)
-    
-    col3, col4 = st.columns(2)
-    
-    with col3:
-        # 부처별 연구분야 분포 (애니메이션)
-        if 'research_area' in filtered_df.columns and len(filtered_df['year'].unique()) > 1:
-            ministry_area_year = filtered_df.groupby(['ministry', 'research_area', 'year'])['budget_billion'].sum().reset_index()
-            
-            # 상위 연구분야 식별
-            top_areas = filtered_df.groupby('research_area')['budget_billion'].sum().nlargest(5).index.tolist()
-            ministry_area_year = ministry_area_year[ministry_area_year['research_area'].isin(top_areas)]
-            
-            # 상위 부처 필터링
-            top_ministries = ministry_budget.nlargest(6, 'budget_billion')['ministry'].tolist()
-            ministry_area_year = ministry_area_year[ministry_area_year['ministry'].isin(top_ministries)]
-            
-            # 연도를 문자열로 변환
-            ministry_area_year['year'] = ministry_area_year['year'].astype(str)
-            
-            fig4 = px.bar(
-                ministry_area_year, 
+        def build_year_figure(year_frame, year):
+            fig_anim = px.bar(
+                year_frame, 
                 x='ministry', 
                 y='budget_billion',
-                color='research_area',
-                animation_frame='year',
-                title="부처별 연구분야 투자 분포",
-                barmode='stack',
+                color='ministry',
+                title="연도별 부처 투자액 변화",
                 category_orders={
-                    'ministry': top_ministries,
-                    'year': [str(y) for y in year_list]  # 연도 순서 지정
+                    'ministry': ministry_list
                 }
             )
             
-            fig4.update_layout(
+            fig_anim.update_traces(
+                texttemplate='<b>%{y:,.0f}</b>',
+                textposition='outside',
+                textfont=dict(size=14, color='#333333')
+            )
+            
+            fig_anim.update_layout(
                 height=500,
-                margin=dict(t=80, b=50, l=50, r=50),
+                margin=dict(t=80, b=100, l=50, r=50),
                 title_x=0.5,
                 title_y=0.95,
                 **graph_config,
@@ -272,31 +255,102 @@ def render_ministry_analysis(filtered_df, filter_config):
                     tickangle=-45
                 ),
                 yaxis=dict(
-                    title='정부연구비 (억원)',
+                    title='투자액 (억원)',
                     title_font=dict(size=16),
                     tickfont=dict(size=14),
                     tickformat=","  # 천단위 콤마
                 ),
-                legend=dict(
-                    title='연구분야',
-                    orientation='h',
-                    yanchor='bottom',
-                    y=1.02,
-                    xanchor='center',
-                    x=0.5
-                )
+                showlegend=False
             )
+            return fig_anim
+        
+        year_stepper_chart(
+            'ministry_budget_year',
+            ministry_year,
+            sorted(ministry_year['year'].unique().tolist()),
+            build_year_figure,
+            inputs=[ministry_list, graph_config],
+            use_container_width=True
+        )
+    
+    col3, col4 = st.columns(2)
+    
+    with col3:
+        # 부처별 연구분야 분포 (연도 선택)
+        if 'research_area' in filtered_df.columns and len(filtered_df['year'].unique()) > 1:
+            ministry_area_year = cube_frame(cube, ['ministry', 'research_area', 'year'], ['budget_billion'])
             
-            # 연도 슬라이더 스타일 수정
-            fig4.layout.sliders[0].currentvalue = {"prefix": "연도: "}
+            # 상위 연구분야 식별
+            top_areas = cube_series(cube, ['research_area'], 'budget_billion', ['ministry']).nlargest(5).index.tolist()
+            ministry_area_year = ministry_area_year[ministry_area_year['research_area'].isin(top_areas)]
             
-            st.plotly_chart(fig4, use_container_width=True)
+            # 상위 부처 필터링
+            top_ministries = ministry_budget.nlargest(6, 'budget_billion')['ministry'].tolist()
+            ministry_area_year = ministry_area_year[ministry_area_year['ministry'].isin(top_ministries)]
+            
+            # 연도를 문자열로 변환
+            ministry_area_year['year'] = ministry_area_year['year'].astype(str)
+            
+            # 연도마다 색상이 바뀌지 않도록 전체 기간 기준 색상 순서 고정
+            area_order = ministry_area_year['research_area'].astype(str).unique().tolist()
+            
+            def build_year_figure(year_frame, year):
+                fig4 = px.bar(
+                    year_frame, 
+                    x='ministry', 
+                    y='budget_billion',
+                    color='research_area',
+                    title="부처별 연구분야 투자 분포",
+                    barmode='stack',
+                    category_orders={
+                        'ministry': top_ministries,
+                        'research_area': area_order
+                    }
+                )
+                
+                fig4.update_layout(
+                    height=500,
+                    margin=dict(t=80, b=50, l=50, r=50),
+                    title_x=0.5,
+                    title_y=0.95,
+                    **graph_config,
+                    xaxis=dict(
+                        title='부처',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickangle=-45
+                    ),
+                    yaxis=dict(
+                        title='정부연구비 (억원)',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickformat=","  # 천단위 콤마
+                    ),
+                    legend=dict(
+                        title='연구분야',
+                        orientation='h',
+                        yanchor='bottom',
+                        y=1.02,
+                        xanchor='center',
+                        x=0.5
+                    )
+                )
+                return fig4
+            
+            year_stepper_chart(
+                'ministry_area_year',
+                ministry_area_year,
+                sorted(ministry_area_year['year'].unique().tolist()),
+                build_year_figure,
+                inputs=[top_ministries, area_order, graph_config],
+                use_container_width=True
+            )
         elif 'research_area' in filtered_df.columns:
             # 단일 연도인 경우
-            ministry_area = filtered_df.groupby(['ministry', 'research_area'])['budget_billion'].sum().reset_index()
+            ministry_area = cube_frame(cube, ['ministry', 'research_area'], ['budget_billion'])
             
             # 상위 연구분야 식별
-            top_areas = filtered_df.groupby('research_area')['budget_billion'].sum().nlargest(5).index.tolist()
+            top_areas = cube_series(cube, ['research_area'], 'budget_billion', ['ministry']).nlargest(5).index.tolist()
             ministry_area = ministry_area[ministry_area['research_area'].isin(top_areas)]
             
             # 상위 부처 필터링
@@ -342,71 +396,85 @@ def render_ministry_analysis(filtered_df, filter_config):
             st.plotly_chart(fig4, use_container_width=True)
     
     with col4:
-        # 부처별 연구수행주체 분포 (애니메이션)
+        # 부처별 연구수행주체 분포 (연도 선택)
         if len(filtered_df['year'].unique()) > 1:
-            ministry_institute_year = filtered_df.groupby(['ministry', 'institute', 'year'])['budget_billion'].sum().reset_index()
+            ministry_institute_year = cube_frame(cube, ['ministry', 'institute', 'year'], ['budget_billion'])
             
             # 상위 부처 필터링
             top_ministries = ministry_budget.nlargest(6, 'budget_billion')['ministry'].tolist()
             ministry_institute_year = ministry_institute_year[ministry_institute_year['ministry'].isin(top_ministries)]
             
+            # 상위 수행주체 외에는 '기타'로 합산
+            ministry_institute_year = bucket_top_k(ministry_institute_year, 'institute', 'budget_billion', TOP_K['ministry_institute'])
+            
             # 연도를 문자열로 변환
             ministry_institute_year['year'] = ministry_institute_year['year'].astype(str)
             
-            fig5 = px.bar(
-                ministry_institute_year, 
-                x='ministry', 
-                y='budget_billion',
-                color='institute',
-                animation_frame='year',
-                title="부처별 연구수행주체 분포",
-                barmode='stack',
-                category_orders={
-                    'ministry': top_ministries,
-                    'year': [str(y) for y in year_list]  # 연도 순서 지정
-                }
-            )
+            # 연도마다 색상이 바뀌지 않도록 전체 기간 기준 색상 순서 고정
+            institute_order = ministry_institute_year['institute'].astype(str).unique().tolist()
             
-            fig5.update_layout(
-                height=500,
-                margin=dict(t=80, b=50, l=50, r=50),
-                title_x=0.5,
-                title_y=0.95,
-                **graph_config,
-                xaxis=dict(
-                    title='부처',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickangle=-45
-                ),
-                yaxis=dict(
-                    title='정부연구비 (억원)',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickformat=","  # 천단위 콤마
-                ),
-                legend=dict(
-                    title='연구수행주체',
-                    orientation='h',
-                    yanchor='bottom',
-                    y=1.02,
-                    xanchor='center',
-                    x=0.5
+            def build_year_figure(year_frame, year):
+                fig5 = px.bar(
+                    year_frame, 
+                    x='ministry', 
+                    y='budget_billion',
+                    color='institute',
+                    title="부처별 연구수행주체 분포",
+                    barmode='stack',
+                    category_orders={
+                        'ministry': top_ministries,
+                        'institute': institute_order
+                    }
                 )
-            )
-            
-            # 연도 슬라이더 스타일 수정
-            fig5.layout.sliders[0].currentvalue = {"prefix": "연도: "}
+                
+                fig5.update_layout(
+                    height=500,
+                    margin=dict(t=80, b=50, l=50, r=50),
+                    title_x=0.5,
+                    title_y=0.95,
+                    **graph_config,
+                    xaxis=dict(
+                        title='부처',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickangle=-45
+                    ),
+                    yaxis=dict(
+                        title='정부연구비 (억원)',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickformat=","  # 천단위 콤마
+                    ),
+                    legend=dict(
+                        title='연구수행주체',
+                        orientation='h',
+                        yanchor='bottom',
+                        y=1.02,
+                        xanchor='center',
+                        x=0.5
+                    )
+                )
+                return fig5
             
-            st.plotly_chart(fig5, use_container_width=True)
+            year_stepper_chart(
+                'ministry_institute_year',
+                ministry_institute_year,
+                sorted(ministry_institute_year['year'].unique().tolist()),
+                build_year_figure,
+                inputs=[top_ministries, institute_order, graph_config],
+                use_container_width=True
+            )
         else:
             # 단일 연도인 경우
-            ministry_institute = filtered_df.groupby(['ministry', 'institute'])['budget_billion'].sum().reset_index()
+            ministry_institute = cube_frame(cube, ['ministry', 'institute'], ['budget_billion'])
             
             # 상위 부처 필터링
             top_ministries = ministry_budget.nlargest(6, 'budget_billion')['ministry'].tolist()
             ministry_institute = ministry_institute[ministry_institute['ministry'].isin(top_ministries)]
             
+            # 상위 수행주체 외에는 '기타'로 합산
+            ministry_institute = bucket_top_k(ministry_institute, 'institute', 'budget_billion', TOP_K['ministry_institute'])
+            
             fig5 = px.bar(
                 ministry_institute, 
                 x='ministry', 
@@ -452,9 +520,9 @@ def render_ministry_analysis(filtered_df, filter_config):
         col5, col6 = st.columns(2)
         
         with col5:
-            # 연구단계별 부처 분포 (애니메이션)
+            # 연구단계별 부처 분포 (연도 선택)
             if len(filtered_df['year'].unique()) > 1:
-                type_ministry_year = filtered_df.groupby(['project_type', 'ministry', 'year'])['budget_billion'].sum().reset_index()
+                type_ministry_year = cube_frame(cube, ['project_type', 'ministry', 'year'], ['budget_billion'])
                 
                 # 상위 부처 필터링
                 top_ministries = ministry_budget.nlargest(6, 'budget_billion')['ministry'].tolist()
@@ -463,53 +531,57 @@ def render_ministry_analysis(filtered_df, filter_config):
                 # 연도를 문자열로 변환
                 type_ministry_year['year'] = type_ministry_year['year'].astype(str)
                 
-                fig6 = px.bar(
-                    type_ministry_year, 
-                    x='project_type', 
-                    y='budget_billion',
-                    color='ministry',
-                    animation_frame='year',
-                    title="연구단계별 부처 분포",
-                    barmode='stack',
-                    category_orders={
-                        'ministry': top_ministries,
-                        'year': [str(y) for y in year_list]  # 연도 순서 지정
-                    }
-                )
-                
-                fig6.update_layout(
-                    height=500,
-                    margin=dict(t=80, b=50, l=50, r=50),
-                    title_x=0.5,
-                    title_y=0.95,
-                    **graph_config,
-                    xaxis=dict(
-                        title='연구단계',
-                        title_font=dict(size=16),
-                        tickfont=dict(size=14)
-                    ),
-                    yaxis=dict(
-                        title='정부연구비 (억원)',
-                        title_font=dict(size=16),
-                        tickfont=dict(size=14),
-                        tickformat=","  # 천단위 콤마
-                    ),
-                    legend=dict(
-                        title='부처',
-                        orientation='h',
-                        yanchor='bottom',
-                        y=1.02,
-                        xanchor='center',
-                        x=0.5
+                def build_year_figure(year_frame, year):
+                    fig6 = px.bar(
+                        year_frame, 
+                        x='project_type', 
+                        y='budget_billion',
+                        color='ministry',
+                        title="연구단계별 부처 분포",
+                        barmode='stack',
+                        category_orders={
+                            'ministry': top_ministries
+                        }
                     )
-                )
-                
-                # 연도 슬라이더 스타일 수정
-                fig6.layout.sliders[0].currentvalue = {"prefix": "연도: "}
+                    
+                    fig6.update_layout(
+                        height=500,
+                        margin=dict(t=80, b=50, l=50, r=50),
+                        title_x=0.5,
+                        title_y=0.95,
+                        **graph_config,
+                        xaxis=dict(
+                            title='연구단계',
+                            title_font=dict(size=16),
+                            tickfont=dict(size=14)
+                        ),
+                        yaxis=dict(
+                            title='정부연구비 (억원)',
+                            title_font=dict(size=16),
+                            tickfont=dict(size=14),
+                            tickformat=","  # 천단위 콤마
+                        ),
+                        legend=dict(
+                            title='부처',
+                            orientation='h',
+                            yanchor='bottom',
+                            y=1.02,
+                            xanchor='center',
+                            x=0.5
+                        )
+                    )
+                    return fig6
                 
-                st.plotly_chart(fig6, use_container_width=True)
+                year_stepper_chart(
+                    'project_type_ministry_year',
+                    type_ministry_year,
+                    sorted(type_ministry_year['year'].unique().tolist()),
+                    build_year_figure,
+                    inputs=[top_ministries, graph_config],
+                    use_container_width=True
+                )
             else:
-                type_ministry = filtered_df.groupby(['project_type', 'ministry'])['budget_billion'].sum().reset_index()
+                type_ministry = cube_frame(cube, ['project_type', 'ministry'], ['budget_billion'])
                 
                 # 상위 부처 필터링
                 top_ministries = ministry_budget.nlargest(6, 'budget_billion')['ministry'].tolist()
@@ -554,7 +626,7 @@ def render_ministry_analysis(filtered_df, filter_config):
         
         with col6:
             # 히트맵: 부처 × 연구단계
-            ministry_type = filtered_df.groupby(['ministry', 'project_type'])['budget_billion'].sum().reset_index()
+            ministry_type = cube_frame(cube, ['ministry', 'project_type'], ['budget_billion'])
             
             # 상위 부처 필터링
             top_ministries = ministry_budget.nlargest(8, 'budget_billion')['ministry'].tolist()
@@ -5,19 +5,35 @@ import os
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+from utils.aggregation import ROW_COUNT, build_cube, cube_frame, bucket_top_k, top_k_labels, bucket_labels
 
-def render_performance_analysis(filtered_df, filter_config):
-    """R&D 투자 성과 분석 렌더링"""
+# 성과 분석에서 사용하는 집계 (차원, 측정값)
+AGGREGATES = [
+    (['performance_year', 'performance_type'], ROW_COUNT),
+    (['ministry', 'performance_type'], 'performance_value'),
+    (['institute', 'performance_type'], ROW_COUNT)
+]
+
+# 차트별 상위 항목 수 (나머지는 '기타'로 합산하여 트레이스·범주 수 제한)
+TOP_K = {
+    'performance_institute': 15,
+    'institute_summary': 15
+}
+
+def render_performance_analysis(filtered_df, filter_config, cube=None):
+    """R&D 투자 성과 분석 렌더링 (cube: 공유 집계 큐브, 없으면 직접 계산)"""
     st.header("📈 성과 분석")
     
     if 'performance_type' in filtered_df.columns:
         # 실제 데이터의 경우 성과 유형별 분석
-        render_real_performance_analysis(filtered_df)
+        if cube is None:
+            cube = build_cube(filtered_df, AGGREGATES)
+        render_real_performance_analysis(filtered_df, cube)
     else:
         # 샘플 데이터의 경우 기본 성과 분석
         render_basic_performance_analysis(filtered_df)
 
-def render_real_performance_analysis(filtered_df):
+def render_real_performance_analysis(filtered_df, cube):
     """실제 데이터 성과 분석"""
     col1, col2 = st.columns(2)
     
@@ -35,7 +51,7 @@ def render_real_performance_analysis(filtered_df):
     
     with col2:
         # 연도별 성과 추이
-        yearly_performance = filtered_df.groupby(['performance_year', 'performance_type']).size().reset_index(name='count')
+        yearly_performance = cube_frame(cube, ['performance_year', 'performance_type'], [ROW_COUNT]).rename(columns={ROW_COUNT: 'count'})
         
         fig2 = px.line(yearly_performance, x='performance_year', y='count',
                       color='performance_type',
@@ -49,9 +65,7 @@ def render_real_performance_analysis(filtered_df):
     
     with col3:
         # 부처별 성과 현황
-        ministry_performance = filtered_df.groupby(['ministry', 'performance_type']).agg({
-            'performance_value': 'sum'
-        }).reset_index()
+        ministry_performance = cube_frame(cube, ['ministry', 'performance_type'], ['performance_value'])
         
         fig3 = px.bar(ministry_performance, x='ministry', y='performance_value',
                      color='performance_type',
@@ -62,7 +76,8 @@ def render_real_performance_analysis(filtered_df):
     
     with col4:
         # 연구수행주체별 성과
-        institute_performance = filtered_df.groupby(['institute', 'performance_type']).size().reset_index(name='count')
+        institute_performance = cube_frame(cube, ['institute', 'performance_type'], [ROW_COUNT]).rename(columns={ROW_COUNT: 'count'})
+        institute_performance = bucket_top_k(institute_performance, 'institute', 'count', TOP_K['performance_institute'])
         
         fig4 = px.bar(institute_performance, x='institute', y='count',
                      color='performance_type',
@@ -126,9 +141,15 @@ def render_basic_performance_analysis(filtered_df):
             'success_rate': 'mean' if 'success_rate' in filtered_df.columns else lambda x: 0
         }).reset_index()
         
+        # 점은 모두 그리되 색상(트레이스)은 투자액 상위 수행주체만 구분하고 나머지는 '기타' 하나로 묶음
+        color_labels = top_k_labels(institute_summary, 'institute', 'budget_billion', TOP_K['institute_summary'])
+        if color_labels is not None:
+            institute_summary['institute_group'] = bucket_labels(institute_summary['institute'], color_labels)
+        
         fig4 = px.scatter(institute_summary, x='budget_billion', y='project_count',
                          size='success_rate' if 'success_rate' in filtered_df.columns else 'budget_billion',
-                         color='institute',
+                         color='institute' if color_labels is None else 'institute_group',
+                         hover_name=None if color_labels is None else 'institute',
                          title="연구수행주체별 투자 vs 성과",
                          hover_data=['success_rate'] if 'success_rate' in filtered_df.columns else [])
         fig4.update_layout(height=400)
@@ -3,6 +3,14 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from utils.aggregation import group_sum, top_k_per_group, bucket_top_k
+from utils.chart_helpers import plotly_chart_cached, year_stepper_chart
+from utils.time_series import year_panel, compound_growth, panel_series
+
+# 차트별 상위 항목 수 (나머지는 '기타'로 합산하여 트레이스·범주 수 제한)
+TOP_K = {
+    'region_institute': 15
+}
 
 def render_region_analysis(filtered_df, filter_config):
     """지역별 투자분포 분석 렌더링"""
@@ -24,50 +32,44 @@ def render_region_analysis(filtered_df, filter_config):
         'colorway': ocean_colors
     }
     
-    # 지역 정보 확인 및 준비
+    # 지역 정보 확인 및 준비 (region은 수집 시 기관명으로 판정된 차원, region_confidence가 판정 근거)
     has_region_data = 'region' in filtered_df.columns
     has_country_data = 'country' in filtered_df.columns
+    region_estimated = has_region_data and 'region_confidence' in filtered_df.columns and bool(
+        (filtered_df['region_confidence'] != '확정').any()
+    )
     
-    if not has_region_data and not has_country_data:
-        # 지역 데이터가 없는 경우 institute의 첫 두 글자로 지역 추정
-        filtered_df['estimated_region'] = filtered_df['institute'].str[:2]
-        region_map = {
-            '서울': '서울', '부산': '부산', '대구': '대구', '인천': '인천', '광주': '광주',
-            '대전': '대전', '울산': '울산', '세종': '세종', '경기': '경기', '강원': '강원',
-            '충북': '충북', '충남': '충남', '전북': '전북', '전남': '전남', '경북': '경북',
-            '경남': '경남', '제주': '제주'
-        }
-        filtered_df['estimated_region'] = filtered_df['estimated_region'].map(
-            lambda x: region_map.get(x, '기타')
-        )
-        region_col = 'estimated_region'
+    if region_estimated:
+        region_col = 'region'
         region_title = "추정 지역별"
-        region_note = "(주의: 기관명 첫 두 글자 기준)"
+        region_note = "(주의: 기관명 기준 추정)"
     elif has_region_data:
         region_col = 'region'
         region_title = "지역별"
         region_note = ""
-    else:
+    elif has_country_data:
         region_col = 'country'
         region_title = "국가별"
         region_note = ""
+    else:
+        st.info("지역 정보가 없습니다. 지역 분석을 위해서는 'region' 또는 'country' 컬럼이 필요합니다.")
+        return
     
     # 연구수행주체별 지역 정보 집계
     if 'budget_billion' in filtered_df.columns:
         # 지역별 투자 총액
-        region_budget = filtered_df.groupby(region_col)['budget_billion'].sum().reset_index()
+        region_budget = group_sum(filtered_df, [region_col], ['budget_billion']).reset_index()
         region_budget = region_budget.sort_values('budget_billion', ascending=False)
         
         # 지역별 과제수 (프로젝트 카운트 컬럼이 없을 경우 1로 계산)
         if 'project_count' in filtered_df.columns:
-            region_projects = filtered_df.groupby(region_col)['project_count'].sum().reset_index()
+            region_projects = group_sum(filtered_df, [region_col], ['project_count']).reset_index()
         elif 'project_id' in filtered_df.columns and filtered_df['project_id'].nunique() > 1:
             region_projects = filtered_df.groupby(region_col)['project_id'].nunique().reset_index()
             region_projects.rename(columns={'project_id': 'project_count'}, inplace=True)
         else:
             # 각 행을 별도 프로젝트로 간주
-            filtered_df['temp_project_count'] = 1
-            region_projects = filtered_df.groupby(region_col)['temp_project_count'].sum().reset_index()
+            region_projects = group_sum(filtered_df.assign(temp_project_count=1), [region_col], ['temp_project_count']).reset_index()
             region_projects.rename(columns={'temp_project_count': 'project_count'}, inplace=True)
         
         # 지역별 수행주체 수
@@ -79,10 +81,10 @@ def render_region_analysis(filtered_df, filter_config):
         region_data = pd.merge(region_data, region_institutes, on=region_col)
         
         # '기타'가 너무 많은 경우 필터링 (추정 지역인 경우만)
-        if region_col == 'estimated_region' and '기타' in region_data[region_col].values:
+        if region_estimated and '기타' in region_data[region_col].values:
             other_ratio = region_data[region_data[region_col] == '기타']['budget_billion'].values[0] / region_data['budget_billion'].sum()
             if other_ratio > 0.5:  # 기타가 전체의 50% 이상인 경우
-                st.warning("추정 지역 데이터의 신뢰도가 낮습니다. 'region' 컬럼을 추가하는 것을 권장합니다.")
+                st.warning("추정 지역 데이터의 신뢰도가 낮습니다. 기관 지역 조회표(data/institute_regions.csv)를 보완하는 것을 권장합니다.")
     else:
         st.warning("투자 예산 데이터가 없습니다.")
         return
@@ -91,26 +93,21 @@ def render_region_analysis(filtered_df, filter_config):
     region_list = [str(r) for r in filtered_df[region_col].unique()]
     region_list = sorted(region_list)
     
-    # 연도 목록 - 오름차순 정렬
-    year_list = sorted([int(y) for y in filtered_df['year'].unique()])
-    
     col1, col2 = st.columns(2)
     
     with col1:
         # 연도별 지역 데이터 집계 (산점도 트래킹용)
         if len(filtered_df['year'].unique()) > 1:
-            # 프로젝트 카운트 컬럼이 없는 경우 임시 컬럼 생성
+            # 프로젝트 카운트 컬럼이 없는 경우 임시 컬럼 생성 (공유 원본은 수정하지 않음)
+            year_source = filtered_df
             if 'project_count' not in filtered_df.columns:
-                filtered_df['temp_project_count'] = 1
+                year_source = filtered_df.assign(temp_project_count=1)
                 project_count_col = 'temp_project_count'
             else:
                 project_count_col = 'project_count'
             
             # 지역별 연도별 집계
-            region_year_data = filtered_df.groupby([region_col, 'year']).agg({
-                'budget_billion': 'sum',
-                project_count_col: 'sum'
-            }).reset_index()
+            region_year_data = group_sum(year_source, [region_col, 'year'], ['budget_billion', project_count_col]).reset_index()
             
             # 컬럼명 변경
             if project_count_col == 'temp_project_count':
@@ -120,114 +117,128 @@ def render_region_analysis(filtered_df, filter_config):
             top_regions = region_data.nlargest(6, 'budget_billion')[region_col].tolist()
             region_year_data_filtered = region_year_data[region_year_data[region_col].isin(top_regions)]
             
-            # 산점도 트래킹 그래프 (지역별 경로 추적)
-            fig1 = px.line(
-                region_year_data_filtered,
-                x='budget_billion',
-                y='project_count',
-                color=region_col,
-                markers=True,
-                line_dash=region_col,
-                hover_name=region_col,
-                hover_data=['year', 'budget_billion', 'project_count'],
-                labels={
-                    'budget_billion': '투자 총액 (억원)',
-                    'project_count': '과제수',
-                    region_col: '지역',
-                    'year': '연도'
-                },
-                title=f"{region_title} 투자 패턴 추이 {region_note}"
-            )
-            
-            # 각 지역별 첫 연도와 마지막 연도 강조
-            for region in top_regions:
-                region_data_filtered = region_year_data_filtered[region_year_data_filtered[region_col] == region].sort_values('year')
+            # 전체 지역의 투자 연평균증가율(CAGR)을 한 번에 계산 (종료점 툴팁 표시용)
+            budget_panel = year_panel(region_year_data, region_col, 'budget_billion')
+            region_cagr = panel_series(budget_panel, compound_growth(budget_panel))
+            
+            # 산점도 트래킹 그래프 (지역별 경로 추적, 입력 집계가 같으면 캐시된 그림 재사용)
+            def build_tracking_figure():
+                fig1 = px.line(
+                    region_year_data_filtered,
+                    x='budget_billion',
+                    y='project_count',
+                    color=region_col,
+                    markers=True,
+                    line_dash=region_col,
+                    hover_name=region_col,
+                    hover_data=['year', 'budget_billion', 'project_count'],
+                    labels={
+                        'budget_billion': '투자 총액 (억원)',
+                        'project_count': '과제수',
+                        region_col: '지역',
+                        'year': '연도'
+                    },
+                    title=f"{region_title} 투자 패턴 추이 {region_note}"
+                )
                 
-                if len(region_data_filtered) > 0:
-                    # 첫 연도 (시작점)
-                    first_year = region_data_filtered.iloc[0]
-                    # 마지막 연도 (종료점)
-                    last_year = region_data_filtered.iloc[-1]
-                    
-                    # 시작점 추가 (큰 마커와 연도 텍스트)
-                    fig1.add_trace(go.Scatter(
-                        x=[first_year['budget_billion']],
-                        y=[first_year['project_count']],
-                        mode='markers+text',
-                        marker=dict(size=12, color=fig1.data[top_regions.index(region)].line.color),
-                        text=[str(first_year['year'])],
-                        textposition="top center",
-                        showlegend=False,
-                        hovertemplate=f"{region} ({first_year['year']})<br>투자 총액: {first_year['budget_billion']:,.0f}억원<br>과제수: {first_year['project_count']:,}<extra></extra>"
-                    ))
-                    
-                    # 종료점 추가 (큰 마커와 연도 텍스트)
-                    fig1.add_trace(go.Scatter(
-                        x=[last_year['budget_billion']],
-                        y=[last_year['project_count']],
-                        mode='markers+text',
-                        marker=dict(size=12, color=fig1.data[top_regions.index(region)].line.color),
-                        text=[str(last_year['year'])],
-                        textposition="top center",
-                        showlegend=False,
-                        hovertemplate=f"{region} ({last_year['year']})<br>투자 총액: {last_year['budget_billion']:,.0f}억원<br>과제수: {last_year['project_count']:,}<extra></extra>"
-                    ))
+                # 각 지역별 첫 연도와 마지막 연도 강조
+                for region in top_regions:
+                    region_data_filtered = region_year_data_filtered[region_year_data_filtered[region_col] == region].sort_values('year')
                     
-                    # 화살표 추가 (마지막 데이터 포인트에)
-                    if len(region_data_filtered) > 1:
-                        # 마지막 두 지점 사이의 방향 계산
-                        second_last = region_data_filtered.iloc[-2]
-                        dx = last_year['budget_billion'] - second_last['budget_billion']
-                        dy = last_year['project_count'] - second_last['project_count']
+                    if len(region_data_filtered) > 0:
+                        # 첫 연도 (시작점)
+                        first_year = region_data_filtered.iloc[0]
+                        # 마지막 연도 (종료점)
+                        last_year = region_data_filtered.iloc[-1]
                         
-                        # 방향 벡터 정규화 및 스케일링
-                        magnitude = (dx**2 + dy**2)**0.5
-                        if magnitude > 0:  # 0으로 나누기 방지
-                            dx = dx / magnitude * 5  # 화살표 길이 스케일 조정
-                            dy = dy / magnitude * 5
+                        # 시작점 추가 (큰 마커와 연도 텍스트)
+                        fig1.add_trace(go.Scatter(
+                            x=[first_year['budget_billion']],
+                            y=[first_year['project_count']],
+                            mode='markers+text',
+                            marker=dict(size=12, color=fig1.data[top_regions.index(region)].line.color),
+                            text=[str(first_year['year'])],
+                            textposition="top center",
+                            showlegend=False,
+                            hovertemplate=f"{region} ({first_year['year']})<br>투자 총액: {first_year['budget_billion']:,.0f}억원<br>과제수: {first_year['project_count']:,}<extra></extra>"
+                        ))
+                        
+                        # 종료점 추가 (큰 마커와 연도 텍스트, 첫 연도 대비 연평균증가율 포함)
+                        cagr = region_cagr.get(region)
+                        cagr_text = f"{cagr:+.1f}%" if pd.notna(cagr) else "계산 불가"
+                        fig1.add_trace(go.Scatter(
+                            x=[last_year['budget_billion']],
+                            y=[last_year['project_count']],
+                            mode='markers+text',
+                            marker=dict(size=12, color=fig1.data[top_regions.index(region)].line.color),
+                            text=[str(last_year['year'])],
+                            textposition="top center",
+                            showlegend=False,
+                            hovertemplate=f"{region} ({last_year['year']})<br>투자 총액: {last_year['budget_billion']:,.0f}억원<br>과제수: {last_year['project_count']:,}<br>연평균증가율: {cagr_text}<extra></extra>"
+                        ))
+                        
+                        # 화살표 추가 (마지막 데이터 포인트에)
+                        if len(region_data_filtered) > 1:
+                            # 마지막 두 지점 사이의 방향 계산
+                            second_last = region_data_filtered.iloc[-2]
+                            dx = last_year['budget_billion'] - second_last['budget_billion']
+                            dy = last_year['project_count'] - second_last['project_count']
                             
-                            fig1.add_annotation(
-                                x=last_year['budget_billion'],
-                                y=last_year['project_count'],
-                                ax=last_year['budget_billion'] + dx,
-                                ay=last_year['project_count'] + dy,
-                                xref="x", yref="y",
-                                axref="x", ayref="y",
-                                showarrow=True,
-                                arrowhead=2,
-                                arrowsize=1,
-                                arrowwidth=2,
-                                arrowcolor=fig1.data[top_regions.index(region)].line.color
-                            )
-            
-            fig1.update_layout(
-                height=500,
-                margin=dict(t=80, b=50, l=50, r=50),
-                title_x=0.5,
-                title_y=0.95,
-                **graph_config,
-                xaxis=dict(
-                    title='투자 총액 (억원)',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickformat=","  # 천단위 콤마
-                ),
-                yaxis=dict(
-                    title='과제수',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickformat=","  # 천단위 콤마
-                ),
-                legend=dict(
-                    title='지역',
-                    orientation='h',
-                    yanchor='bottom',
-                    y=1.02,
-                    xanchor='center',
-                    x=0.5
+                            # 방향 벡터 정규화 및 스케일링
+                            magnitude = (dx**2 + dy**2)**0.5
+                            if magnitude > 0:  # 0으로 나누기 방지
+                                dx = dx / magnitude * 5  # 화살표 길이 스케일 조정
+                                dy = dy / magnitude * 5
+                                
+                                fig1.add_annotation(
+                                    x=last_year['budget_billion'],
+                                    y=last_year['project_count'],
+                                    ax=last_year['budget_billion'] + dx,
+                                    ay=last_year['project_count'] + dy,
+                                    xref="x", yref="y",
+                                    axref="x", ayref="y",
+                                    showarrow=True,
+                                    arrowhead=2,
+                                    arrowsize=1,
+                                    arrowwidth=2,
+                                    arrowcolor=fig1.data[top_regions.index(region)].line.color
+                                )
+                
+                fig1.update_layout(
+                    height=500,
+                    margin=dict(t=80, b=50, l=50, r=50),
+                    title_x=0.5,
+                    title_y=0.95,
+                    **graph_config,
+                    xaxis=dict(
+                        title='투자 총액 (억원)',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickformat=","  # 천단위 콤마
+                    ),
+                    yaxis=dict(
+                        title='과제수',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickformat=","  # 천단위 콤마
+                    ),
+                    legend=dict(
+                        title='지역',
+                        orientation='h',
+                        yanchor='bottom',
+                        y=1.02,
+                        xanchor='center',
+                        x=0.5
+                    )
                 )
+                return fig1
+            
+            plotly_chart_cached(
+                'region_tracking',
+                [region_year_data_filtered, top_regions, region_cagr, region_col, region_title, region_note, graph_config],
+                build_tracking_figure,
+                use_container_width=True
             )
-            st.plotly_chart(fig1, use_container_width=True)
         else:
             # 단일 연도인 경우 버블 차트
             fig1 = px.scatter(
@@ -275,69 +286,77 @@ def render_region_analysis(filtered_df, filter_config):
             st.plotly_chart(fig1, use_container_width=True)
     
     with col2:
-        # 지역별 연구분야 분포 - 애니메이션
+        # 지역별 연구분야 분포 - 연도 선택
         if 'research_area' in filtered_df.columns and len(filtered_df['year'].unique()) > 1:
-            region_area_year = filtered_df.groupby([region_col, 'research_area', 'year'])['budget_billion'].sum().reset_index()
+            region_area_year = group_sum(filtered_df, [region_col, 'research_area', 'year'], ['budget_billion']).reset_index()
             
             # 상위 연구분야 식별
-            top_areas = filtered_df.groupby('research_area')['budget_billion'].sum().nlargest(5).index.tolist()
+            top_areas = group_sum(filtered_df, ['research_area'], ['budget_billion'])['budget_billion'].nlargest(5).index.tolist()
             region_area_year = region_area_year[region_area_year['research_area'].isin(top_areas)]
             
             # 연도를 문자열로 변환
             region_area_year['year'] = region_area_year['year'].astype(str)
             
-            fig2 = px.bar(
-                region_area_year,
-                x=region_col,
-                y='budget_billion',
-                color='research_area',
-                animation_frame='year',
-                title=f"{region_title} 연구분야 분포 {region_note}",
-                barmode='stack',
-                category_orders={
-                    region_col: region_list,
-                    'year': [str(y) for y in year_list]  # 연도 순서 지정
-                }
-            )
+            # 연도마다 색상이 바뀌지 않도록 전체 기간 기준 색상 순서 고정
+            area_order = region_area_year['research_area'].astype(str).unique().tolist()
             
-            fig2.update_layout(
-                height=500,
-                margin=dict(t=80, b=50, l=50, r=50),
-                title_x=0.5,
-                title_y=0.95,
-                **graph_config,
-                xaxis=dict(
-                    title='지역',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickangle=-30
-                ),
-                yaxis=dict(
-                    title='정부연구비 (억원)',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickformat=","  # 천단위 콤마
-                ),
-                legend=dict(
-                    title='연구분야',
-                    orientation='h',
-                    yanchor='bottom',
-                    y=1.02,
-                    xanchor='center',
-                    x=0.5
+            def build_year_figure(year_frame, year):
+                fig2 = px.bar(
+                    year_frame,
+                    x=region_col,
+                    y='budget_billion',
+                    color='research_area',
+                    title=f"{region_title} 연구분야 분포 {region_note}",
+                    barmode='stack',
+                    category_orders={
+                        region_col: region_list,
+                        'research_area': area_order
+                    }
                 )
-            )
-            
-            # 연도 슬라이더 스타일 수정
-            fig2.layout.sliders[0].currentvalue = {"prefix": "연도: "}
+                
+                fig2.update_layout(
+                    height=500,
+                    margin=dict(t=80, b=50, l=50, r=50),
+                    title_x=0.5,
+                    title_y=0.95,
+                    **graph_config,
+                    xaxis=dict(
+                        title='지역',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickangle=-30
+                    ),
+                    yaxis=dict(
+                        title='정부연구비 (억원)',
+                        title_font=dict(size=16),
+                        tickfont=dict(size=14),
+                        tickformat=","  # 천단위 콤마
+                    ),
+                    legend=dict(
+                        title='연구분야',
+                        orientation='h',
+                        yanchor='bottom',
+                        y=1.02,
+                        xanchor='center',
+                        x=0.5
+                    )
+                )
+                return fig2
             
-            st.plotly_chart(fig2, use_container_width=True)
+            year_stepper_chart(
+                'region_area_year',
+                region_area_year,
+                sorted(region_area_year['year'].unique().tolist()),
+                build_year_figure,
+                inputs=[region_col, region_list, area_order, region_title, region_note, graph_config],
+                use_container_width=True
+            )
         elif 'research_area' in filtered_df.columns:
             # 단일 연도 데이터
-            region_area = filtered_df.groupby([region_col, 'research_area'])['budget_billion'].sum().reset_index()
+            region_area = group_sum(filtered_df, [region_col, 'research_area'], ['budget_billion']).reset_index()
             
             # 상위 연구분야 식별
-            top_areas = filtered_df.groupby('research_area')['budget_billion'].sum().nlargest(5).index.tolist()
+            top_areas = group_sum(filtered_df, ['research_area'], ['budget_billion'])['budget_billion'].nlargest(5).index.tolist()
             region_area = region_area[region_area['research_area'].isin(top_areas)]
             
             fig2 = px.bar(
@@ -387,59 +406,116 @@ def render_region_analysis(filtered_df, filter_config):
     col3, col4 = st.columns(2)
     
     with col3:
-        # 지역별 수행주체 분포 - 애니메이션 (지역 기준)
+        # 지역별 수행주체 분포 - 연도 선택 (지역 기준)
         if len(filtered_df['year'].unique()) > 1:
-            # 각 지역별로 상위 수행주체 선택
             # 각 지역별로 투자액 상위 5개 수행주체 선택
-            top_institutes_by_region = {}
-            for region in filtered_df[region_col].unique():
-                region_data_filtered = filtered_df[filtered_df[region_col] == region]
-                top_institutes = region_data_filtered.groupby('institute')['budget_billion'].sum().nlargest(5).index.tolist()
-                top_institutes_by_region[region] = top_institutes
+            top_institutes_by_region = top_k_per_group(filtered_df, [region_col], 'institute', 'budget_billion', 5)
             
-            # 모든 상위 수행주체 목록 생성
-            all_top_institutes = []
-            for institutes in top_institutes_by_region.values():
-                all_top_institutes.extend(institutes)
-            all_top_institutes = list(set(all_top_institutes))
-            
-            # 연도별 지역-수행주체 데이터 생성
-            region_institute_year_data = []
-            for year in filtered_df['year'].unique():
-                year_data = filtered_df[filtered_df['year'] == year]
-                
-                for region in filtered_df[region_col].unique():
-                    if region in top_institutes_by_region:
-                        region_institutes = top_institutes_by_region[region]
-                        
-                        for institute in region_institutes:
-                            budget = year_data[(year_data[region_col] == region) & (year_data['institute'] == institute)]['budget_billion'].sum()
-                            if budget > 0:  # 투자액이 있는 경우만 추가
-                                region_institute_year_data.append({
-                                    'year': year,
-                                    region_col: region,
-                                    'institute': institute,
-                                    'budget_billion': budget
-                                })
-            
-            if region_institute_year_data:
-                region_institute_year_df = pd.DataFrame(region_institute_year_data)
-                
+            # 연도별 지역-수행주체 투자액 중 지역별 상위 수행주체만 (투자액이 있는 경우만)
+            region_institute_year_df = group_sum(filtered_df, ['year', region_col, 'institute'], ['budget_billion']).reset_index()
+            region_institute_year_df = region_institute_year_df.merge(
+                top_institutes_by_region[[region_col, 'institute', 'rank']], on=[region_col, 'institute']
+            )
+            region_institute_year_df = region_institute_year_df[region_institute_year_df['budget_billion'] > 0]
+            
+            # 연도·지역은 데이터 등장 순서, 수행주체는 지역 내 투자액 순위 순으로 정렬
+            year_order = {year: i for i, year in enumerate(filtered_df['year'].unique())}
+            region_order = {region: i for i, region in enumerate(filtered_df[region_col].unique())}
+            region_institute_year_df = region_institute_year_df.assign(
+                year_order=region_institute_year_df['year'].map(year_order),
+                region_order=region_institute_year_df[region_col].astype(str).map(region_order)
+            ).sort_values(['year_order', 'region_order', 'rank'])
+            region_institute_year_df = region_institute_year_df[['year', region_col, 'institute', 'budget_billion']].astype(
+                {region_col: str, 'institute': str}
+            ).reset_index(drop=True)
+            
+            # 지역별 상위 수행주체를 모두 합쳐도 색상(트레이스) 수가 상한을 넘지 않도록 나머지는 '기타'로 합산
+            region_institute_year_df = bucket_top_k(region_institute_year_df, 'institute', 'budget_billion', TOP_K['region_institute'])
+            
+            if not region_institute_year_df.empty:
                 # 연도를 문자열로 변환
                 region_institute_year_df['year'] = region_institute_year_df['year'].astype(str)
                 
-                fig3 = px.bar(
+                # 연도마다 색상이 바뀌지 않도록 전체 기간 기준 색상 순서 고정
+                institute_order = region_institute_year_df['institute'].astype(str).unique().tolist()
+                
+                def build_year_figure(year_frame, year):
+                    fig3 = px.bar(
+                        year_frame,
+                        x=region_col,
+                        y='budget_billion',
+                        color='institute',
+                        title=f"{region_title} 주요 수행주체 분포 {region_note}",
+                        barmode='stack',
+                        category_orders={
+                            region_col: region_list,
+                            'institute': institute_order
+                        }
+                    )
+                    
+                    fig3.update_layout(
+                        height=500,
+                        margin=dict(t=80, b=100, l=50, r=50),
+                        title_x=0.5,
+                        title_y=0.95,
+                        **graph_config,
+                        xaxis=dict(
+                            title='지역',
+                            title_font=dict(size=16),
+                            tickfont=dict(size=14),
+                            tickangle=-30
+                        ),
+                        yaxis=dict(
+                            title='정부연구비 (억원)',
+                            title_font=dict(size=16),
+                            tickfont=dict(size=14),
+                            tickformat=","  # 천단위 콤마
+                        ),
+                        legend=dict(
+                            title='연구수행주체',
+                            orientation='h',
+                            yanchor='bottom',
+                            y=1.02,
+                            xanchor='center',
+                            x=0.5
+                        )
+                    )
+                    return fig3
+                
+                year_stepper_chart(
+                    'region_institute_year',
                     region_institute_year_df,
+                    sorted(region_institute_year_df['year'].unique().tolist()),
+                    build_year_figure,
+                    inputs=[region_col, region_list, institute_order, region_title, region_note, graph_config],
+                    use_container_width=True
+                )
+            else:
+                st.info("지역별 주요 수행주체 데이터가 없습니다.")
+        else:
+            # 단일 연도 데이터 - 지역별 상위 수행주체
+            # 각 지역별로 투자액 상위 5개 수행주체 선택
+            top_institutes_by_region = top_k_per_group(filtered_df, [region_col], 'institute', 'budget_billion', 5)
+            region_order = {region: i for i, region in enumerate(filtered_df[region_col].unique())}
+            region_institute_df = top_institutes_by_region.assign(
+                region_order=top_institutes_by_region[region_col].astype(str).map(region_order)
+            ).sort_values(['region_order', 'rank'])
+            region_institute_df = region_institute_df[[region_col, 'institute', 'budget_billion']].astype(
+                {region_col: str, 'institute': str}
+            ).reset_index(drop=True)
+            
+            # 지역별 상위 수행주체를 모두 합쳐도 색상(트레이스) 수가 상한을 넘지 않도록 나머지는 '기타'로 합산
+            region_institute_df = bucket_top_k(region_institute_df, 'institute', 'budget_billion', TOP_K['region_institute'])
+            
+            if not region_institute_df.empty:
+                fig3 = px.bar(
+                    region_institute_df,
                     x=region_col,
                     y='budget_billion',
                     color='institute',
-                    animation_frame='year',
                     title=f"{region_title} 주요 수행주체 분포 {region_note}",
                     barmode='stack',
-                    category_orders={
-                        region_col: region_list,
-                        'year': [str(y) for y in year_list]  # 연도 순서 지정
-                    }
+                    category_orders={region_col: region_list}
                 )
                 
                 fig3.update_layout(
@@ -469,45 +545,38 @@ def render_region_analysis(filtered_df, filter_config):
                         x=0.5
                     )
                 )
-                
-                # 연도 슬라이더 스타일 수정
-                fig3.layout.sliders[0].currentvalue = {"prefix": "연도: "}
-                
                 st.plotly_chart(fig3, use_container_width=True)
             else:
                 st.info("지역별 주요 수행주체 데이터가 없습니다.")
-        else:
-            # 단일 연도 데이터 - 지역별 상위 수행주체
-            # 각 지역별로 투자액 상위 5개 수행주체 선택
-            region_institute_data = []
+    
+    with col4:
+        # 연구단계별 지역 분포 - 연도 선택
+        if 'project_type' in filtered_df.columns and len(filtered_df['year'].unique()) > 1:
+            region_type_year = group_sum(filtered_df, [region_col, 'project_type', 'year'], ['budget_billion']).reset_index()
             
-            for region in filtered_df[region_col].unique():
-                region_data_filtered = filtered_df[filtered_df[region_col] == region]
-                top_institutes = region_data_filtered.groupby('institute')['budget_billion'].sum().nlargest(5)
-                
-                for institute, budget in top_institutes.items():
-                    region_institute_data.append({
-                        region_col: region,
-                        'institute': institute,
-                        'budget_billion': budget
-                    })
+            # 연도를 문자열로 변환
+            region_type_year['year'] = region_type_year['year'].astype(str)
             
-            if region_institute_data:
-                region_institute_df = pd.DataFrame(region_institute_data)
-                
-                fig3 = px.bar(
-                    region_institute_df,
+            # 연도마다 색상이 바뀌지 않도록 전체 기간 기준 색상 순서 고정
+            type_order = region_type_year['project_type'].astype(str).unique().tolist()
+            
+            def build_year_figure(year_frame, year):
+                fig4 = px.bar(
+                    year_frame,
                     x=region_col,
                     y='budget_billion',
-                    color='institute',
-                    title=f"{region_title} 주요 수행주체 분포 {region_note}",
+                    color='project_type',
+                    title=f"{region_title} 연구단계 분포 {region_note}",
                     barmode='stack',
-                    category_orders={region_col: region_list}
+                    category_orders={
+                        region_col: region_list,
+                        'project_type': type_order
+                    }
                 )
                 
-                fig3.update_layout(
+                fig4.update_layout(
                     height=500,
-                    margin=dict(t=80, b=100, l=50, r=50),
+                    margin=dict(t=80, b=50, l=50, r=50),
                     title_x=0.5,
                     title_y=0.95,
                     **graph_config,
@@ -524,7 +593,7 @@ def render_region_analysis(filtered_df, filter_config):
                         tickformat=","  # 천단위 콤마
                     ),
                     legend=dict(
-                        title='연구수행주체',
+                        title='연구단계',
                         orientation='h',
                         yanchor='bottom',
                         y=1.02,
@@ -532,67 +601,19 @@ def render_region_analysis(filtered_df, filter_config):
                         x=0.5
                     )
                 )
-                st.plotly_chart(fig3, use_container_width=True)
-            else:
-                st.info("지역별 주요 수행주체 데이터가 없습니다.")
-    
-    with col4:
-        # 연구단계별 지역 분포 - 애니메이션
-        if 'project_type' in filtered_df.columns and len(filtered_df['year'].unique()) > 1:
-            region_type_year = filtered_df.groupby([region_col, 'project_type', 'year'])['budget_billion'].sum().reset_index()
+                return fig4
             
-            # 연도를 문자열로 변환
-            region_type_year['year'] = region_type_year['year'].astype(str)
-            
-            fig4 = px.bar(
+            year_stepper_chart(
+                'region_type_year',
                 region_type_year,
-                x=region_col,
-                y='budget_billion',
-                color='project_type',
-                animation_frame='year',
-                title=f"{region_title} 연구단계 분포 {region_note}",
-                barmode='stack',
-                category_orders={
-                    region_col: region_list,
-                    'year': [str(y) for y in year_list]  # 연도 순서 지정
-                }
-            )
-            
-            fig4.update_layout(
-                height=500,
-                margin=dict(t=80, b=50, l=50, r=50),
-                title_x=0.5,
-                title_y=0.95,
-                **graph_config,
-                xaxis=dict(
-                    title='지역',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickangle=-30
-                ),
-                yaxis=dict(
-                    title='정부연구비 (억원)',
-                    title_font=dict(size=16),
-                    tickfont=dict(size=14),
-                    tickformat=","  # 천단위 콤마
-                ),
-                legend=dict(
-                    title='연구단계',
-                    orientation='h',
-                    yanchor='bottom',
-                    y=1.02,
-                    xanchor='center',
-                    x=0.5
-                )
+                sorted(region_type_year['year'].unique().tolist()),
+                build_year_figure,
+                inputs=[region_col, region_list, type_order, region_title, region_note, graph_config],
+                use_container_width=True
             )
-            
-            # 연도 슬라이더 스타일 수정
-            fig4.layout.sliders[0].currentvalue = {"prefix": "연도: "}
-            
-            st.plotly_chart(fig4, use_container_width=True)
         elif 'project_type' in filtered_df.columns:
             # 단일 연도 데이터
-            region_type = filtered_df.groupby([region_col, 'project_type'])['budget_billion'].sum().reset_index()
+            region_type = group_sum(filtered_df, [region_col, 'project_type'], ['budget_billion']).reset_index()
             
             fig4 = px.bar(
                 region_type,
@@ -1,20 +1,234 @@
 import streamlit as st
+import numpy as np
+from utils.data_processing import NULL_OPTION, TAXONOMY_LEVELS, build_taxonomy_tree, taxonomy_paths, taxonomy_children, taxonomy_levels
+from utils.search_index import SEARCH_MAX_RESULTS, search_values
+from utils.data_filters import build_filter_index, index_options
 
-def create_sidebar(df):
-    """사이드바 생성 및 필터 설정 반환"""
-    st.sidebar.header("📋 필터 옵션")
+# 값 종류가 이보다 많은 차원은 체크박스 목록 대신 검색형 선택 모드 사용
+PICKER_CHECKBOX_LIMIT = 200
+
+def _facet_counts(facets, col, options):
+    """선택지별 (행 수, 예산) - 해당 차원 자신의 필터를 뺀 나머지 필터 기준 (패싯이 없으면 None)"""
+    if not facets or col not in facets:
+        return None
+    facet = facets[col]
+    positions = facet['values'].get_indexer(list(options))
+    counts = {
+        option: (int(facet['rows'][p]), float(facet['budget'][p])) if p >= 0 else (0, 0.0)
+        for option, p in zip(options, positions)
+    }
+    if NULL_OPTION in counts:
+        counts[NULL_OPTION] = (facet['null_rows'], facet['null_budget'])
+    return counts
+
+def _split_empty_options(prefix, options, counts):
+    """건수가 0인 선택지를 숨김 → (표시할 선택지, 숨겼지만 선택된 값)
+    
+    숨긴 선택지의 체크 상태는 그대로 두어, 다른 필터를 되돌리면 이전 선택 상태로 다시 표시된다.
+    """
+    if counts is None:
+        return options, []
+    
+    visible, hidden_selected = [], []
+    for option in options:
+        if counts[option][0] > 0:
+            visible.append(option)
+            continue
+        key = f"{prefix}_{option}"
+        if key in st.session_state:
+            # 이번 실행에서 그리지 않는 위젯의 상태가 지워지지 않도록 다시 기록
+            st.session_state[key] = st.session_state[key]
+        if st.session_state.get(key, True):
+            hidden_selected.append(option)
+    return visible, hidden_selected
+
+def _set_options(prefix, options, value):
+    for option in options:
+        st.session_state[f"{prefix}_{option}"] = value
+
+def _select_all_buttons(prefix, options):
+    """전체선택/전체해제 버튼 (콜백으로 체크 상태를 바꿔 실행 시작 전에 선택 상태가 확정됨)"""
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("전체선택", key=f"{prefix}_all", use_container_width=True, on_click=_set_options, args=(prefix, options, True))
+    with col2:
+        st.button("전체해제", key=f"{prefix}_none", use_container_width=True, on_click=_set_options, args=(prefix, options, False))
+
+def _search_options(options, search):
+    """검색어가 포함된 선택지 (대소문자 무시, 검색어가 없으면 전체)"""
+    if not search:
+        return options
+    return [option for option in options if search.lower() in option.lower()]
+
+def _checked_options(prefix, options):
+    """체크된 선택지 (위젯을 그리기 전에는 세션 상태 기준, 기본값은 선택)"""
+    return [option for option in options if st.session_state.get(f"{prefix}_{option}", True)]
+
+def _facet_checkbox(prefix, option, counts):
+    """건수를 붙인 선택지 체크박스 (예산 합계는 도움말로 표시)"""
+    key = f"{prefix}_{option}"
+    default_value = st.session_state.get(key, True)
+    if counts is None:
+        return st.checkbox(option, value=default_value, key=key)
+    rows, budget = counts[option]
+    return st.checkbox(f"{option} ({rows:,})", value=default_value, key=key, help=f"투자예산 {budget:,.1f}억원")
+
+def _picker_state(key):
+    """검색형 선택 상태 - include가 False면 codes를 제외한 전체, True면 codes만 선택"""
+    state_key = f"{key}_selection"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = {'include': False, 'codes': set()}
+    return st.session_state[state_key]
+
+def _is_picked(state, code):
+    return (code in state['codes']) == state['include']
+
+def _set_picked(state, code, picked):
+    if picked == state['include']:
+        state['codes'].add(code)
+    else:
+        state['codes'].discard(code)
+
+def _on_pick(key, code):
+    _set_picked(_picker_state(key), code, st.session_state[f"{key}_pick_{code}"])
+
+def _pick_all(key, picked):
+    state = _picker_state(key)
+    state['include'] = not picked
+    state['codes'] = set()
+
+def _pick_codes(key, codes, picked):
+    state = _picker_state(key)
+    for code in codes:
+        _set_picked(state, code, picked)
+
+def _picked_labels(key, search_index):
+    """검색형 선택 상태에서 선택된 값 목록 (결측 행 포함 체크 시 NULL_OPTION 추가)"""
+    state = _picker_state(key)
+    if state['include']:
+        selected_codes = sorted(state['codes'], key=lambda code: search_index['labels'][code])
+    else:
+        selected_codes = [code for code in search_index['codes'] if code not in state['codes']]
+    labels = [search_index['labels'][code] for code in selected_codes]
+    if search_index['nulls'] and st.session_state.get(f"{key}_null", True):
+        labels.append(NULL_OPTION)
+    return labels
+
+def _render_value_picker(key, search_index, search_label, facet=None):
+    """검색형 선택 위젯 렌더링 후 선택된 값 목록 반환
+    
+    검색 결과 상위 항목만 체크박스로 표시하고, 선택 상태는 값 코드 집합 하나로 세션에 저장한다.
+    facet이 있으면 다른 필터 기준 건수를 표시하고 건수가 0인 값은 검색 결과에서 뺀다.
+    """
+    state = _picker_state(key)
+    all_codes = search_index['codes']
+    
+    counts = search_index['counts']
+    if facet is not None:
+        positions = facet['values'].get_indexer(search_index['labels'])
+        counts = np.where(positions >= 0, facet['rows'][positions], 0)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("전체선택", key=f"{key}_all", use_container_width=True, on_click=_pick_all, args=(key, True))
+    with col2:
+        st.button("전체해제", key=f"{key}_none", use_container_width=True, on_click=_pick_all, args=(key, False))
+    
+    search = st.text_input(search_label, placeholder="검색어를 입력하세요", key=f"{key}_search")
+    matches = search_values(search_index, search)
+    if facet is not None:
+        matches = [code for code in matches if counts[code] > 0]
+    
+    # 검색 결과 일괄 선택/해제
+    if search:
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button("검색 결과 선택", key=f"{key}_match_all", use_container_width=True, on_click=_pick_codes, args=(key, matches, True))
+        with col2:
+            st.button("검색 결과 해제", key=f"{key}_match_none", use_container_width=True, on_click=_pick_codes, args=(key, matches, False))
+    
+    # 값이 비어 있는 행은 검색 대상과 별개로 포함 여부만 선택
+    if search_index['nulls']:
+        null_rows = facet['null_rows'] if facet is not None else search_index['nulls']
+        st.checkbox(f"{NULL_OPTION} ({null_rows:,})", value=st.session_state.get(f"{key}_null", True), key=f"{key}_null")
+    
+    n_selected = len(state['codes']) if state['include'] else len(all_codes) - len(state['codes'])
+    shown = matches[:SEARCH_MAX_RESULTS]
+    st.caption(f"선택 {n_selected:,}/{len(all_codes):,}개 · 검색 결과 {len(matches):,}개 중 {len(shown)}개 표시")
+    
+    # 검색 결과 목록을 여러 열로 배치
+    num_cols = 2  # 2열로 배치
+    cols = st.columns(num_cols)
+    
+    for i, code in enumerate(shown):
+        widget_key = f"{key}_pick_{code}"
+        st.session_state[widget_key] = _is_picked(state, code)
+        with cols[i % num_cols]:
+            label = f"{search_index['labels'][code]} ({counts[code]:,})"
+            st.checkbox(label, key=widget_key, on_change=_on_pick, args=(key, code))
+    
+    return _picked_labels(key, search_index)
+
+def _year_options(filter_index):
+    # 2018년 이후 데이터만 표시
+    return [y for y in index_options(filter_index, 'year', include_null=False) if y >= 2018]
+
+def _dimension_options(filter_index, col, search_index):
+    """체크박스 목록 선택지 (결측 행이 있으면 NULL_OPTION을 마지막에 추가, 값이 많아 검색형 선택 모드이면 None)"""
+    if search_index is not None and len(search_index['codes']) > PICKER_CHECKBOX_LIMIT:
+        return None
+    return index_options(filter_index, col)
+
+def sidebar_filter_config(df, taxonomy=None, search_indexes=None, filter_index=None):
+    """사이드바 위젯을 그리기 전에 세션 상태만으로 이번 실행의 필터 설정 계산 (create_sidebar 결과와 같은 선택)
+    
+    버튼은 콜백으로 상태를 바꾸므로 실행 시작 시점의 위젯 상태가 곧 이번 실행의 선택이다.
+    선택지별 건수(facets)를 사이드바를 그리기 전에 현재 선택 기준으로 계산할 때 사용한다.
+    """
+    search_indexes = search_indexes or {}
+    if taxonomy is None:
+        taxonomy = build_taxonomy_tree(df)
+    if filter_index is None:
+        filter_index = build_filter_index(df)
+    
+    filter_config = {
+        'selected_years': _checked_options('year', _year_options(filter_index)),
+        'year_column': 'year'
+    }
     
-    # 데이터 타입 변환 - 문자열로 통일
-    if 'institute' in df.columns:
-        df['institute'] = df['institute'].astype(str)
-    if 'ministry' in df.columns:
-        df['ministry'] = df['ministry'].astype(str)
-    if 'research_area' in df.columns:
-        df['research_area'] = df['research_area'].astype(str)
-    if 'research_area_medium' in df.columns:
-        df['research_area_medium'] = df['research_area_medium'].astype(str)
-    if 'research_area_small' in df.columns:
-        df['research_area_small'] = df['research_area_small'].astype(str)
+    for col, prefix, key in [('ministry', 'ministry', 'selected_ministries'), ('institute', 'institute', 'selected_institutes')]:
+        search_index = search_indexes.get(col)
+        options = _dimension_options(filter_index, col, search_index)
+        if options is None:
+            filter_config[key] = _picked_labels(col, search_index)
+        else:
+            filter_config[key] = _checked_options(prefix, _search_options(options, st.session_state.get(f"{prefix}_search")))
+    
+    # 연구분야는 상위 선택에 따라 하위 선택지가 정해짐
+    selections = []
+    for (_, col), prefix, key in zip(TAXONOMY_LEVELS, ['area', 'medium', 'small'], ['selected_areas', 'selected_medium', 'selected_small']):
+        selected = []
+        if col in df.columns:
+            options = taxonomy_children(taxonomy, taxonomy_paths(taxonomy, selections), include_null=True)
+            selected = _checked_options(prefix, _search_options(options, st.session_state.get(f"{prefix}_search")))
+        filter_config[key] = selected
+        selections.append(selected)
+    filter_config['tech_levels'] = taxonomy_levels(taxonomy, selections)
+    
+    return filter_config
+
+def create_sidebar(df, taxonomy=None, search_indexes=None, facets=None, filter_index=None):
+    """사이드바 생성 및 필터 설정 반환
+    
+    taxonomy: 미리 만든 연구분야 트리, search_indexes: 컬럼별 값 검색 인덱스 (부처/수행주체),
+    facets: 컬럼별 값 건수/예산 (선택지 옆에 표시하고 건수가 0인 선택지는 숨김),
+    filter_index: 미리 만든 필터 인덱스 (연도/부처/수행주체 선택지를 값별 행 수에서 조회)
+    """
+    search_indexes = search_indexes or {}
+    facets = facets or {}
+    if filter_index is None:
+        filter_index = build_filter_index(df)
+    st.sidebar.header("📋 필터 옵션")
     
     # 필터 설정 저장할 딕셔너리
     filter_config = {}
@@ -22,18 +236,9 @@ def create_sidebar(df):
     # 연도 필터
     with st.sidebar.expander("📅 연도 (투자년도)", expanded=True):
         year_col = 'year'
-        # 2018년 이후 데이터만 표시
-        year_options = sorted([y for y in df['year'].unique() if y >= 2018])
+        year_options = _year_options(filter_index)
         
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("전체선택", key="year_all", use_container_width=True):
-                for year in year_options:
-                    st.session_state[f"year_{year}"] = True
-        with col2:
-            if st.button("전체해제", key="year_none", use_container_width=True):
-                for year in year_options:
-                    st.session_state[f"year_{year}"] = False
+        _select_all_buttons('year', year_options)
         
         # 연도 체크박스를 여러 열로 배치
         num_cols = 2  # 2열로 배치
@@ -52,79 +257,63 @@ def create_sidebar(df):
     
     # 부처 필터
     with st.sidebar.expander("🏛️ 부처", expanded=False):
-        ministry_options = sorted(df['ministry'].unique())
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("전체선택", key="ministry_all", use_container_width=True):
-                for ministry in ministry_options:
-                    st.session_state[f"ministry_{ministry}"] = True
-        with col2:
-            if st.button("전체해제", key="ministry_none", use_container_width=True):
-                for ministry in ministry_options:
-                    st.session_state[f"ministry_{ministry}"] = False
-        
-        # 검색 필터 추가
-        ministry_search = st.text_input("부처 검색", placeholder="검색어를 입력하세요")
-        if ministry_search:
-            filtered_ministries = [m for m in ministry_options if ministry_search.lower() in m.lower()]
+        # 값이 많으면 검색형 선택 모드
+        ministry_index = search_indexes.get('ministry')
+        ministry_options = _dimension_options(filter_index, 'ministry', ministry_index)
+        if ministry_options is None:
+            filter_config['selected_ministries'] = _render_value_picker('ministry', ministry_index, "부처 검색", facets.get('ministry'))
         else:
-            filtered_ministries = ministry_options
-        
-        # 부처 목록을 여러 열로 배치
-        num_cols = 2  # 2열로 배치
-        cols = st.columns(num_cols)
-        
-        selected_ministries = []
-        for i, ministry in enumerate(filtered_ministries):
-            with cols[i % num_cols]:
-                default_value = st.session_state.get(f"ministry_{ministry}", True)
-                if st.checkbox(ministry, value=default_value, key=f"ministry_{ministry}"):
-                    selected_ministries.append(ministry)
-        
-        filter_config['selected_ministries'] = selected_ministries
+            
+            _select_all_buttons('ministry', ministry_options)
+            
+            # 검색 필터 추가
+            ministry_search = st.text_input("부처 검색", placeholder="검색어를 입력하세요", key="ministry_search")
+            filtered_ministries = _search_options(ministry_options, ministry_search)
+            
+            # 부처 목록을 여러 열로 배치
+            num_cols = 2  # 2열로 배치
+            cols = st.columns(num_cols)
+            
+            # 다른 필터 기준 건수를 표시하고 건수가 0인 선택지는 숨김 (선택 상태는 유지)
+            ministry_counts = _facet_counts(facets, 'ministry', filtered_ministries)
+            filtered_ministries, selected_ministries = _split_empty_options('ministry', filtered_ministries, ministry_counts)
+            for i, ministry in enumerate(filtered_ministries):
+                with cols[i % num_cols]:
+                    if _facet_checkbox('ministry', ministry, ministry_counts):
+                        selected_ministries.append(ministry)
+            
+            filter_config['selected_ministries'] = selected_ministries
     
     # 연구분야 필터
     with st.sidebar.expander("🔬 연구분야", expanded=False):
-        tech_levels = []
+        # 대분류→중분류→소분류 선택지는 연구분야 트리에서 조회
+        if taxonomy is None:
+            taxonomy = build_taxonomy_tree(df)
         
         # 대분류
         if 'research_area' in df.columns:
             st.write("**대분류**")
-            area_options = sorted(df['research_area'].unique())
+            area_options = taxonomy_children(taxonomy, include_null=True)
             
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("전체선택", key="area_all", use_container_width=True):
-                    for area in area_options:
-                        st.session_state[f"area_{area}"] = True
-            with col2:
-                if st.button("전체해제", key="area_none", use_container_width=True):
-                    for area in area_options:
-                        st.session_state[f"area_{area}"] = False
+            _select_all_buttons('area', area_options)
             
             # 검색 필터 추가
-            area_search = st.text_input("연구분야 검색", placeholder="검색어를 입력하세요")
-            if area_search:
-                filtered_areas = [a for a in area_options if area_search.lower() in a.lower()]
-            else:
-                filtered_areas = area_options
+            area_search = st.text_input("연구분야 검색", placeholder="검색어를 입력하세요", key="area_search")
+            filtered_areas = _search_options(area_options, area_search)
             
             # 연구분야 목록을 여러 열로 배치
             num_cols = 2  # 2열로 배치
             cols = st.columns(num_cols)
             
-            selected_areas = []
+            # 다른 필터 기준 건수를 표시하고 건수가 0인 선택지는 숨김 (선택 상태는 유지)
+            area_counts = _facet_counts(facets, 'research_area', filtered_areas)
+            filtered_areas, selected_areas = _split_empty_options('area', filtered_areas, area_counts)
             for i, area in enumerate(filtered_areas):
                 with cols[i % num_cols]:
-                    default_value = st.session_state.get(f"area_{area}", True)
-                    if st.checkbox(area, value=default_value, key=f"area_{area}"):
+                    if _facet_checkbox('area', area, area_counts):
                         selected_areas.append(area)
             
             filter_config['selected_areas'] = selected_areas
-            
-            if selected_areas:
-                tech_levels.append("대분류")
         else:
             selected_areas = []
             filter_config['selected_areas'] = selected_areas
@@ -132,42 +321,28 @@ def create_sidebar(df):
         # 중분류 - 대분류 선택에 따라 필터링
         if 'research_area_medium' in df.columns:
             st.write("**중분류**")
-            filtered_medium = df[df['research_area'].isin(selected_areas)]['research_area_medium'].dropna().unique()
-            medium_options = sorted(filtered_medium)
+            medium_options = taxonomy_children(taxonomy, taxonomy_paths(taxonomy, [selected_areas]), include_null=True)
             
             if len(medium_options) > 0:
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("전체선택", key="medium_all", use_container_width=True):
-                        for medium in medium_options:
-                            st.session_state[f"medium_{medium}"] = True
-                with col2:
-                    if st.button("전체해제", key="medium_none", use_container_width=True):
-                        for medium in medium_options:
-                            st.session_state[f"medium_{medium}"] = False
+                _select_all_buttons('medium', medium_options)
                 
                 # 검색 필터 추가
-                medium_search = st.text_input("중분류 검색", placeholder="검색어를 입력하세요")
-                if medium_search:
-                    filtered_mediums = [m for m in medium_options if medium_search.lower() in m.lower()]
-                else:
-                    filtered_mediums = medium_options
+                medium_search = st.text_input("중분류 검색", placeholder="검색어를 입력하세요", key="medium_search")
+                filtered_mediums = _search_options(medium_options, medium_search)
                 
                 # 중분류 목록을 여러 열로 배치
                 num_cols = 2  # 2열로 배치
                 cols = st.columns(num_cols)
                 
-                selected_medium = []
+                # 다른 필터 기준 건수를 표시하고 건수가 0인 선택지는 숨김 (선택 상태는 유지)
+                medium_counts = _facet_counts(facets, 'research_area_medium', filtered_mediums)
+                filtered_mediums, selected_medium = _split_empty_options('medium', filtered_mediums, medium_counts)
                 for i, medium in enumerate(filtered_mediums):
                     with cols[i % num_cols]:
-                        default_value = st.session_state.get(f"medium_{medium}", True)
-                        if st.checkbox(medium, value=default_value, key=f"medium_{medium}"):
+                        if _facet_checkbox('medium', medium, medium_counts):
                             selected_medium.append(medium)
                 
                 filter_config['selected_medium'] = selected_medium
-                
-                if selected_medium:
-                    tech_levels.append("중분류")
             else:
                 selected_medium = []
                 filter_config['selected_medium'] = selected_medium
@@ -179,45 +354,28 @@ def create_sidebar(df):
         # 소분류 - 중분류 선택에 따라 필터링
         if 'research_area_small' in df.columns:
             st.write("**소분류**")
-            filtered_small = df[
-                (df['research_area'].isin(selected_areas)) &
-                (df['research_area_medium'].isin(selected_medium))
-            ]['research_area_small'].dropna().unique()
-            small_options = sorted(filtered_small)
+            small_options = taxonomy_children(taxonomy, taxonomy_paths(taxonomy, [selected_areas, selected_medium]), include_null=True)
             
             if len(small_options) > 0:
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("전체선택", key="small_all", use_container_width=True):
-                        for small in small_options:
-                            st.session_state[f"small_{small}"] = True
-                with col2:
-                    if st.button("전체해제", key="small_none", use_container_width=True):
-                        for small in small_options:
-                            st.session_state[f"small_{small}"] = False
+                _select_all_buttons('small', small_options)
                 
                 # 검색 필터 추가
-                small_search = st.text_input("소분류 검색", placeholder="검색어를 입력하세요")
-                if small_search:
-                    filtered_smalls = [s for s in small_options if small_search.lower() in s.lower()]
-                else:
-                    filtered_smalls = small_options
+                small_search = st.text_input("소분류 검색", placeholder="검색어를 입력하세요", key="small_search")
+                filtered_smalls = _search_options(small_options, small_search)
                 
                 # 소분류 목록을 여러 열로 배치
                 num_cols = 2  # 2열로 배치
                 cols = st.columns(num_cols)
                 
-                selected_small = []
+                # 다른 필터 기준 건수를 표시하고 건수가 0인 선택지는 숨김 (선택 상태는 유지)
+                small_counts = _facet_counts(facets, 'research_area_small', filtered_smalls)
+                filtered_smalls, selected_small = _split_empty_options('small', filtered_smalls, small_counts)
                 for i, small in enumerate(filtered_smalls):
                     with cols[i % num_cols]:
-                        default_value = st.session_state.get(f"small_{small}", True)
-                        if st.checkbox(small, value=default_value, key=f"small_{small}"):
+                        if _facet_checkbox('small', small, small_counts):
                             selected_small.append(small)
                 
                 filter_config['selected_small'] = selected_small
-                
-                if selected_small:
-                    tech_levels.append("소분류")
             else:
                 selected_small = []
                 filter_config['selected_small'] = selected_small
@@ -226,41 +384,36 @@ def create_sidebar(df):
         else:
             selected_small = []
             filter_config['selected_small'] = selected_small
-        
-        filter_config['tech_levels'] = tech_levels
+            
+        filter_config['tech_levels'] = taxonomy_levels(taxonomy, [selected_areas, selected_medium, selected_small])
     
     # 수행주체 필터
     with st.sidebar.expander("🏢 수행주체", expanded=False):
-        institute_options = sorted(df['institute'].unique())
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.button("전체선택", key="institute_all", use_container_width=True):
-                for institute in institute_options:
-                    st.session_state[f"institute_{institute}"] = True
-        with col2:
-            if st.button("전체해제", key="institute_none", use_container_width=True):
-                for institute in institute_options:
-                    st.session_state[f"institute_{institute}"] = False
-        
-        # 검색 필터 추가
-        institute_search = st.text_input("수행주체 검색", placeholder="검색어를 입력하세요")
-        if institute_search:
-            filtered_institutes = [i for i in institute_options if institute_search.lower() in i.lower()]
+        # 값이 많으면 검색형 선택 모드
+        institute_index = search_indexes.get('institute')
+        institute_options = _dimension_options(filter_index, 'institute', institute_index)
+        if institute_options is None:
+            filter_config['selected_institutes'] = _render_value_picker('institute', institute_index, "수행주체 검색", facets.get('institute'))
         else:
-            filtered_institutes = institute_options
-        
-        # 수행주체 목록을 여러 열로 배치
-        num_cols = 2  # 2열로 배치
-        cols = st.columns(num_cols)
-        
-        selected_institutes = []
-        for i, institute in enumerate(filtered_institutes):
-            with cols[i % num_cols]:
-                default_value = st.session_state.get(f"institute_{institute}", True)
-                if st.checkbox(institute, value=default_value, key=f"institute_{institute}"):
-                    selected_institutes.append(institute)
-        
-        filter_config['selected_institutes'] = selected_institutes
+            
+            _select_all_buttons('institute', institute_options)
+            
+            # 검색 필터 추가
+            institute_search = st.text_input("수행주체 검색", placeholder="검색어를 입력하세요", key="institute_search")
+            filtered_institutes = _search_options(institute_options, institute_search)
+            
+            # 수행주체 목록을 여러 열로 배치
+            num_cols = 2  # 2열로 배치
+            cols = st.columns(num_cols)
+            
+            # 다른 필터 기준 건수를 표시하고 건수가 0인 선택지는 숨김 (선택 상태는 유지)
+            institute_counts = _facet_counts(facets, 'institute', filtered_institutes)
+            filtered_institutes, selected_institutes = _split_empty_options('institute', filtered_institutes, institute_counts)
+            for i, institute in enumerate(filtered_institutes):
+                with cols[i % num_cols]:
+                    if _facet_checkbox('institute', institute, institute_counts):
+                        selected_institutes.append(institute)
+            
+            filter_config['selected_institutes'] = selected_institutes
     
     return filter_config
\ No newline at end of file
@@ -1,5 +1,50 @@
 import pandas as pd
 import os
+import time
+import sys
+import glob
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from openpyxl import load_workbook
+from data_loader import (
+    process_investment_performance_data,
+    process_commercialization_data,
+    process_technology_fee_data,
+    clean_and_standardize_data
+)
+from data_store import (
+    STORE_DIR, store_exists, read_manifest, write_partitions, update_manifest, merge_dictionaries, file_sha256,
+    staging_dir, swap_store
+)
+from utils.data_processing import collect_dictionaries
+
+# 시트별 데이터 유형 매핑
+SHEET_MAPPING = {
+    'Sheet1': '투자성과',  # 또는 실제 시트명
+    'Sheet2': '사업화',
+    'Sheet3': '기술료'
+}
+
+# 데이터 유형별 처리 함수
+SHEET_PROCESSORS = {
+    '투자성과': process_investment_performance_data,
+    '사업화': process_commercialization_data,
+    '기술료': process_technology_fee_data
+}
+
+# 스트리밍 변환 시 한 번에 처리할 행 수
+CHUNK_ROWS = 50_000
+
+# 일괄 변환 시 파일별 소요시간 보고서 파일명 (저장소 폴더에 기록)
+REPORT_FILE = "_conversion_report.csv"
+REPORT_COLUMNS = ['file', 'sheet', 'data_name', 'rows_read', 'rows_written', 'seconds', 'rows_per_second', 'error']
+
+# pd.read_excel 기본값과 동일한 결측 문자열
+EXCEL_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
 
 def convert_excel_to_pkl(excel_file_path):
     """엑셀 파일을 PKL 파일들로 변환"""
@@ -13,13 +58,7 @@ def convert_excel_to_pkl(excel_file_path):
             os.makedirs('data')
         
         # 시트별로 PKL 파일 생성
-        sheet_mapping = {
-            'Sheet1': '투자성과',  # 또는 실제 시트명
-            'Sheet2': '사업화',
-            'Sheet3': '기술료'
-        }
-        
-        for sheet_name, pkl_name in sheet_mapping.items():
+        for sheet_name, pkl_name in SHEET_MAPPING.items():
             if sheet_name in excel_data:
                 df = excel_data[sheet_name]
                 pkl_path = f'data/{pkl_name}.pkl'
@@ -30,12 +69,347 @@ def convert_excel_to_pkl(excel_file_path):
         
         # 전체 시트 목록 출력
         print(f"\n발견된 시트: {list(excel_data.keys())}")
-        
+    
     except Exception as e:
         print(f"❌ 변환 실패: {e}")
 
+def _rows_to_frame(rows, columns):
+    """행 묶음을 데이터프레임으로 변환 (결측 문자열은 결측값으로 처리)"""
+    df = pd.DataFrame(rows, columns=columns)
+    for col in df.columns:
+        if not pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].mask(df[col].isin(EXCEL_NA_VALUES))
+    return df
+
+def iter_sheet_chunks(worksheet, chunk_rows=CHUNK_ROWS):
+    """읽기 전용 시트를 행 묶음 단위 데이터프레임으로 순회"""
+    rows = worksheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+    
+    batch = []
+    for row in rows:
+        # 완전히 비어있는 행은 건너뜀
+        if all(v is None for v in row):
+            continue
+        batch.append(row)
+        if len(batch) >= chunk_rows:
+            yield _rows_to_frame(batch, columns)
+            batch = []
+    
+    if batch:
+        yield _rows_to_frame(batch, columns)
+
+def source_key(excel_file_path, root=None):
+    """매니페스트의 원본 키 (변환 기준 폴더에 대한 상대 경로, 폴더를 옮겨도 같은 키)"""
+    root = root if root is not None else os.path.dirname(excel_file_path)
+    return os.path.relpath(excel_file_path, root or os.curdir).replace(os.sep, '/')
+
+def batch_root(path_or_pattern):
+    """일괄 변환 기준 폴더 (폴더는 그 자체, glob 패턴은 와일드카드 앞까지, 파일은 상위 폴더)"""
+    if os.path.isdir(path_or_pattern):
+        return path_or_pattern
+    
+    parts = os.path.normpath(path_or_pattern).split(os.sep)
+    for i, part in enumerate(parts):
+        if any(c in part for c in '*?['):
+            return os.sep.join(parts[:i]) or os.curdir
+    return os.path.dirname(path_or_pattern) or os.curdir
+
+def convert_sheet_to_store(excel_file_path, sheet_name, data_name, store_dir=STORE_DIR, chunk_rows=CHUNK_ROWS,
+                           workbook=None, source_tag=None, verbose=True, source=None):
+    """시트 하나를 행 묶음 단위로 처리하여 저장소 파일로 기록 (매니페스트는 갱신하지 않음)
+    
+    source는 매니페스트의 원본 키이며, 생략하면 파일명을 사용한다.
+    """
+    process = SHEET_PROCESSORS[data_name]
+    wb = workbook or load_workbook(excel_file_path, read_only=True, data_only=True)
+    source_tag = source_tag or os.path.splitext(os.path.basename(excel_file_path))[0]
+    source = source or source_key(excel_file_path)
+    
+    entries = []
+    columns = []
+    dictionaries = {}
+    rows_read = 0
+    rows_written = 0
+    start_time = time.perf_counter()
+    
+    try:
+        chunks = iter_sheet_chunks(wb[sheet_name], chunk_rows) if sheet_name in wb.sheetnames else []
+        for chunk_no, chunk in enumerate(chunks):
+            processed = clean_and_standardize_data(process(chunk))
+            chunk_entries = write_partitions(processed, store_dir, file_tag=f"{source_tag}-{data_name}-{chunk_no:05d}")
+            for entry in chunk_entries:
+                entry['source'] = source
+                entry['data_name'] = data_name
+            entries.extend(chunk_entries)
+            columns.extend(col for col in processed.columns if col not in columns)
+            dictionaries = collect_dictionaries(processed, dictionaries)
+            
+            rows_read += len(chunk)
+            rows_written += len(processed)
+            if verbose:
+                elapsed = time.perf_counter() - start_time
+                print(f"   {data_name}: {rows_read:,}행 처리 ({rows_read / elapsed:,.0f} rows/s)")
+    finally:
+        # 직접 연 워크북만 닫음
+        if workbook is None:
+            wb.close()
+    
+    return {
+        'source': excel_file_path,
+        'sheet': sheet_name,
+        'data_name': data_name,
+        'rows_read': rows_read,
+        'rows_written': rows_written,
+        'seconds': time.perf_counter() - start_time,
+        'entries': entries,
+        'columns': columns,
+        'dictionaries': dictionaries
+    }
+
+def _source_record(sha256, excel_file_path, results):
+    """매니페스트에 기록할 원본 파일 정보 (해시, 크기, 변환에 성공한 시트별 행 수)"""
+    failed = any(r.get('error') for r in results)
+    return {
+        # 실패한 시트가 있으면 해시를 남기지 않아 다음 증분 변환 때 다시 처리
+        'sha256': None if failed else sha256,
+        'bytes': os.path.getsize(excel_file_path),
+        'sheets': {
+            r['data_name']: {'rows_read': r['rows_read'], 'rows_written': r['rows_written']}
+            for r in results if not r.get('error')
+        }
+    }
+
+def _replaced_sheets(source, results):
+    """기존 파일을 교체할 (원본 키, 시트) 쌍 (모든 시트가 성공하면 시트가 기록되지 않은 이전 파일도 교체)"""
+    replaced = [(source, r['data_name']) for r in results if not r.get('error')]
+    if len(replaced) == len(results):
+        replaced.append((source, None))
+    return replaced
+
+def convert_excel_to_store(excel_file_path, store_dir=STORE_DIR, chunk_rows=CHUNK_ROWS):
+    """엑셀 파일을 시트별 스트리밍 방식으로 처리하여 연도/성과유형별 컬럼형 저장소로 변환
+    
+    임시 폴더에 전체를 기록한 뒤 성공했을 때만 저장소와 교체하므로, 변환에 실패해도 기존 저장소는 유지된다.
+    성공하면 매니페스트, 실패하면 None을 반환한다.
+    """
+    staging = staging_dir(store_dir)
+    try:
+        sha256 = file_sha256(excel_file_path)
+        source_tag = f"{os.path.splitext(os.path.basename(excel_file_path))[0]}-{sha256[:8]}"
+        wb = load_workbook(excel_file_path, read_only=True, data_only=True)
+        entries = []
+        columns = []
+        dictionaries = {}
+        results = []
+        try:
+            for sheet_name, data_name in SHEET_MAPPING.items():
+                result = convert_sheet_to_store(excel_file_path, sheet_name, data_name, staging, chunk_rows,
+                                                workbook=wb, source_tag=source_tag)
+                results.append(result)
+                if result['rows_read'] == 0:
+                    print(f"❌ {sheet_name} 시트를 찾을 수 없거나 데이터가 없습니다.")
+                    continue
+                
+                entries.extend(result['entries'])
+                columns.extend(col for col in result['columns'] if col not in columns)
+                dictionaries = merge_dictionaries(dictionaries, result['dictionaries'])
+                rate = result['rows_read'] / result['seconds'] if result['seconds'] > 0 else 0
+                print(f"✅ {sheet_name} ({data_name}) 레코드: {result['rows_written']:,}개, {result['seconds']:.1f}초 ({rate:,.0f} rows/s)")
+        finally:
+            wb.close()
+        
+        if not entries:
+            print("❌ 변환할 데이터가 없습니다.")
+            return None
+        
+        # 모든 시트 처리 후 매니페스트를 한 번에 기록하고 저장소 교체
+        source = source_key(excel_file_path)
+        sources = {source: _source_record(sha256, excel_file_path, results)}
+        manifest = update_manifest(entries, columns, staging, sources=sources, dictionaries=dictionaries,
+                                   replaced=_replaced_sheets(source, results))
+        swap_store(staging, store_dir)
+        total_rows = sum(f['rows'] for f in manifest['files'])
+        print(f"✅ 저장소 생성: {store_dir} (레코드: {total_rows:,}개, 파일: {len(manifest['files'])}개)")
+        return manifest
+    
+    except Exception as e:
+        print(f"❌ 변환 실패 (기존 저장소 유지): {e}")
+        return None
+    
+    finally:
+        if os.path.exists(staging):
+            shutil.rmtree(staging)
+
+def find_excel_files(path_or_pattern):
+    """디렉터리 또는 glob 패턴에서 변환할 엑셀 파일 목록 수집"""
+    if os.path.isdir(path_or_pattern):
+        path_or_pattern = os.path.join(path_or_pattern, '*.xlsx')
+    
+    # 엑셀 임시 잠금 파일(~$)은 제외
+    return sorted(f for f in glob.glob(path_or_pattern) if not os.path.basename(f).startswith('~$'))
+
+def _convert_sheet_task(excel_file_path, sheet_name, data_name, store_dir, chunk_rows, source_tag, source):
+    """프로세스 풀 작업 단위: 시트 하나 변환 (실패 시 오류 내용 반환)"""
+    try:
+        return convert_sheet_to_store(excel_file_path, sheet_name, data_name, store_dir, chunk_rows,
+                                      source_tag=source_tag, verbose=False, source=source)
+    except Exception as e:
+        return {
+            'source': excel_file_path, 'sheet': sheet_name, 'data_name': data_name,
+            'rows_read': 0, 'rows_written': 0, 'seconds': 0.0,
+            'entries': [], 'columns': [], 'dictionaries': {}, 'error': str(e)
+        }
+
+def convert_excel_batch(path_or_pattern, store_dir=STORE_DIR, workers=None, chunk_rows=CHUNK_ROWS, incremental=False):
+    """여러 엑셀 파일의 시트들을 프로세스 풀에서 병렬 변환하여 하나의 저장소로 통합
+    
+    incremental=True이면 매니페스트의 원본 해시와 비교하여 새로 추가되었거나 내용이 바뀐 파일만
+    처리하고, 바뀐 파일에서 만들어졌던 기존 파티션 파일은 새 파일로 교체한다.
+    원본은 기준 폴더(batch_root)에 대한 상대 경로로 기록하므로 폴더를 옮겨도 다시 변환하지 않으며,
+    기준 폴더에서 사라진 원본의 기록과 파티션 파일은 삭제한다.
+    전체 변환은 임시 폴더에 기록한 뒤 성공했을 때만 저장소와 교체한다.
+    시트별 소요시간 보고서를 반환하며(변경된 파일이 없으면 빈 보고서), 변환할 데이터가 없으면 None을 반환한다.
+    """
+    excel_files = find_excel_files(path_or_pattern)
+    if not excel_files:
+        print(f"❌ 변환할 엑셀 파일이 없습니다: {path_or_pattern}")
+        return None
+    
+    start_time = time.perf_counter()
+    root = batch_root(path_or_pattern)
+    keys = {excel_path: source_key(excel_path, root) for excel_path in excel_files}
+    hashes = {excel_path: file_sha256(excel_path) for excel_path in excel_files}
+    removed_sources = []
+    
+    if incremental and store_exists(store_dir):
+        known_sources = read_manifest(store_dir).get('sources', {})
+        target_files = [
+            excel_path for excel_path in excel_files
+            if known_sources.get(keys[excel_path], {}).get('sha256') != hashes[excel_path]
+        ]
+        # 이전 버전의 절대 경로 키도 현재 키와 다르므로 사라진 원본으로 보고 정리
+        removed_sources = sorted(set(known_sources) - set(keys.values()))
+        print(f"증분 변환: 전체 {len(excel_files)}개 중 신규/변경 {len(target_files)}개, 변경 없음 {len(excel_files) - len(target_files)}개, 삭제 {len(removed_sources)}개")
+        if not target_files and not removed_sources:
+            print("✅ 변경된 파일이 없습니다.")
+            return pd.DataFrame(columns=REPORT_COLUMNS)
+        target_dir = store_dir
+    else:
+        target_dir = staging_dir(store_dir)
+        target_files = excel_files
+    
+    try:
+        return _convert_files(target_files, keys, hashes, target_dir, workers, chunk_rows, removed_sources, start_time,
+                              store_dir)
+    finally:
+        if target_dir != store_dir and os.path.exists(target_dir):
+            shutil.rmtree(target_dir)
+
+def _convert_files(target_files, keys, hashes, target_dir, workers, chunk_rows, removed_sources, start_time, store_dir):
+    """대상 파일의 시트들을 병렬 변환하여 target_dir 저장소에 반영 (임시 폴더이면 마지막에 store_dir와 교체)"""
+    # 파일 태그에 내용 해시를 넣어 이전 변환 결과와 파일명이 겹치지 않게 함
+    tasks = [
+        (excel_path, sheet_name, data_name, target_dir, chunk_rows,
+         f"{os.path.splitext(os.path.basename(excel_path))[0]}-{hashes[excel_path][:8]}", keys[excel_path])
+        for excel_path in target_files
+        for sheet_name, data_name in SHEET_MAPPING.items()
+    ]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    print(f"파일 {len(target_files)}개, 시트 작업 {len(tasks)}개를 {workers}개 프로세스로 변환합니다.")
+    
+    results = [None] * len(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_convert_sheet_task, *task): task_no for task_no, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            
+            name = f"{os.path.basename(result['source'])} / {result['sheet']} ({result['data_name']})"
+            if result.get('error'):
+                print(f"❌ {name}: {result['error']}")
+            elif result['rows_read'] == 0:
+                print(f"❌ {name}: 시트를 찾을 수 없거나 데이터가 없습니다.")
+            else:
+                print(f"✅ {name}: {result['rows_written']:,}개, {result['seconds']:.1f}초")
+    
+    # 작업 순서대로 매니페스트에 기록 (실행 순서와 무관하게 동일한 결과)
+    entries = []
+    columns = []
+    dictionaries = {}
+    for result in results:
+        entries.extend(result['entries'])
+        columns.extend(col for col in result['columns'] if col not in columns)
+        dictionaries = merge_dictionaries(dictionaries, result['dictionaries'])
+    
+    if not entries and not removed_sources:
+        print("❌ 변환할 데이터가 없습니다.")
+        return None
+    
+    # 처리한 원본 파일별 해시/행 수 기록 (변환에 성공한 시트의 기존 파일만 교체)
+    file_results = {excel_path: [r for r in results if r['source'] == excel_path] for excel_path in target_files}
+    sources = {
+        keys[excel_path]: _source_record(hashes[excel_path], excel_path, file_results[excel_path])
+        for excel_path in target_files
+    }
+    replaced = [
+        pair
+        for excel_path in target_files
+        for pair in _replaced_sheets(keys[excel_path], file_results[excel_path])
+    ]
+    manifest = update_manifest(entries, columns, target_dir, sources=sources, dictionaries=dictionaries,
+                               replaced=replaced, removed_sources=removed_sources)
+    wall_seconds = time.perf_counter() - start_time
+    
+    # 시트별/파일별 소요시간 보고서
+    report = pd.DataFrame([
+        {
+            'file': r['source'],
+            'sheet': r['sheet'],
+            'data_name': r['data_name'],
+            'rows_read': r['rows_read'],
+            'rows_written': r['rows_written'],
+            'seconds': round(r['seconds'], 2),
+            'rows_per_second': round(r['rows_read'] / r['seconds']) if r['seconds'] > 0 else 0,
+            'error': r.get('error', '')
+        }
+        for r in results
+    ], columns=REPORT_COLUMNS)
+    report.to_csv(os.path.join(target_dir, REPORT_FILE), index=False, encoding='utf-8-sig')
+    if target_dir != store_dir:
+        swap_store(target_dir, store_dir)
+    
+    file_report = report.groupby('file', sort=False)[['rows_read', 'rows_written', 'seconds']].sum()
+    print("\n파일별 소요시간")
+    print("-" * 40)
+    for excel_path, rows_read, rows_written, seconds in file_report.itertuples():
+        print(f"{os.path.basename(excel_path)}: {rows_written:,}개, {seconds:.1f}초")
+    
+    total_rows = sum(f['rows'] for f in manifest['files'])
+    task_seconds = report['seconds'].sum()
+    print(f"\n✅ 저장소 생성: {store_dir} (레코드: {total_rows:,}개, 파일: {len(manifest['files'])}개)")
+    print(f"총 소요시간 {wall_seconds:.1f}초 (작업 합계 {task_seconds:.1f}초, 병렬 효율 {task_seconds / wall_seconds:.1f}배)")
+    return report
+
 def main():
-    print("엑셀 파일을 PKL로 변환")
+    parser = argparse.ArgumentParser(description="엑셀 파일을 컬럼형 저장소로 변환")
+    parser.add_argument('input', nargs='?', help="엑셀 파일, 폴더 또는 glob 패턴 (생략 시 대화형 입력)")
+    parser.add_argument('--store', default=STORE_DIR, help="저장소 폴더")
+    parser.add_argument('--workers', type=int, default=None, help="프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="한 번에 처리할 행 수")
+    parser.add_argument('--incremental', action='store_true', help="신규/변경된 파일만 처리하여 기존 저장소에 반영")
+    args = parser.parse_args()
+    
+    # 일괄 변환 모드 (변환할 데이터가 없거나 실패하면 0이 아닌 종료 코드)
+    if args.input:
+        if convert_excel_batch(args.input, args.store, args.workers, args.chunk_rows, args.incremental) is None:
+            sys.exit(1)
+        return
+    
+    print("엑셀 파일을 컬럼형 저장소로 변환")
     print("=" * 40)
     
     # 엑셀 파일 경로 입력
@@ -43,10 +417,11 @@ def main():
     
     if not os.path.exists(excel_path):
         print("❌ 파일이 존재하지 않습니다.")
-        return
+        sys.exit(1)
     
-    convert_excel_to_pkl(excel_path)
+    if convert_excel_to_store(excel_path, args.store, args.chunk_rows) is None:
+        sys.exit(1)
     print("\n변환 완료!")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -2,6 +2,10 @@ import pandas as pd
 import streamlit as st
 import os
 import glob
+import re
+import numpy as np
+from data_store import STORE_DIR, read_store
+from utils.data_processing import NULL_SENTINELS
 
 def find_pkl_files():
     data_folder = "data"
@@ -19,101 +23,304 @@ def load_pkl_from_data_folder(filename):
         st.error(f"파일 로드 실패 ({filename}): {e}")
         return None
 
+def load_store_from_data_folder(columns=None, years=None, performance_types=None):
+    """컬럼형 저장소에서 필요한 컬럼/파티션만 로드"""
+    try:
+        return read_store(STORE_DIR, columns=columns, years=years, performance_types=performance_types)
+    except Exception as e:
+        st.error(f"저장소 로드 실패 ({STORE_DIR}): {e}")
+        return None
+
+# 시트별 원본→표준 컬럼 매핑 규격
+# - ('원본컬럼', 기본값): 원본 컬럼이 없으면 기본값으로 채움 (기본값 None이면 필수 컬럼)
+# - (None, 값): 상수 컬럼
+# - {'투자': (...), '성과': (...)}: 투자 행과 논문/특허 행에서 서로 다른 원본 사용
+INVESTMENT_COLUMN_SPEC = {
+    'year': ('과제수행년도', None),
+    'ministry': ('사업_부처명', ''),
+    'research_area': ('대분류', '기타'),
+    'research_area_medium': ('중분류', ''),
+    'research_area_small': ('소분류', ''),
+    'project_type': ('연구개발단계', '기타'),
+    'institute': ('연구수행주체', '기타'),
+    'budget_billion': {'투자': ('정부연구비(억원)', 0), '성과': (None, 0)},
+    'project_count': (None, 1),
+    'performance_type': ('유형', None),
+    'performance_value': {'투자': ('정부연구비(억원)', 0), '성과': ('기여율(%)', 0)},
+    'performance_year': {'투자': ('과제수행년도', None), '성과': ('성과발생년도', None)},
+    'project_id': ('과제고유번호', ''),
+    'project_name': ('과제명', '')
+}
+
+COMMERCIALIZATION_COLUMN_SPEC = {
+    'year': ('과제수행년도', None),
+    'ministry': ('성과발생부처', ''),
+    'research_area': ('분류명', '기타'),
+    'research_area_medium': (None, ''),
+    'research_area_small': (None, ''),
+    'project_type': ('연구개발단계', '기타'),
+    'institute': ('연구수행주체', '기타'),
+    'budget_billion': (None, 0),
+    'project_count': (None, 1),
+    'performance_type': (None, '사업화'),
+    'performance_value': ('당해년도매출액(백만원)', 0),
+    'performance_year': ('성과발생년도', None),
+    'project_id': ('과제고유번호', ''),
+    'project_name': ('과제명-국문', ''),
+    'company_name': ('업체명', ''),
+    'employment': ('고용창출인원수(명)', 0)
+}
+
+TECHNOLOGY_FEE_COLUMN_SPEC = {
+    'year': ('과제수행년도', None),
+    'ministry': ('성과발생부처', ''),
+    'research_area': ('분류명', '기타'),
+    'research_area_medium': (None, ''),
+    'research_area_small': (None, ''),
+    'project_type': ('연구개발단계', '기타'),
+    'institute': ('연구수행주체', '기타'),
+    'budget_billion': (None, 0),
+    'project_count': (None, 1),
+    'performance_type': (None, '기술료'),
+    'performance_value': ('당해연도 기술료(백만원)', 0),
+    'performance_year': ('성과발생년도', None),
+    'project_id': ('과제고유번호', ''),
+    'project_name': ('과제명-국문', ''),
+    'contract_name': ('기술실시계약명', '')
+}
+
+def _resolve_column(df, source, default, numeric):
+    """매핑 규격 한 항목을 컬럼 단위로 변환"""
+    if source is None or (source not in df.columns and default is not None):
+        values = pd.Series(default, index=df.index)
+    else:
+        values = df[source]
+    
+    if numeric:
+        values = pd.to_numeric(values, errors='coerce').astype(float)
+    return values
+
+def map_columns(df, column_spec, numeric_columns=(), branch_mask=None):
+    """매핑 규격에 따라 원본 시트를 표준 컬럼 데이터프레임으로 일괄 변환"""
+    mapped = {}
+    
+    for target, rule in column_spec.items():
+        numeric = target in numeric_columns
+        
+        if isinstance(rule, dict):
+            # 투자 행은 '투자' 규격, 나머지 행은 '성과' 규격 적용
+            invest_values = _resolve_column(df, *rule['투자'], numeric)
+            if branch_mask.all():
+                mapped[target] = invest_values
+            else:
+                other_values = _resolve_column(df, *rule['성과'], numeric)
+                mapped[target] = invest_values.where(branch_mask, other_values)
+        else:
+            mapped[target] = _resolve_column(df, *rule, numeric)
+    
+    return pd.DataFrame(mapped).reset_index(drop=True)
+
 def process_investment_performance_data(df):
     """투자성과 데이터 처리"""
-    processed_data = []
+    df = df[df['유형'].isin(['투자', '논문', '특허'])]
+    is_investment = (df['유형'] == '투자').to_numpy()
     
-    for _, row in df.iterrows():
-        record_type = row['유형']
-        
-        if record_type == '투자':
-            processed_data.append({
-                'year': row['과제수행년도'],
-                'ministry': row.get('사업_부처명', ''),
-                'research_area': row.get('대분류', '기타'),
-                'research_area_medium': row.get('중분류', ''),
-                'research_area_small': row.get('소분류', ''),
-                'project_type': row.get('연구개발단계', '기타'),
-                'institute': row.get('연구수행주체', '기타'),
-                'budget_billion': float(row.get('정부연구비(억원)', 0)),
-                'project_count': 1,
-                'performance_type': '투자',
-                'performance_value': float(row.get('정부연구비(억원)', 0)),
-                'performance_year': row['과제수행년도'],
-                'project_id': row.get('과제고유번호', ''),
-                'project_name': row.get('과제명', '')
-            })
-        
-        elif record_type in ['논문', '특허']:
-            processed_data.append({
-                'year': row['과제수행년도'],
-                'ministry': row.get('사업_부처명', ''),
-                'research_area': row.get('대분류', '기타'),
-                'research_area_medium': row.get('중분류', ''),
-                'research_area_small': row.get('소분류', ''),
-                'project_type': row.get('연구개발단계', '기타'),
-                'institute': row.get('연구수행주체', '기타'),
-                'budget_billion': 0,
-                'project_count': 1,
-                'performance_type': record_type,
-                'performance_value': float(row.get('기여율(%)', 0)),
-                'performance_year': row['성과발생년도'],
-                'project_id': row.get('과제고유번호', ''),
-                'project_name': row.get('과제명', '')
-            })
-    
-    return pd.DataFrame(processed_data)
+    return map_columns(
+        df,
+        INVESTMENT_COLUMN_SPEC,
+        numeric_columns=('budget_billion', 'performance_value'),
+        branch_mask=is_investment
+    )
 
 def process_commercialization_data(df):
     """사업화 데이터 처리"""
-    processed_data = []
-    
-    for _, row in df.iterrows():
-        processed_data.append({
-            'year': row['과제수행년도'],
-            'ministry': row.get('성과발생부처', ''),
-            'research_area': row.get('분류명', '기타'),
-            'research_area_medium': '',
-            'research_area_small': '',
-            'project_type': row.get('연구개발단계', '기타'),
-            'institute': row.get('연구수행주체', '기타'),
-            'budget_billion': 0,
-            'project_count': 1,
-            'performance_type': '사업화',
-            'performance_value': float(row.get('당해년도매출액(백만원)', 0)),
-            'performance_year': row['성과발생년도'],
-            'project_id': row.get('과제고유번호', ''),
-            'project_name': row.get('과제명-국문', ''),
-            'company_name': row.get('업체명', ''),
-            'employment': row.get('고용창출인원수(명)', 0)
-        })
-    
-    return pd.DataFrame(processed_data)
+    return map_columns(df, COMMERCIALIZATION_COLUMN_SPEC, numeric_columns=('performance_value',))
 
 def process_technology_fee_data(df):
     """기술료 데이터 처리"""
-    processed_data = []
-    
-    for _, row in df.iterrows():
-        processed_data.append({
-            'year': row['과제수행년도'],
-            'ministry': row.get('성과발생부처', ''),
-            'research_area': row.get('분류명', '기타'),
-            'research_area_medium': '',
-            'research_area_small': '',
-            'project_type': row.get('연구개발단계', '기타'),
-            'institute': row.get('연구수행주체', '기타'),
-            'budget_billion': 0,
-            'project_count': 1,
-            'performance_type': '기술료',
-            'performance_value': float(row.get('당해연도 기술료(백만원)', 0)),
-            'performance_year': row['성과발생년도'],
-            'project_id': row.get('과제고유번호', ''),
-            'project_name': row.get('과제명-국문', ''),
-            'contract_name': row.get('기술실시계약명', '')
-        })
-    
-    return pd.DataFrame(processed_data)
+    return map_columns(df, TECHNOLOGY_FEE_COLUMN_SPEC, numeric_columns=('performance_value',))
+
+# 기관명 접두사 → 지역 (긴 접두사 우선, 예: '충청북도' → 충북)
+REGION_PREFIXES = {
+    '서울': '서울', '부산': '부산', '대구': '대구', '인천': '인천', '광주': '광주',
+    '대전': '대전', '울산': '울산', '세종': '세종', '경기': '경기', '강원': '강원',
+    '충북': '충북', '충남': '충남', '전북': '전북', '전남': '전남', '경북': '경북',
+    '경남': '경남', '제주': '제주',
+    '충청북도': '충북', '충청남도': '충남', '전라북도': '전북', '전라남도': '전남',
+    '경상북도': '경북', '경상남도': '경남'
+}
+
+# 기관명만으로 지역을 알 수 없는 주요 기관의 소재지 (접두사 추정보다 우선)
+INSTITUTE_REGIONS = {
+    '한국과학기술원': '대전',
+    '한국과학기술연구원': '서울',
+    '한국전자통신연구원': '대전',
+    '한국화학연구원': '대전',
+    '한국기계연구원': '대전',
+    '포항공과대학교': '경북'
+}
+
+# 기관→지역 추가 조회표 (institute, region 컬럼 CSV, 있으면 INSTITUTE_REGIONS에 덧붙임)
+INSTITUTE_REGIONS_PATH = os.path.join("data", "institute_regions.csv")
+
+# 접두사/조회표에 없는 기관의 지역
+UNKNOWN_REGION = '기타'
+
+# 지역 판정 근거: 조회표 일치(확정) / 기관명 접두사(추정) / 판정 불가(미상)
+REGION_CONFIDENCE = ['미상', '추정', '확정']
+
+def _unique_codes(series):
+    """(행별 고유값 코드, 고유값) - 범주형은 범주 코드를 그대로 사용, 결측은 -1"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), series.cat.categories
+    return pd.factorize(series)
+
+def build_prefix_trie(prefixes):
+    """접두사 → 값 사전으로 글자 단위 트라이 생성 (노드의 None 키에 값 저장)"""
+    trie = {}
+    for prefix, value in prefixes.items():
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node[None] = value
+    return trie
+
+def match_prefix(trie, text):
+    """text 앞부분과 일치하는 가장 긴 접두사의 값 (없으면 None)"""
+    node, matched = trie, None
+    for char in text:
+        node = node.get(char)
+        if node is None:
+            break
+        matched = node.get(None, matched)
+    return matched
+
+def load_institute_regions(path=INSTITUTE_REGIONS_PATH):
+    """기본 기관→지역 조회표에 CSV 조회표를 합친 사전"""
+    lookup = dict(INSTITUTE_REGIONS)
+    if os.path.exists(path):
+        try:
+            table = pd.read_csv(path, dtype=str).dropna(subset=['institute', 'region'])
+            lookup.update(zip(table['institute'].str.strip(), table['region'].str.strip()))
+        except Exception as e:
+            st.warning(f"기관 지역 조회표 로드 실패 ({path}): {e}")
+    return lookup
+
+def resolve_regions(institutes, lookup=None, prefixes=REGION_PREFIXES):
+    """기관명 Series → (지역, 판정 근거) 범주형 Series
+    
+    고유 기관명마다 한 번만 조회표 → 접두사 트라이 순으로 판정한 뒤 코드로 전체 행에 펼친다.
+    기관명이 결측이면 지역도 결측이다.
+    """
+    lookup = load_institute_regions() if lookup is None else lookup
+    trie = build_prefix_trie(prefixes)
+    regions = sorted(set(prefixes.values()) | set(lookup.values()) | {UNKNOWN_REGION})
+    region_codes = {region: code for code, region in enumerate(regions)}
+    
+    codes, uniques = _unique_codes(institutes)
+    
+    # 고유 기관명 단위 판정 (마지막 칸은 결측 기관명 코드 -1용)
+    region_lut = np.full(len(uniques) + 1, -1, dtype=np.int16)
+    confidence_lut = np.full(len(uniques) + 1, -1, dtype=np.int8)
+    for i, name in enumerate(uniques):
+        if not isinstance(name, str) or name in NULL_SENTINELS:
+            continue
+        name = name.strip()
+        if name in lookup:
+            region, confidence = lookup[name], '확정'
+        else:
+            region = match_prefix(trie, name)
+            region, confidence = (region, '추정') if region is not None else (UNKNOWN_REGION, '미상')
+        region_lut[i] = region_codes[region]
+        confidence_lut[i] = REGION_CONFIDENCE.index(confidence)
+    
+    index, name = institutes.index, institutes.name
+    return (
+        pd.Series(pd.Categorical.from_codes(region_lut[codes], categories=regions), index=index, name='region'),
+        pd.Series(pd.Categorical.from_codes(confidence_lut[codes], categories=REGION_CONFIDENCE), index=index, name='region_confidence')
+    )
+
+def add_region_columns(df, lookup=None):
+    """기관명으로 판정한 지역(region)과 판정 근거(region_confidence) 컬럼 추가
+    
+    region 컬럼이 이미 있거나(원본 지역 정보, 수집 시 판정 완료) 기관 컬럼이 없으면 그대로 반환한다.
+    """
+    if df is None or 'institute' not in df.columns or 'region' in df.columns:
+        return df
+    
+    region, confidence = resolve_regions(df['institute'], lookup)
+    return df.assign(region=region, region_confidence=confidence)
+
+# 분류체계 태그 규칙: 태그 컬럼 → (검사할 분류 컬럼, [(태그, 키워드 목록), ...])
+# - 태그가 True 하나뿐이면 bool 컬럼(키워드 포함 여부), 아니면 앞선 태그가 우선인 범주형 컬럼 (없으면 결측)
+# - 키워드는 대소문자 구분 없이 분류값 어디에든 포함되면 일치
+# - 규칙을 추가해도 수집/로드 시 고유 분류값 단위로 한 번만 계산되어 조회 비용이 늘지 않음
+TAXONOMY_TAG_RULES = {
+    'climate_category': (['research_area'], [('감축', ['감축']), ('적응', ['적응'])]),
+    'climate_related': (['research_area'], [(True, ['기후', '환경', '에너지'])])
+}
+
+def build_keyword_matcher(tags):
+    """여러 태그의 키워드를 한 번에 찾는 정규식과 키워드 → 태그 번호 사전
+    
+    모든 위치에서 전방 탐색하므로 서로 겹치는 키워드도 빠짐없이 찾는다.
+    """
+    keyword_tags = {}
+    for position, (_, keywords) in enumerate(tags):
+        for keyword in keywords:
+            keyword_tags.setdefault(keyword.lower(), set()).add(position)
+    
+    alternatives = '|'.join(re.escape(keyword) for keyword in sorted(keyword_tags, key=len, reverse=True))
+    return re.compile(f"(?=({alternatives}))", re.IGNORECASE), keyword_tags
+
+def tag_masks(values, matcher):
+    """분류값 Series → 행별 일치 태그 비트마스크 (고유값 단위로 검사한 뒤 코드로 펼침)"""
+    pattern, keyword_tags = matcher
+    codes, uniques = _unique_codes(values)
+    
+    # 마지막 칸은 결측 분류값 코드 -1용 (태그 없음)
+    lut = np.zeros(len(uniques) + 1, dtype=np.int64)
+    for i, value in enumerate(uniques):
+        if not isinstance(value, str) or value in NULL_SENTINELS:
+            continue
+        for match in pattern.finditer(value):
+            for position in keyword_tags[match.group(1).lower()]:
+                lut[i] |= 1 << position
+    return lut[codes]
+
+def add_taxonomy_tags(df, rules=None):
+    """분류체계 태그 규칙별 태그 컬럼 추가 (이미 있는 태그 컬럼, 분류 컬럼이 없는 규칙은 건너뜀)"""
+    if df is None:
+        return df
+    
+    tagged = {}
+    for column, (sources, tags) in (TAXONOMY_TAG_RULES if rules is None else rules).items():
+        if column in df.columns or not all(source in df.columns for source in sources):
+            continue
+        
+        matcher = build_keyword_matcher(tags)
+        masks = np.zeros(len(df), dtype=np.int64)
+        for source in sources:
+            masks |= tag_masks(df[source], matcher)
+        
+        if [label for label, _ in tags] == [True]:
+            tagged[column] = pd.Series(masks > 0, index=df.index)
+        else:
+            # 뒤 태그부터 덮어써서 앞선 태그가 우선, 일치 없음은 -1 (결측)
+            codes = np.full(len(df), -1, dtype=np.int32)
+            for position in reversed(range(len(tags))):
+                codes[(masks >> position) & 1 == 1] = position
+            labels = [label for label, _ in tags]
+            tagged[column] = pd.Series(
+                pd.Categorical.from_codes(codes, categories=labels),
+                index=df.index
+            )
+    
+    return df.assign(**tagged) if tagged else df
+
+def enrich_data(df):
+    """수집/로드 시 한 번만 계산하는 파생 차원 (지역, 분류체계 태그) 추가"""
+    return add_taxonomy_tags(add_region_columns(df))
 
 def clean_and_standardize_data(df):
     """데이터 정리 및 표준화"""
@@ -125,7 +332,8 @@ def clean_and_standardize_data(df):
     df = df[df['year'] <= 2025]
     df = df[df['performance_value'] >= 0]
     
-    return df
+    # 지역/분류체계 태그 차원은 수집 시 한 번만 판정하여 저장
+    return enrich_data(df)
 
 def combine_all_data(investment_df, commercialization_df, tech_fee_df):
     """모든 데이터 통합"""
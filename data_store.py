@@ -0,0 +1,275 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import os
+import json
+import shutil
+import hashlib
+from utils.data_processing import DIMENSION_COLUMNS, collect_dictionaries
+
+# 컬럼형 저장소 기본 설정
+STORE_DIR = os.path.join("data", "performance_store")
+MANIFEST_FILE = "_manifest.json"
+PARTITION_COLUMNS = ['year', 'performance_type']
+MAX_ROWS_PER_FILE = 500_000
+STORE_VERSION = 1
+
+# 값이 숫자로만 되어 있어도 항상 문자열로 기록하는 컬럼 (청크/시트/파일 간 parquet 스키마 일치)
+TEXT_COLUMNS = DIMENSION_COLUMNS + ['project_id', 'project_name', 'company_name', 'contract_name']
+TEXT_TYPE = pa.large_string()
+
+def store_exists(store_dir=STORE_DIR):
+    """저장소(매니페스트) 존재 여부 확인"""
+    return os.path.exists(os.path.join(store_dir, MANIFEST_FILE))
+
+def read_manifest(store_dir=STORE_DIR):
+    """매니페스트 로드 (없으면 빈 매니페스트)"""
+    manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {'version': STORE_VERSION, 'partition_columns': PARTITION_COLUMNS, 'columns': [], 'files': [], 'sources': {}, 'dictionaries': {}}
+    
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def write_manifest(manifest, store_dir=STORE_DIR):
+    """매니페스트 저장 (임시 파일 작성 후 교체)"""
+    os.makedirs(store_dir, exist_ok=True)
+    manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+    tmp_path = manifest_path + '.tmp'
+    
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+def store_version(store_dir=STORE_DIR):
+    """저장소 변경 여부 판단용 버전 (매니페스트 수정 시각, 없으면 None)"""
+    manifest_path = os.path.join(store_dir, MANIFEST_FILE)
+    return os.path.getmtime(manifest_path) if os.path.exists(manifest_path) else None
+
+def file_sha256(path, block_size=1024 * 1024):
+    """원본 파일 내용 해시 계산"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _partition_dir(year, performance_type):
+    return os.path.join(f"year={year}", f"performance_type={performance_type}")
+
+def _text_values(series):
+    """값을 문자열로 변환 (결측값 유지, 정수 값만 있는 실수 컬럼은 '123.0'이 되지 않게 정수로 변환)"""
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype('Int64')
+    return series.astype(object).where(series.isna(), series.astype(str))
+
+def _normalize_text_columns(df):
+    """TEXT_COLUMNS와 혼합 타입 object 컬럼을 문자열로 통일 (청크/파일 간 스키마 일치)"""
+    text_columns = {
+        col: _text_values(df[col])
+        for col in df.columns
+        if col in TEXT_COLUMNS or df[col].dtype == object
+    }
+    return df.assign(**text_columns) if text_columns else df
+
+def _arrow_table(df):
+    """parquet 기록용 arrow 테이블 (문자열 컬럼은 청크 내용과 관계없이 항상 TEXT_TYPE)"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = pa.schema(
+        [
+            pa.field(field.name, TEXT_TYPE) if (
+                field.name in TEXT_COLUMNS or pa.types.is_string(field.type) or pa.types.is_large_string(field.type)
+            ) else field
+            for field in table.schema
+        ],
+        metadata=table.schema.metadata
+    )
+    return table.cast(schema)
+
+def write_partitions(df, store_dir=STORE_DIR, file_tag='part'):
+    """데이터를 연도/성과유형 파티션별 parquet 파일로 기록하고 파일 목록 반환 (매니페스트는 갱신하지 않음)"""
+    entries = []
+    if df is None or len(df) == 0:
+        return entries
+    
+    df = _normalize_text_columns(df)
+    
+    for (year, performance_type), part_df in df.groupby(PARTITION_COLUMNS, sort=True):
+        rel_dir = _partition_dir(int(year), performance_type)
+        os.makedirs(os.path.join(store_dir, rel_dir), exist_ok=True)
+        
+        # 파티션이 크면 여러 파일로 분할
+        for chunk_no, start in enumerate(range(0, len(part_df), MAX_ROWS_PER_FILE)):
+            chunk = part_df.iloc[start:start + MAX_ROWS_PER_FILE]
+            rel_path = os.path.join(rel_dir, f"{file_tag}-{chunk_no:04d}.parquet")
+            table = _arrow_table(chunk)
+            pq.write_table(table, os.path.join(store_dir, rel_path), compression='zstd')
+            
+            entries.append({
+                'path': rel_path,
+                'year': int(year),
+                'performance_type': performance_type,
+                'rows': len(chunk),
+                'bytes': os.path.getsize(os.path.join(store_dir, rel_path))
+            })
+    
+    return entries
+
+def merge_dictionaries(base, new):
+    """차원 컬럼 사전 병합 (기존 코드는 유지하고 새 값만 뒤에 추가)"""
+    merged = {col: list(values) for col, values in (base or {}).items()}
+    for col, values in (new or {}).items():
+        known = set(merged.setdefault(col, []))
+        for value in values:
+            if value not in known:
+                merged[col].append(value)
+                known.add(value)
+    return merged
+
+def _is_replaced(entry, replaced, removed_sources=()):
+    """파일이 이번에 다시 변환한 (원본, 시트)나 삭제된 원본에서 나온 것인지 (시트가 기록되지 않은 이전 파일은 (원본, None)으로 판단)"""
+    return entry.get('source') in removed_sources or (entry.get('source'), entry.get('data_name')) in replaced
+
+def _remove_empty_dirs(store_dir):
+    """파일이 모두 삭제된 파티션 폴더 정리"""
+    for path, dirs, files in os.walk(store_dir, topdown=False):
+        if path != store_dir and not dirs and not files:
+            os.rmdir(path)
+
+def update_manifest(entries, columns, store_dir=STORE_DIR, sources=None, dictionaries=None, replaced=None,
+                    removed_sources=None):
+    """새로 기록한 파일 목록을 매니페스트에 추가
+    
+    replaced는 이번에 변환에 성공한 (원본 키, 시트 data_name) 쌍 목록이며, 해당 쌍의 기존 파일만 교체한다.
+    변환에 실패한 시트의 기존 파일과 시트 기록은 그대로 남긴다.
+    removed_sources는 더 이상 존재하지 않는 원본 키 목록이며, 원본 기록과 파일을 모두 삭제한다.
+    """
+    manifest = read_manifest(store_dir)
+    
+    # 다시 변환한 (원본, 시트)와 삭제된 원본에서 만들어졌던 이전 파일은 매니페스트에서 제외
+    replaced = set(replaced or ())
+    removed_sources = set(removed_sources or ())
+    stale_files = [f for f in manifest['files'] if _is_replaced(f, replaced, removed_sources)]
+    manifest['files'] = [f for f in manifest['files'] if not _is_replaced(f, replaced, removed_sources)]
+    
+    # 원본 기록은 교체하되 이번에 기록하지 않은(실패한) 시트의 행 수는 유지
+    known_sources = manifest.setdefault('sources', {})
+    for source in removed_sources:
+        known_sources.pop(source, None)
+    for source, record in (sources or {}).items():
+        sheets = {**known_sources.get(source, {}).get('sheets', {}), **record.get('sheets', {})}
+        known_sources[source] = {**record, 'sheets': sheets}
+    
+    manifest['files'].extend(entries)
+    
+    # 컬럼 목록은 순서를 유지하며 합집합
+    for col in columns:
+        if col not in manifest['columns']:
+            manifest['columns'].append(col)
+    
+    # 차원 사전은 추가만 허용하여 코드가 저장소 갱신 후에도 유지되도록 함
+    manifest['dictionaries'] = merge_dictionaries(manifest.get('dictionaries'), dictionaries)
+    
+    write_manifest(manifest, store_dir)
+    
+    # 매니페스트 교체 후 이전 파일 삭제 (중간에 실패해도 매니페스트는 일관성 유지)
+    new_paths = {e['path'] for e in entries}
+    for f in stale_files:
+        if f['path'] in new_paths:
+            continue
+        stale_path = os.path.join(store_dir, f['path'])
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+    if stale_files:
+        _remove_empty_dirs(store_dir)
+    
+    return manifest
+
+def reset_store(store_dir=STORE_DIR):
+    """기존 저장소 삭제 후 빈 디렉터리 생성"""
+    if os.path.exists(store_dir):
+        shutil.rmtree(store_dir)
+    os.makedirs(store_dir)
+
+def staging_dir(store_dir=STORE_DIR):
+    """전체 변환 결과를 먼저 기록할 임시 저장소 폴더 (저장소와 같은 상위 폴더에 생성하여 rename 가능)"""
+    staging = f"{os.path.normpath(store_dir)}.tmp-{os.getpid()}"
+    reset_store(staging)
+    return staging
+
+def swap_store(staging, store_dir=STORE_DIR):
+    """임시 저장소를 저장소 위치로 교체 (기존 저장소는 rename으로 옮긴 뒤 삭제)"""
+    backup = f"{os.path.normpath(store_dir)}.old-{os.getpid()}"
+    if os.path.exists(store_dir):
+        os.replace(store_dir, backup)
+    try:
+        os.replace(staging, store_dir)
+    except OSError:
+        # 교체에 실패하면 기존 저장소를 되돌림
+        if os.path.exists(backup):
+            os.replace(backup, store_dir)
+        raise
+    if os.path.exists(backup):
+        shutil.rmtree(backup)
+
+def write_store(df, store_dir=STORE_DIR):
+    """데이터프레임 전체로 저장소를 새로 생성"""
+    reset_store(store_dir)
+    
+    entries = write_partitions(df, store_dir)
+    return update_manifest(entries, list(df.columns), store_dir, dictionaries=collect_dictionaries(df))
+
+def select_files(manifest, years=None, performance_types=None):
+    """매니페스트에서 조건에 맞는 파일만 선택 (파티션 프루닝)"""
+    files = manifest['files']
+    if years is not None:
+        years = {int(y) for y in years}
+        files = [f for f in files if f['year'] in years]
+    if performance_types is not None:
+        performance_types = set(performance_types)
+        files = [f for f in files if f['performance_type'] in performance_types]
+    return files
+
+def _conform_text_columns(table):
+    """TEXT_COLUMNS가 다른 타입(이전에 숫자로 기록된 파일 등)이면 TEXT_TYPE으로 변환 (파일 간 병합 가능하도록)"""
+    for i, field in enumerate(table.schema):
+        if field.name in TEXT_COLUMNS and field.type != TEXT_TYPE:
+            table = table.set_column(i, pa.field(field.name, TEXT_TYPE), table.column(i).cast(TEXT_TYPE))
+    return table
+
+def _read_file(path, columns=None):
+    """파일 하나 읽기 (columns 중 이 파일에 없는 컬럼은 건너뜀, 시트마다 컬럼 구성이 다름)"""
+    if columns is not None:
+        names = set(pq.read_schema(path).names)
+        columns = [col for col in columns if col in names]
+    return _conform_text_columns(pq.read_table(path, columns=columns))
+
+def read_store(store_dir=STORE_DIR, columns=None, years=None, performance_types=None):
+    """저장소에서 필요한 컬럼/파티션만 읽어 데이터프레임으로 반환 (일부 파일에 없는 컬럼은 결측값)"""
+    manifest = read_manifest(store_dir)
+    files = select_files(manifest, years, performance_types)
+    
+    if columns is not None:
+        columns = [col for col in columns if col in manifest['columns']]
+    
+    if not files:
+        return pd.DataFrame(columns=columns if columns is not None else manifest['columns'])
+    
+    tables = [_read_file(os.path.join(store_dir, f['path']), columns) for f in files]
+    df = pa.concat_tables(tables, promote_options='permissive').to_pandas()
+    return df if columns is None else df.reindex(columns=columns)
+
+def migrate_pickle_to_store(pkl_path, store_dir=STORE_DIR):
+    """기존 통합 PKL 파일을 컬럼형 저장소로 변환"""
+    df = pd.read_pickle(pkl_path)
+    manifest = write_store(df, store_dir)
+    total_bytes = sum(f['bytes'] for f in manifest['files'])
+    print(f"✅ {pkl_path} → {store_dir} (레코드: {len(df):,}개, 파일: {len(manifest['files'])}개, {total_bytes / 1024 / 1024:,.1f}MB)")
+    return manifest
+
+if __name__ == "__main__":
+    pkl_path = os.path.join("data", "performance_output.pkl")
+    if os.path.exists(pkl_path):
+        migrate_pickle_to_store(pkl_path)
+    else:
+        print(f"❌ 파일을 찾을 수 없습니다: {pkl_path}")
@@ -31,26 +31,64 @@ if not hasattr(pd.Series, 'iteritems'):
 # 로컬 모듈 import
 from config import setup_page_config, setup_font
 from data_generator import generate_sample_data
-from components.sidebar import create_sidebar
+from data_loader import load_store_from_data_folder, enrich_data
+from data_store import store_exists, store_version, read_manifest
+from components.sidebar import create_sidebar, sidebar_filter_config
 from components.climate_analysis import render_climate_analysis
-from components.institution_analysis import render_institution_analysis
-from components.ministry_analysis import render_ministry_analysis
-from components.performance_analysis import render_performance_analysis
-from components.landscape_analysis import render_landscape_analysis
+from components.institution_analysis import render_institution_analysis, AGGREGATES as INSTITUTION_AGGREGATES
+from components.ministry_analysis import render_ministry_analysis, AGGREGATES as MINISTRY_AGGREGATES
+from components.performance_analysis import render_performance_analysis, AGGREGATES as PERFORMANCE_AGGREGATES
+from components.landscape_analysis import render_landscape_analysis, AGGREGATES as LANDSCAPE_AGGREGATES
 from components.region_analysis import render_region_analysis  # 지역 분석 모듈 추가
-from components.data_table import render_data_table
-from utils.data_filters import filter_dataframe
+from components.data_table import render_data_table, AGGREGATES as DATA_TABLE_AGGREGATES
+from utils.data_filters import (
+    filter_dataframe, build_filter_index, create_selection_cache, selection_cache_stats,
+    cached_facets, filter_cache_key, index_options
+)
+from utils.data_processing import apply_schema, build_taxonomy_tree
+from utils.search_index import build_search_index
+from utils.aggregation import ROW_COUNT, cached_cube, cube_stats, group_sum
+from utils.chart_helpers import get_figure_cache
+
+# 분석 탭들이 공유하는 집계 목록 (필터 상태별로 한 번 계산)
+TAB_AGGREGATES = (
+    INSTITUTION_AGGREGATES + MINISTRY_AGGREGATES + PERFORMANCE_AGGREGATES + LANDSCAPE_AGGREGATES + DATA_TABLE_AGGREGATES
+)
+
+# 분석 보기 (제목, 보기가 사용하는 집계 목록) - 기본은 선택한 보기 하나만 계산/렌더링
+ANALYSIS_VIEWS = [
+    ("🌍 총괄 분석", []),
+    ("🏢 연구수행주체별 분석", INSTITUTION_AGGREGATES),
+    ("🔍 부처별 분석", MINISTRY_AGGREGATES),
+    ("🗺️ 지역별 분석", []),
+    ("📈 성과 분석", PERFORMANCE_AGGREGATES),
+    ("🌐 분포현황 분석", LANDSCAPE_AGGREGATES),
+    ("📋 데이터 테이블", DATA_TABLE_AGGREGATES)
+]
 
 # 직접 성과 데이터 로드 함수
-@st.cache_data
-def load_performance_data():
-    """성과 데이터 직접 로드"""
+@st.cache_resource(max_entries=1)
+def load_performance_data(data_version=None):
+    """성과 데이터 직접 로드 (컬럼형 저장소 우선, 없으면 PKL)
+    
+    data_version은 캐시 키 용도로, 저장소가 증분 갱신되면 값이 바뀌어 다시 로드된다.
+    반환 프레임은 모든 세션이 복사 없이 공유하므로 읽기 전용으로 다룬다
+    (컬럼 추가/수정이 필요하면 assign 등으로 새 프레임을 만든다). 최신 버전 하나만 보관한다.
+    사이드바 선택지·필터 인덱스·건수가 전체 연도 기준이고 데이터 테이블은 모든 컬럼을 보여주므로
+    연도/컬럼을 나누지 않고 한 번에 읽는다.
+    """
+    # 차원 컬럼은 저장소의 전역 사전 기반 범주형으로 변환 (결측 문자열 정리 포함)
+    # 지역/태그 컬럼 없이 만들어진 저장소/PKL은 로드 시 고유값 단위로 판정
+    if store_exists():
+        df = load_store_from_data_folder()
+        return enrich_data(apply_schema(df, read_manifest().get('dictionaries')))
+    
     data_path = os.path.join("data", "performance_output.pkl")
     
     if os.path.exists(data_path):
         try:
             df = pd.read_pickle(data_path)
-            return df
+            return enrich_data(apply_schema(df))
         except Exception as e:
             st.error(f"데이터 로드 실패: {e}")
             return None
@@ -58,6 +96,26 @@ def load_performance_data():
         st.warning(f"파일을 찾을 수 없습니다: {data_path}")
         return None
 
+@st.cache_resource(max_entries=1)
+def load_filter_index(_df, data_version=None, rows=None):
+    """필터용 비트맵 인덱스 (데이터 버전별로 한 번만 생성)"""
+    return build_filter_index(_df)
+
+@st.cache_resource(max_entries=1)
+def load_taxonomy_tree(_df, data_version=None, rows=None):
+    """연구분야 대→중→소분류 트리 (데이터 버전별로 한 번만 생성)"""
+    return build_taxonomy_tree(_df)
+
+@st.cache_resource(max_entries=1)
+def load_search_indexes(_df, data_version=None, rows=None):
+    """부처/수행주체 값 검색 인덱스 (데이터 버전별로 한 번만 생성)"""
+    return {col: build_search_index(_df[col]) for col in ['ministry', 'institute'] if col in _df.columns}
+
+@st.cache_resource
+def get_selection_cache():
+    """필터 결과 LRU 캐시 (세션 간 공유, 키에 데이터 버전 포함)"""
+    return create_selection_cache()
+
 def render_performance_overview(filtered_df):
     """성과 개요 분석 - 성과 유형별 분리 버전"""
     st.subheader("🎯 R&D 성과 개요")
@@ -100,7 +158,7 @@ def render_performance_overview(filtered_df):
         
         with col1:
             # 연도별 금액 성과 추이
-            yearly_monetary = monetary_df.groupby(['performance_year', 'performance_type'])['performance_value'].sum().reset_index()
+            yearly_monetary = group_sum(monetary_df, ['performance_year', 'performance_type'], ['performance_value']).reset_index()
             
             fig1 = px.line(
                 yearly_monetary, 
@@ -144,7 +202,7 @@ def render_performance_overview(filtered_df):
         
         with col2:
             # 부처별 금액 성과 현황
-            ministry_monetary = monetary_df.groupby(['ministry', 'performance_type'])['performance_value'].sum().reset_index()
+            ministry_monetary = group_sum(monetary_df, ['ministry', 'performance_type'], ['performance_value']).reset_index()
             
             fig2 = px.bar(
                 ministry_monetary, 
@@ -194,7 +252,7 @@ def render_performance_overview(filtered_df):
         
         with col3:
             # 연도별 건수 성과 추이
-            yearly_count = count_df.groupby(['performance_year', 'performance_type']).size().reset_index(name='count')
+            yearly_count = group_sum(count_df, ['performance_year', 'performance_type'], [], size=True).reset_index().rename(columns={ROW_COUNT: 'count'})
             
             fig3 = px.line(
                 yearly_count, 
@@ -241,7 +299,7 @@ def render_performance_overview(filtered_df):
         
         with col4:
             # 부처별 건수 성과 현황
-            ministry_count = count_df.groupby(['ministry', 'performance_type']).size().reset_index(name='count')
+            ministry_count = group_sum(count_df, ['ministry', 'performance_type'], [], size=True).reset_index().rename(columns={ROW_COUNT: 'count'})
             
             fig4 = px.bar(
                 ministry_count, 
@@ -291,7 +349,7 @@ def render_performance_overview(filtered_df):
     with col5:
         # 연구수행주체별 성과 비교 - 스택 바 차트
         if not monetary_df.empty:
-            institute_monetary = monetary_df.groupby(['institute', 'performance_type'])['performance_value'].sum().reset_index()
+            institute_monetary = group_sum(monetary_df, ['institute', 'performance_type'], ['performance_value']).reset_index()
             
             fig5 = px.bar(
                 institute_monetary, 
@@ -335,47 +393,73 @@ def render_performance_overview(filtered_df):
             st.plotly_chart(fig5, use_container_width=True)
 
     with col6:
-        # 연구분야별 성과 분포 - 파이 차트
+        # 연구분야별 성과 분포 - 파이 차트 (유형 선택 시 이 패널만 다시 실행)
         if 'performance_type' in filtered_df.columns:
-            performance_types = filtered_df['performance_type'].unique()
-            if len(performance_types) > 0:
-                selected_type = st.selectbox(
-                    "성과유형 선택", 
-                    options=performance_types,
-                    format_func=lambda x: f"{x} 유형 성과 분포"
-                )
-                
-                type_data = filtered_df[filtered_df['performance_type'] == selected_type]
-                area_performance = type_data.groupby('research_area')['performance_value'].sum().reset_index()
-                
-                fig6 = px.pie(
-                    area_performance, 
-                    values='performance_value', 
-                    names='research_area',
-                    title=f"{selected_type} 유형의 연구분야별 분포",
-                    hole=0.4,
-                    labels={
-                        'research_area': '연구분야', 
-                        'performance_value': '성과값' if selected_type in monetary_types else '건수'
-                    }
-                )
-                
-                # 텍스트 포맷 개선
-                fig6.update_traces(
-                    textinfo='label+percent+value',
-                    texttemplate='<b>%{label}</b><br>%{percent}<br><b>%{value:.1f}</b>',
-                    textfont=dict(size=14, color='#333333')  # 텍스트 크기 증가
-                )
-                
-                fig6.update_layout(
-                    height=500, 
-                    margin=dict(t=80, b=50, l=50, r=50),
-                    title_x=0.5,
-                    title_y=0.95,
-                    **graph_config  # 공통 스타일 적용
-                )
-                st.plotly_chart(fig6, use_container_width=True)
-                                
+            render_performance_type_pie(filtered_df, monetary_types, graph_config)
+
+@st.fragment
+def render_performance_type_pie(filtered_df, monetary_types, graph_config):
+    """성과유형별 연구분야 분포 파이 차트 (프래그먼트: 선택 변경 시 필터링된 데이터를 재사용하여 이 패널만 갱신)"""
+    performance_types = filtered_df['performance_type'].unique()
+    if len(performance_types) > 0:
+        selected_type = st.selectbox(
+            "성과유형 선택", 
+            options=performance_types,
+            format_func=lambda x: f"{x} 유형 성과 분포"
+        )
+        
+        type_data = filtered_df[filtered_df['performance_type'] == selected_type]
+        area_performance = group_sum(type_data, ['research_area'], ['performance_value']).reset_index()
+        
+        fig6 = px.pie(
+            area_performance, 
+            values='performance_value', 
+            names='research_area',
+            title=f"{selected_type} 유형의 연구분야별 분포",
+            hole=0.4,
+            labels={
+                'research_area': '연구분야', 
+                'performance_value': '성과값' if selected_type in monetary_types else '건수'
+            }
+        )
+        
+        # 텍스트 포맷 개선
+        fig6.update_traces(
+            textinfo='label+percent+value',
+            texttemplate='<b>%{label}</b><br>%{percent}<br><b>%{value:.1f}</b>',
+            textfont=dict(size=14, color='#333333')  # 텍스트 크기 증가
+        )
+        
+        fig6.update_layout(
+            height=500, 
+            margin=dict(t=80, b=50, l=50, r=50),
+            title_x=0.5,
+            title_y=0.95,
+            **graph_config  # 공통 스타일 적용
+        )
+        st.plotly_chart(fig6, use_container_width=True)
+
+def render_analysis_view(title, filtered_df, filter_config, cube, cache=None, filter_key=None):
+    """분석 보기 하나 렌더링 (cube: 공유 집계 큐브, 집계를 쓰지 않는 보기는 None, cache/filter_key: 필터 상태별 결과 캐시)"""
+    if title == "🌍 총괄 분석":
+        render_climate_analysis(filtered_df, filter_config)
+    elif title == "🏢 연구수행주체별 분석":
+        render_institution_analysis(filtered_df, filter_config, cube)
+    elif title == "🔍 부처별 분석":
+        render_ministry_analysis(filtered_df, filter_config, cube)
+    elif title == "🗺️ 지역별 분석":
+        render_region_analysis(filtered_df, filter_config)  # 지역 분석 렌더링
+    elif title == "📈 성과 분석":
+        # 실제 데이터의 경우 성과 개요 먼저 표시
+        if 'performance_type' in filtered_df.columns:
+            render_performance_overview(filtered_df)
+            st.markdown("---")
+        render_performance_analysis(filtered_df, filter_config, cube)
+    elif title == "🌐 분포현황 분석":
+        render_landscape_analysis(filtered_df, filter_config, cube, cache, filter_key)
+    elif title == "📋 데이터 테이블":
+        render_data_table(filtered_df, cube, cache, filter_key)
+
 def main():
     setup_page_config()
     setup_font()
@@ -385,65 +469,99 @@ def main():
     
     # 데이터 로드
     with st.spinner("데이터를 로드 중..."):
-        df = load_performance_data()
+        data_version = store_version()
+        df = load_performance_data(data_version=data_version)
     
     if df is None:
         st.error("성과 데이터를 로드할 수 없습니다. 샘플 데이터를 사용합니다.")
-        df = generate_sample_data()
+        df = enrich_data(apply_schema(generate_sample_data()))
+    
+    filter_index = load_filter_index(df, data_version, len(df))
+    selection_cache = get_selection_cache()
+    taxonomy = load_taxonomy_tree(df, data_version, len(df))
+    search_indexes = load_search_indexes(df, data_version, len(df))
+    performance_types = index_options(filter_index, 'performance_type', include_null=False) if 'performance_type' in df.columns else None
+    
+    # 선택지별 건수는 위젯 상태로 미리 구한 이번 실행의 필터 상태 기준으로 계산 (각 차원은 자기 필터 제외)
+    facet_config = sidebar_filter_config(df, taxonomy, search_indexes, filter_index)
+    if performance_types is not None:
+        facet_config['selected_performance_types'] = st.session_state.get('selected_performance_types', performance_types)
+    facets = cached_facets(filter_index, facet_config, selection_cache, data_version)
     
     # 사이드바 생성 및 필터 값 받기
-    filter_config = create_sidebar(df)
+    filter_config = create_sidebar(
+        df,
+        taxonomy=taxonomy,
+        search_indexes=search_indexes,
+        facets=facets,
+        filter_index=filter_index
+    )
     
     # 성과 유형 필터 추가
-    if 'performance_type' in df.columns:
-        performance_types = sorted(df['performance_type'].unique())
+    if performance_types is not None:
         selected_performance_types = st.sidebar.multiselect(
             "성과 유형 선택",
             options=performance_types,
-            default=performance_types
+            default=performance_types,
+            key='selected_performance_types'
         )
         filter_config['selected_performance_types'] = selected_performance_types
     
-    # 데이터 필터링
-    filtered_df = filter_dataframe(df, filter_config)
+    # 데이터 필터링 (성과 유형 포함)
+    filtered_df = filter_dataframe(df, filter_config, filter_index, cache=selection_cache, data_version=data_version)
     
-    # 성과 유형 필터링
-    if 'performance_type' in filtered_df.columns and 'selected_performance_types' in filter_config:
-        filtered_df = filtered_df[filtered_df['performance_type'].isin(filter_config['selected_performance_types'])]
+    # 필터 캐시 상태
+    performance_info = st.sidebar.expander("⚙️ 성능 정보", expanded=False)
+    with performance_info:
+        cache_stats = selection_cache_stats(selection_cache)
+        st.caption(
+            f"필터 캐시: 적중 {cache_stats['hits']:,}회 / 미적중 {cache_stats['misses']:,}회 "
+            f"(적중률 {cache_stats['hit_rate']:.0%}), {cache_stats['entries']}개 결과, "
+            f"{cache_stats['bytes'] / 1024 / 1024:,.1f}MB"
+        )
     
     if len(filtered_df) == 0:
         st.warning("선택한 필터 조건에 해당하는 데이터가 없습니다.")
         return
     
-    # 탭 구성으로 변경
-    tab_titles = ["🌍 총괄 분석", "🏢 연구수행주체별 분석", "🔍 부처별 분석", "🗺️ 지역별 분석", "📈 성과 분석", "🌐 분포현황 분석", "📋 데이터 테이블"]
-    tabs = st.tabs(tab_titles)
-    
-    # 각 탭에 해당하는 분석 내용 렌더링
-    with tabs[0]:
-        render_climate_analysis(filtered_df, filter_config)
-    
-    with tabs[1]:
-        render_institution_analysis(filtered_df, filter_config)
-    
-    with tabs[2]:
-        render_ministry_analysis(filtered_df, filter_config)
-    
-    with tabs[3]:
-        render_region_analysis(filtered_df, filter_config)  # 지역 분석 렌더링
+    filter_key = filter_cache_key(filter_config, data_version, len(df))
+    view_titles = [title for title, _ in ANALYSIS_VIEWS]
     
-    with tabs[4]:
-        # 실제 데이터의 경우 성과 개요 먼저 표시
-        if 'performance_type' in filtered_df.columns:
-            render_performance_overview(filtered_df)
-            st.markdown("---")
-        render_performance_analysis(filtered_df, filter_config)
+    with performance_info:
+        render_all_views = st.checkbox(
+            "모든 탭 한 번에 렌더링",
+            value=False,
+            key='render_all_views',
+            help="끄면 선택한 분석 보기만 계산하여 필터 변경 시 응답이 빠릅니다."
+        )
     
-    with tabs[5]:
-        render_landscape_analysis(filtered_df, filter_config)
+    if render_all_views:
+        # 탭 공유 집계 큐브 (필터 상태 해시별로 캐시)
+        cube = cached_cube(filtered_df, TAB_AGGREGATES, selection_cache, filter_key)
+        tabs = st.tabs(view_titles)
+        for tab, title in zip(tabs, view_titles):
+            with tab:
+                render_analysis_view(title, filtered_df, filter_config, cube, selection_cache, filter_key)
+    else:
+        # 선택한 보기만 렌더링 (집계 큐브도 그 보기의 집계만 계산, 필터 상태 해시별로 캐시)
+        active_view = st.radio("분석 보기", view_titles, horizontal=True, key='active_view', label_visibility='collapsed')
+        aggregates = dict(ANALYSIS_VIEWS)[active_view]
+        cube = cached_cube(filtered_df, aggregates, selection_cache, filter_key) if aggregates else None
+        render_analysis_view(active_view, filtered_df, filter_config, cube, selection_cache, filter_key)
     
-    with tabs[6]:
-        render_data_table(filtered_df)
+    # 집계 큐브/그림 캐시 사용 현황 (탭 렌더링 후 집계)
+    with performance_info:
+        if cube is not None:
+            aggregate_stats = cube_stats(cube)
+            st.caption(
+                f"집계 큐브: 조회 {aggregate_stats['served']:,}회 / 원본 스캔 {aggregate_stats['scans']}회 "
+                f"(집계 {aggregate_stats['requested']}종, 스캔 {aggregate_stats['saved']:,}회 절약)"
+            )
+        figure_stats = selection_cache_stats(get_figure_cache())
+        st.caption(
+            f"그림 캐시: 적중 {figure_stats['hits']:,}회 / 미적중 {figure_stats['misses']:,}회, "
+            f"{figure_stats['entries']}개 그림, {figure_stats['bytes'] / 1024 / 1024:,.1f}MB"
+        )
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
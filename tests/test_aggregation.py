@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal, assert_series_equal
+from utils.aggregation import ROW_COUNT, group_sum, build_cube, cube_frame, cube_series
+
+def make_frame(rows=2000, seed=0):
+    """문자열/범주형/실수/정수 키와 결측 키, float32/float64/정수 측정값이 섞인 데이터"""
+    rng = np.random.default_rng(seed)
+    ministries = np.array(['과기부', '산업부', '환경부', None], dtype=object)
+    areas = ['환경', '에너지', '대기', '수자원']
+    df = pd.DataFrame({
+        'year': rng.integers(2018, 2024, rows).astype(np.int16),
+        'ministry': ministries[rng.integers(0, 4, rows)],
+        'research_area': pd.Categorical(np.array(areas, dtype=object)[rng.integers(0, 4, rows)], categories=areas + ['미사용']),
+        'ratio': rng.choice([0.5, 1.5, np.nan], rows),
+        'budget_billion': rng.random(rows) * 100,
+        'performance_value': (rng.random(rows) * 10).astype(np.float32),
+        'project_count': rng.integers(0, 5, rows).astype(np.int32)
+    })
+    df.loc[rng.random(rows) < 0.05, 'research_area'] = np.nan
+    df.loc[rng.random(rows) < 0.05, 'budget_billion'] = np.nan
+    return df
+
+def expected_sum(df, dims, measures, size=False, dropna=True):
+    grouped = df.groupby(dims, observed=True, dropna=dropna)
+    result = grouped[measures].sum()
+    for measure in measures:
+        if result[measure].dtype.kind in 'iu':
+            result[measure] = result[measure].astype(np.int64)
+    if size:
+        result[ROW_COUNT] = grouped.size().astype(np.int64)
+    return result
+
+DIMS = [
+    ['year'],
+    ['ministry'],
+    ['research_area'],
+    ['ratio'],
+    ['ministry', 'research_area'],
+    ['year', 'ministry', 'ratio'],
+]
+
+@pytest.mark.parametrize('dims', DIMS, ids=lambda dims: '-'.join(dims))
+@pytest.mark.parametrize('dropna', [True, False])
+def test_group_sum_matches_groupby(dims, dropna):
+    df = make_frame()
+    measures = ['budget_billion', 'performance_value', 'project_count']
+    result = group_sum(df, dims, measures, size=True, dropna=dropna)
+    expected = expected_sum(df, dims, measures, size=True, dropna=dropna)
+    assert_frame_equal(result, expected, check_exact=False, rtol=1e-5)
+
+def test_group_sum_keeps_float32_measure_dtype():
+    df = make_frame()
+    result = group_sum(df, ['ministry'], ['performance_value'])
+    assert result['performance_value'].dtype == np.float32
+
+def test_group_sum_empty_frame():
+    df = make_frame().iloc[:0]
+    result = group_sum(df, ['ministry', 'year'], ['budget_billion'], size=True)
+    expected = expected_sum(df, ['ministry', 'year'], ['budget_billion'], size=True)
+    assert len(result) == 0
+    assert list(result.columns) == list(expected.columns)
+    assert list(result.index.names) == list(expected.index.names)
+
+SPECS = [
+    (['year'], 'budget_billion'),
+    (['year'], ROW_COUNT),
+    (['ministry', 'year'], 'project_count'),
+    (['research_area'], 'budget_billion', ['ministry']),
+    (['research_area', 'year'], 'performance_value'),
+]
+
+def test_cube_matches_groupby():
+    df = make_frame()
+    cube = build_cube(df, SPECS)
+    
+    for spec in SPECS:
+        dims, measure = spec[0], spec[1]
+        notnull = spec[2] if len(spec) > 2 else []
+        source = df.dropna(subset=notnull) if notnull else df
+        grouped = source.groupby(dims, observed=True)
+        expected = grouped.size() if measure == ROW_COUNT else grouped[measure].sum()
+        if expected.dtype.kind in 'iu':
+            expected = expected.astype(np.int64)
+        expected.name = measure
+        
+        result = cube_series(cube, dims, measure, notnull)
+        assert_series_equal(result, expected, check_exact=False, rtol=1e-5)
+    
+    # 차원 키가 같은 요청은 원본을 한 번만 집계
+    assert cube['scans'] < cube['requested']
+
+def test_cube_frame_matches_groupby_reset_index():
+    df = make_frame()
+    cube = build_cube(df, [(['ministry', 'year'], 'budget_billion'), (['ministry', 'year'], 'project_count')])
+    result = cube_frame(cube, ['ministry', 'year'], ['budget_billion', 'project_count'])
+    expected = df.groupby(['ministry', 'year'], observed=True)[['budget_billion', 'project_count']].sum().reset_index()
+    expected['project_count'] = expected['project_count'].astype(np.int64)
+    assert_frame_equal(result, expected, check_exact=False, rtol=1e-5)
+
+def test_cube_on_empty_frame():
+    df = make_frame().iloc[:0]
+    cube = build_cube(df, SPECS)
+    assert all(len(cube_series(cube, spec[0], spec[1], spec[2] if len(spec) > 2 else ())) == 0 for spec in SPECS)
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from utils.data_processing import NULL_OPTION
+from utils.data_filters import build_filter_index, select_rows, compute_facets, filter_dataframe, index_options
+
+DIMENSIONS = {
+    'selected_ministries': 'ministry',
+    'selected_areas': 'research_area',
+    'selected_medium': 'research_area_medium',
+    'selected_small': 'research_area_small',
+    'selected_institutes': 'institute'
+}
+
+def make_frame(rows=3000, seed=0):
+    """차원마다 결측값이 섞인 범주형 데이터 (로드 후 apply_schema 결과와 같은 형식)"""
+    rng = np.random.default_rng(seed)
+    values = {
+        'ministry': ['과기부', '산업부', '환경부', '국토부'],
+        'research_area': ['환경', '에너지', '대기'],
+        'research_area_medium': ['대기오염', '수질', '태양광', '풍력'],
+        'research_area_small': [f"소분류{i}" for i in range(8)],
+        'institute': [f"기관{i}" for i in range(12)]
+    }
+    df = pd.DataFrame({
+        'year': rng.integers(2018, 2024, rows),
+        'performance_type': rng.choice(['논문', '특허', '사업화'], rows),
+        'budget_billion': rng.random(rows)
+    })
+    for col, labels in values.items():
+        column = np.array(labels, dtype=object)[rng.integers(0, len(labels), rows)]
+        column[rng.random(rows) < 0.1] = None
+        df[col] = pd.Categorical(column, categories=labels)
+    return df
+
+def legacy_filter(df, filter_config):
+    """비트맵 인덱스 이전의 불리언 마스크 필터 (결측값은 'nan' 선택지 하나로 표시되던 방식)"""
+    labeled = df.copy()
+    for col in DIMENSIONS.values():
+        labeled[col] = labeled[col].astype(object).where(labeled[col].notna(), NULL_OPTION)
+    
+    mask = pd.Series(True, index=df.index)
+    if filter_config.get('selected_years'):
+        mask &= labeled[filter_config.get('year_column', 'year')].isin(filter_config['selected_years'])
+    for key, col in DIMENSIONS.items():
+        if filter_config.get(key):
+            mask &= labeled[col].isin(filter_config[key])
+    if 'selected_performance_types' in filter_config:
+        mask &= labeled['performance_type'].isin(filter_config['selected_performance_types'])
+    return np.flatnonzero(mask.to_numpy())
+
+def random_config(df, rng):
+    """값/NULL_OPTION을 무작위로 고른 필터 설정 (전체 선택, 빈 선택 포함)"""
+    def pick(options):
+        mode = rng.integers(0, 4)
+        if mode == 0:
+            return list(options)
+        if mode == 1:
+            return []
+        return [option for option in options if rng.random() < 0.6]
+    
+    config = {
+        'selected_years': pick(range(2018, 2024)),
+        'year_column': 'year'
+    }
+    for key, col in DIMENSIONS.items():
+        config[key] = pick(list(df[col].cat.categories) + [NULL_OPTION])
+    if rng.random() < 0.7:
+        config['selected_performance_types'] = pick(['논문', '특허', '사업화'])
+    return config
+
+@pytest.mark.parametrize('seed', range(3))
+def test_select_rows_matches_legacy_filter(seed):
+    df = make_frame(seed=seed)
+    index = build_filter_index(df)
+    rng = np.random.default_rng(100 + seed)
+    
+    for _ in range(300):
+        config = random_config(df, rng)
+        np.testing.assert_array_equal(select_rows(index, config), legacy_filter(df, config), err_msg=str(config))
+
+def test_null_rows_follow_null_option():
+    df = make_frame()
+    ministries = list(df['ministry'].cat.categories)
+    
+    kept = filter_dataframe(df, {'selected_ministries': ministries + [NULL_OPTION]})
+    dropped = filter_dataframe(df, {'selected_ministries': ministries})
+    only_null = filter_dataframe(df, {'selected_ministries': [NULL_OPTION]})
+    
+    assert len(kept) == len(df)
+    assert dropped['ministry'].notna().all() and len(dropped) == df['ministry'].notna().sum()
+    assert only_null['ministry'].isna().all() and len(only_null) == df['ministry'].isna().sum()
+
+def test_facets_count_other_filters_and_nulls():
+    df = make_frame()
+    index = build_filter_index(df)
+    config = {'selected_ministries': ['과기부', NULL_OPTION], 'selected_areas': ['환경']}
+    facets = compute_facets(index, config)
+    
+    # 부처 건수는 부처 자신의 필터를 뺀 나머지 필터 기준
+    others = df[df['research_area'] == '환경']
+    expected = others['ministry'].value_counts()
+    for label, rows in zip(facets['ministry']['values'], facets['ministry']['rows']):
+        assert rows == expected.get(label, 0)
+    assert facets['ministry']['null_rows'] == others['ministry'].isna().sum()
+
+def test_index_options_match_column_scan():
+    df = make_frame()
+    # 전역 사전에만 있고 데이터에는 없는 값은 선택지에서 제외
+    df['ministry'] = df['ministry'].cat.add_categories(['미사용부처'])
+    index = build_filter_index(df)
+    
+    for col in DIMENSIONS.values():
+        expected = sorted(df[col].dropna().unique()) + [NULL_OPTION]
+        assert index_options(index, col) == expected
+    assert index_options(index, 'year', include_null=False) == sorted(df['year'].unique())
+    assert index_options(index, 'performance_type') == sorted(df['performance_type'].unique())
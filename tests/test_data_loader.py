@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+from pandas.testing import assert_frame_equal
+import data_loader
+from benchmarks import legacy_data_loader
+from benchmarks.bench_ingest import make_raw_sheets
+from convert_excel import SHEET_MAPPING, SHEET_PROCESSORS, iter_sheet_chunks
+
+PROCESSORS = ['process_investment_performance_data', 'process_commercialization_data', 'process_technology_fee_data']
+
+@pytest.fixture(scope='module')
+def workbook_path(tmp_path_factory):
+    """결측 셀과 제외 대상 유형('기타')이 섞인 작은 세 시트짜리 통합문서"""
+    path = tmp_path_factory.mktemp('ingest') / 'book.xlsx'
+    sheets = make_raw_sheets(500, seed=1)
+    with pd.ExcelWriter(path) as writer:
+        for (sheet_name, data_name), name in zip(SHEET_MAPPING.items(), PROCESSORS):
+            raw = sheets[name].copy()
+            # 선택 컬럼의 빈 셀은 행 단위 구현처럼 NaN 그대로 전달되어야 함
+            raw.iloc[::7, raw.columns.get_loc('연구개발단계')] = np.nan
+            raw.to_excel(writer, sheet_name=sheet_name, index=False)
+    return path
+
+@pytest.mark.parametrize('name', PROCESSORS)
+def test_process_matches_row_loop_on_read_excel(workbook_path, name):
+    sheet_name = list(SHEET_MAPPING)[PROCESSORS.index(name)]
+    raw = pd.read_excel(workbook_path, sheet_name=sheet_name)
+    assert_frame_equal(getattr(data_loader, name)(raw), getattr(legacy_data_loader, name)(raw))
+
+@pytest.mark.parametrize('sheet_name, data_name', list(SHEET_MAPPING.items()))
+def test_process_matches_row_loop_on_streamed_chunks(workbook_path, sheet_name, data_name):
+    # 저장소 변환과 같은 경로 (읽기 전용 시트를 행 묶음으로 순회)
+    wb = load_workbook(workbook_path, read_only=True, data_only=True)
+    legacy = getattr(legacy_data_loader, SHEET_PROCESSORS[data_name].__name__)
+    for chunk in iter_sheet_chunks(wb[sheet_name], chunk_rows=120):
+        assert_frame_equal(SHEET_PROCESSORS[data_name](chunk), legacy(chunk))
+    wb.close()
+
+@pytest.mark.parametrize('name', PROCESSORS)
+def test_process_matches_row_loop_without_optional_columns(name):
+    raw = make_raw_sheets(200, seed=2)[name]
+    required = ['유형', '과제수행년도', '성과발생년도']
+    raw = raw[[col for col in raw.columns if col in required]]
+    assert_frame_equal(getattr(data_loader, name)(raw), getattr(legacy_data_loader, name)(raw))
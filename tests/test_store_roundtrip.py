@@ -0,0 +1,221 @@
+import os
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+import pyarrow as pa
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+import convert_excel
+from convert_excel import convert_excel_to_store, convert_excel_batch
+from data_store import read_manifest, read_store, write_manifest
+
+# 시트별 헤더 (SHEET_MAPPING 순서: 투자성과, 사업화, 기술료)
+SHEET_HEADERS = {
+    'Sheet1': ['유형', '과제수행년도', '성과발생년도', '사업_부처명', '대분류', '중분류', '소분류', '연구개발단계',
+               '연구수행주체', '정부연구비(억원)', '기여율(%)', '과제고유번호', '과제명'],
+    'Sheet2': ['과제수행년도', '성과발생년도', '성과발생부처', '분류명', '연구개발단계', '연구수행주체',
+               '당해년도매출액(백만원)', '과제고유번호', '과제명-국문', '업체명', '고용창출인원수(명)'],
+    'Sheet3': ['과제수행년도', '성과발생년도', '성과발생부처', '분류명', '연구개발단계', '연구수행주체',
+               '당해연도 기술료(백만원)', '과제고유번호', '과제명-국문', '기술실시계약명']
+}
+
+def _project_id(i, numeric_ids):
+    return 1000000000 + i if numeric_ids else f"P{i:09d}"
+
+def make_workbook(path, rows, numeric_ids):
+    """과제고유번호가 숫자(numeric_ids) 또는 문자인 세 시트짜리 통합문서"""
+    wb = Workbook(write_only=True)
+    for sheet_name, header in SHEET_HEADERS.items():
+        ws = wb.create_sheet(sheet_name)
+        ws.append(header)
+        for i in range(rows):
+            year = 2020 + i % 3
+            if sheet_name == 'Sheet1':
+                ws.append(['특허' if i % 2 else '논문', year, year + 1, '과기부', '환경', '대기', '대기A', '응용연구',
+                           '대전연구원', 1.5 + i, 10.0, _project_id(i, numeric_ids), '과제'])
+            elif sheet_name == 'Sheet2':
+                ws.append([year, year + 1, '산업부', '환경', '개발연구', '한국테크', 20.0 + i,
+                           _project_id(i, not numeric_ids), '과제', '업체', i % 4])
+            else:
+                ws.append([year, year + 1, '환경부', '환경', '기초연구', '서울대학교', 5.0 + i,
+                           _project_id(i, numeric_ids), '과제', '계약'])
+    wb.save(path)
+
+def _manifest_rows(store_dir):
+    return sum(f['rows'] for f in read_manifest(store_dir)['files'])
+
+def test_multi_chunk_multi_sheet_roundtrip(tmp_path):
+    excel_path = tmp_path / "book.xlsx"
+    store_dir = str(tmp_path / "store")
+    make_workbook(excel_path, rows=250, numeric_ids=True)
+    
+    convert_excel_to_store(str(excel_path), store_dir, chunk_rows=100)
+    
+    df = read_store(store_dir)
+    assert len(df) == _manifest_rows(store_dir) > 0
+    assert set(df['performance_type']) >= {'특허', '논문', '사업화', '기술료'}
+    # 숫자로만 된 과제번호도 문자열로 저장 ('1000000000.0'처럼 변하지 않음)
+    assert '1000000000' in set(df['project_id'])
+    assert 'P000000000' in set(df['project_id'])
+
+def test_batch_workbooks_with_mixed_id_types(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    make_workbook(books / "numeric.xlsx", rows=120, numeric_ids=True)
+    make_workbook(books / "text.xlsx", rows=120, numeric_ids=False)
+    store_dir = str(tmp_path / "store")
+    
+    convert_excel_batch(str(books), store_dir, workers=2, chunk_rows=50)
+    
+    df = read_store(store_dir)
+    assert len(df) == _manifest_rows(store_dir) > 0
+    assert df['project_id'].map(type).eq(str).all()
+
+def test_incremental_batch_onto_store_with_numeric_ids(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    store_dir = str(tmp_path / "store")
+    make_workbook(books / "numeric.xlsx", rows=80, numeric_ids=True)
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=30)
+    
+    # 이전 버전처럼 project_id를 정수로 기록한 파일로 되돌린 뒤 문자 ID 통합문서를 증분 변환
+    legacy = read_manifest(store_dir)['files'][0]
+    legacy_path = os.path.join(store_dir, legacy['path'])
+    table = pq.read_table(legacy_path)
+    position = table.schema.get_field_index('project_id')
+    pq.write_table(table.set_column(position, 'project_id', table.column(position).cast(pa.int64())), legacy_path)
+    make_workbook(books / "text.xlsx", rows=80, numeric_ids=False)
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=30, incremental=True)
+    
+    df = read_store(store_dir)
+    assert len(df) == _manifest_rows(store_dir) > 0
+    assert df['project_id'].map(type).eq(str).all()
+
+def _sheet_rows(store_dir, data_name):
+    return sum(f['rows'] for f in read_manifest(store_dir)['files'] if f.get('data_name') == data_name)
+
+def test_incremental_keeps_files_of_failed_sheet(tmp_path, monkeypatch):
+    books = tmp_path / "books"
+    books.mkdir()
+    store_dir = str(tmp_path / "store")
+    make_workbook(books / "book.xlsx", rows=60, numeric_ids=True)
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=25)
+    commercial_files = [f['path'] for f in read_manifest(store_dir)['files'] if f['data_name'] == '사업화']
+    commercial_rows = _sheet_rows(store_dir, '사업화')
+    
+    # 원본이 바뀐 뒤 사업화 시트만 변환에 실패 (같은 프로세스에서 실행되도록 스레드 풀 사용)
+    def fail(chunk):
+        raise ValueError("broken sheet")
+    monkeypatch.setattr(convert_excel, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    monkeypatch.setitem(convert_excel.SHEET_PROCESSORS, '사업화', fail)
+    make_workbook(books / "book.xlsx", rows=90, numeric_ids=True)
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=25, incremental=True)
+    
+    manifest = read_manifest(store_dir)
+    source = manifest['sources']['book.xlsx']
+    assert source['sha256'] is None
+    assert source['sheets']['사업화']['rows_read'] == 60
+    assert _sheet_rows(store_dir, '사업화') == commercial_rows
+    assert all(os.path.exists(os.path.join(store_dir, path)) for path in commercial_files)
+    assert _sheet_rows(store_dir, '기술료') == 90
+    assert len(read_store(store_dir)) == _manifest_rows(store_dir)
+    
+    # 다음 증분 변환에서 실패했던 시트를 다시 처리하면 이전 파일이 교체됨
+    monkeypatch.undo()
+    monkeypatch.setattr(convert_excel, 'ProcessPoolExecutor', ThreadPoolExecutor)
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=25, incremental=True)
+    assert _sheet_rows(store_dir, '사업화') == 90
+    assert not any(os.path.exists(os.path.join(store_dir, path)) for path in commercial_files)
+    assert len(read_store(store_dir)) == _manifest_rows(store_dir)
+
+def test_incremental_after_moving_folder_and_deleting_workbook(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    store_dir = str(tmp_path / "store")
+    make_workbook(books / "a.xlsx", rows=40, numeric_ids=True)
+    make_workbook(books / "b.xlsx", rows=30, numeric_ids=False)
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=25)
+    rows = _manifest_rows(store_dir)
+    assert set(read_manifest(store_dir)['sources']) == {'a.xlsx', 'b.xlsx'}
+    
+    # 폴더를 옮겨도 원본 키(상대 경로)가 같으므로 다시 변환하지 않음
+    moved = tmp_path / "moved"
+    books.rename(moved)
+    assert len(convert_excel_batch(str(moved / "*.xlsx"), store_dir, workers=1, chunk_rows=25, incremental=True)) == 0
+    assert _manifest_rows(store_dir) == rows == len(read_store(store_dir))
+    
+    # 사라진 통합문서의 원본 기록과 파티션 파일은 삭제
+    b_files = [f['path'] for f in read_manifest(store_dir)['files'] if f['source'] == 'b.xlsx']
+    os.remove(moved / "b.xlsx")
+    convert_excel_batch(str(moved), store_dir, workers=1, chunk_rows=25, incremental=True)
+    manifest = read_manifest(store_dir)
+    assert set(manifest['sources']) == {'a.xlsx'}
+    assert {f['source'] for f in manifest['files']} == {'a.xlsx'}
+    assert not any(os.path.exists(os.path.join(store_dir, path)) for path in b_files)
+    assert len(read_store(store_dir)) == _manifest_rows(store_dir) < rows
+
+def test_incremental_replaces_legacy_absolute_source_keys(tmp_path):
+    books = tmp_path / "books"
+    books.mkdir()
+    store_dir = str(tmp_path / "store")
+    make_workbook(books / "book.xlsx", rows=40, numeric_ids=True)
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=25)
+    rows = _manifest_rows(store_dir)
+    
+    # 이전 버전처럼 원본을 절대 경로로 기록한 매니페스트
+    manifest = read_manifest(store_dir)
+    legacy_key = os.path.abspath(books / "book.xlsx")
+    manifest['sources'] = {legacy_key: manifest['sources']['book.xlsx']}
+    for f in manifest['files']:
+        f['source'] = legacy_key
+    write_manifest(manifest, store_dir)
+    
+    convert_excel_batch(str(books), store_dir, workers=1, chunk_rows=25, incremental=True)
+    manifest = read_manifest(store_dir)
+    assert set(manifest['sources']) == {'book.xlsx'}
+    assert len(read_store(store_dir)) == _manifest_rows(store_dir) == rows
+
+def test_failed_full_conversion_keeps_existing_store(tmp_path, monkeypatch):
+    excel_path = tmp_path / "book.xlsx"
+    store_dir = str(tmp_path / "store")
+    make_workbook(excel_path, rows=60, numeric_ids=True)
+    assert convert_excel_to_store(str(excel_path), store_dir, chunk_rows=25) is not None
+    manifest = read_manifest(store_dir)
+    
+    # 마지막 시트에서 실패해도 기존 저장소는 그대로이고 임시 폴더는 남지 않음
+    def fail(chunk):
+        raise ValueError("broken sheet")
+    monkeypatch.setitem(convert_excel.SHEET_PROCESSORS, '기술료', fail)
+    make_workbook(excel_path, rows=90, numeric_ids=True)
+    assert convert_excel_to_store(str(excel_path), store_dir, chunk_rows=25) is None
+    assert read_manifest(store_dir) == manifest
+    assert len(read_store(store_dir)) == _manifest_rows(store_dir)
+    assert sorted(os.listdir(tmp_path)) == ['book.xlsx', 'store']
+    
+    # 명령행 실행은 0이 아닌 종료 코드로 끝남
+    monkeypatch.setattr('sys.argv', ['convert_excel.py', '--store', store_dir])
+    monkeypatch.setattr('builtins.input', lambda prompt: str(excel_path))
+    with pytest.raises(SystemExit) as exit_info:
+        convert_excel.main()
+    assert exit_info.value.code == 1
+    assert read_manifest(store_dir) == manifest
+    
+    # 성공하면 새 저장소로 교체
+    monkeypatch.undo()
+    assert convert_excel_to_store(str(excel_path), store_dir, chunk_rows=25) is not None
+    assert _sheet_rows(store_dir, '기술료') == 90
+    assert sorted(os.listdir(tmp_path)) == ['book.xlsx', 'store']
+
+def test_projection_with_columns_missing_from_some_files(tmp_path):
+    excel_path = tmp_path / "book.xlsx"
+    store_dir = str(tmp_path / "store")
+    make_workbook(excel_path, rows=60, numeric_ids=False)
+    convert_excel_to_store(str(excel_path), store_dir, chunk_rows=25)
+    
+    # company_name은 사업화 시트 파일에만 있음
+    df = read_store(store_dir, columns=['year', 'company_name', 'budget_billion'])
+    assert list(df.columns) == ['year', 'company_name', 'budget_billion']
+    assert len(df) == _manifest_rows(store_dir)
+    assert df['company_name'].notna().sum() == (read_store(store_dir)['performance_type'] == '사업화').sum()
+    
+    # 어느 컬럼도 없는 파일도 행 수는 유지
+    assert len(read_store(store_dir, columns=['contract_name'])) == _manifest_rows(store_dir)
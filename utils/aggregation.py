@@ -0,0 +1,252 @@
+import hashlib
+import numpy as np
+import pandas as pd
+from utils.data_filters import cached_value
+
+# 행 수 측정값 이름 (groupby(...).size()에 해당)
+ROW_COUNT = 'rows'
+
+# 결합 코드 공간이 이보다 크면 실제 나타난 조합만 남겨 압축한 뒤 bincount
+DENSE_GROUP_MAX_CELLS = 1 << 24
+
+# 정수 차원 컬럼은 값 범위가 이보다 좁으면 값을 그대로 코드로 사용 (factorize 생략)
+INTEGER_CODE_MAX_RANGE = 1 << 16
+
+# 상위 K개에 들지 못한 항목을 합산하는 라벨
+OTHER_LABEL = '기타'
+
+def _dimension_codes(series):
+    """차원 컬럼의 (코드 배열, 라벨 생성 함수) - 코드 순서는 groupby 정렬 순서, 결측값은 -1"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        dtype = series.dtype
+        return series.cat.codes.to_numpy(), len(dtype.categories), lambda codes: pd.Categorical.from_codes(codes, dtype=dtype)
+    
+    values = series.to_numpy()
+    if values.dtype.kind in 'iu' and len(values):
+        # 값 범위가 좁은 정수 컬럼(연도 등)은 최솟값과의 차이를 그대로 코드로 사용
+        low, high = int(values.min()), int(values.max())
+        if high - low < INTEGER_CODE_MAX_RANGE:
+            uniques = pd.Index(np.arange(low, high + 1, dtype=values.dtype))
+            return (values - low).astype(np.intp), len(uniques), uniques.take
+    
+    codes, uniques = pd.factorize(series, sort=True)
+    uniques = pd.Index(uniques)
+    
+    def make_labels(codes):
+        if (codes < 0).any():
+            return uniques.take(codes, allow_fill=True, fill_value=np.nan)
+        return uniques.take(codes)
+    
+    return codes, len(uniques), make_labels
+
+def _group_index(labels, dims):
+    if len(dims) == 1:
+        return pd.Index(labels[0], name=dims[0])
+    return pd.MultiIndex.from_arrays(labels, names=dims)
+
+def group_sum(df, dims, measures, size=False, dropna=True):
+    """df.groupby(dims, observed=True, dropna=dropna)[measures].sum()과 같은 결과를 차원 코드 bincount로 계산
+    
+    차원별 범주 코드를 하나의 결합 코드로 합친 뒤 측정값마다 bincount 한 번으로 합계를 구한다.
+    size=True면 행 수 컬럼(ROW_COUNT)을 추가한다. 숫자가 아닌 측정값이나 정렬할 수 없는
+    차원 값이 있으면 pandas groupby로 계산한다.
+    """
+    dims, measures = list(dims), list(measures)
+    if not dims or any(not pd.api.types.is_numeric_dtype(df[m]) for m in measures):
+        return _pandas_group_sum(df, dims, measures, size, dropna)
+    try:
+        dimensions = [_dimension_codes(df[dim]) for dim in dims]
+    except TypeError:
+        return _pandas_group_sum(df, dims, measures, size, dropna)
+    
+    # 결측값(-1)은 각 차원의 마지막 코드로 모은 뒤, dropna면 결과에서 해당 그룹만 제외
+    shape = []
+    combined = None
+    for codes, n_values, _ in dimensions:
+        if len(codes) and codes.min() < 0:
+            codes = np.where(codes >= 0, codes, n_values)
+        n_codes = n_values + 1
+        if shape and np.prod(shape, dtype=float) * n_codes >= np.iinfo(np.int64).max:
+            return _pandas_group_sum(df, dims, measures, size, dropna)
+        if combined is None:
+            combined = codes.astype(np.int64)
+        else:
+            combined *= n_codes
+            combined += codes
+        shape.append(n_codes)
+    
+    # 조합 수가 많으면 나타난 조합만 남겨 압축
+    if np.prod(shape, dtype=float) > max(DENSE_GROUP_MAX_CELLS, 4 * len(combined)):
+        observed, combined = np.unique(combined, return_inverse=True)
+        n_cells = len(observed)
+    else:
+        observed = None
+        n_cells = int(np.prod(shape))
+    
+    counts = np.bincount(combined, minlength=n_cells)
+    present = np.flatnonzero(counts)
+    cells = present if observed is None else observed[present]
+    level_codes = np.unravel_index(cells, shape)
+    if dropna:
+        complete = np.ones(len(cells), dtype=bool)
+        for (_, n_values, _), codes in zip(dimensions, level_codes):
+            complete &= codes < n_values
+        present, level_codes = present[complete], [codes[complete] for codes in level_codes]
+    
+    # 차원별 코드 → 라벨 (결측 코드는 -1로 되돌림)
+    labels = [
+        make_labels(np.where(codes < n_values, codes, -1))
+        for (_, n_values, make_labels), codes in zip(dimensions, level_codes)
+    ]
+    
+    result = {}
+    for measure in measures:
+        values = df[measure].to_numpy()
+        weights = values.astype(np.float64, copy=False)
+        if values.dtype.kind == 'f':
+            nulls = np.isnan(weights)
+            if nulls.any():
+                weights = np.where(nulls, 0.0, weights)
+        sums = np.bincount(combined, weights=weights, minlength=n_cells)[present]
+        result[measure] = sums.astype(values.dtype) if values.dtype.kind == 'f' else np.rint(sums).astype(np.int64)
+    if size:
+        result[ROW_COUNT] = counts[present].astype(np.int64)
+    
+    return pd.DataFrame(result, index=_group_index(labels, dims), columns=measures + ([ROW_COUNT] if size else []))
+
+def _pandas_group_sum(df, dims, measures, size, dropna):
+    grouped = df.groupby(dims, observed=True, dropna=dropna)
+    result = grouped[measures].sum()
+    if size:
+        result[ROW_COUNT] = grouped.size()
+    return result
+
+def top_k_per_group(df, groups, item, measure, k):
+    """그룹별 측정값 합계 상위 k개 항목 (groups + [item, measure, 'rank'] 데이터프레임)
+    
+    그룹 안에서는 합계 내림차순이며, 합계가 같으면 항목 정렬 순서를 따른다 (Series.nlargest와 같음).
+    """
+    groups = list(groups)
+    totals = group_sum(df, groups + [item], [measure]).reset_index()
+    totals = totals.sort_values(groups + [measure], ascending=[True] * len(groups) + [False], kind='stable')
+    totals['rank'] = totals.groupby(groups, observed=True).cumcount()
+    return totals[totals['rank'] < k].reset_index(drop=True)
+
+def top_k_labels(frame, item, measure, k):
+    """항목별 측정값 합계 상위 k개 라벨 (항목 정렬 순서 유지, 항목이 k개 이하이면 None)
+    
+    합계가 같으면 항목 정렬 순서가 앞선 것을 남긴다 (Series.nlargest와 같음).
+    """
+    totals = group_sum(frame, [item], [measure])[measure]
+    if len(totals) <= k:
+        return None
+    kept = set(totals.nlargest(k).index)
+    return [label for label in totals.index if label in kept]
+
+def bucket_labels(series, labels, other=OTHER_LABEL):
+    """labels에 없는 값을 '기타'로 바꾼 범주형 Series (범주 순서: labels + '기타', 결측값은 유지)"""
+    categories = list(labels) + ([] if other in labels else [other])
+    bucketed = series.astype(object).where(series.isin(labels) | series.isna(), other)
+    return pd.Series(pd.Categorical(bucketed, categories=categories), index=series.index, name=series.name)
+
+def bucket_top_k(frame, item, measures, k, rank_by=None, other=OTHER_LABEL):
+    """항목별 합계 상위 k개만 남기고 나머지 항목은 '기타' 한 항목으로 합산 (차트의 트레이스·범주 수 상한)
+    
+    frame은 group_sum/cube_frame 결과 같은 긴 형식 집계이며 measures 외의 컬럼을 차원으로 보고 다시 합산한다.
+    순위는 rank_by(기본: 첫 측정값)의 항목별 전체 합계 기준이다. 항목이 k개 이하이면 frame을 그대로 반환하고,
+    넘으면 항목 컬럼은 상위 항목 + '기타' 순서의 범주형이 된다 ('기타'가 상위 항목이면 나머지를 그 칸에 합침).
+    """
+    measures = [measures] if isinstance(measures, str) else list(measures)
+    labels = top_k_labels(frame, item, measures[0] if rank_by is None else rank_by, k)
+    if labels is None:
+        return frame
+    
+    dims = [column for column in frame.columns if column not in measures]
+    bucketed = frame.assign(**{item: bucket_labels(frame[item], labels, other)})
+    return group_sum(bucketed, dims, measures, dropna=False).reset_index()
+
+def _normalize_spec(spec):
+    """(차원, 측정값[, 결측 제외 컬럼]) → 튜플 형식으로 통일"""
+    dims, measure = spec[0], spec[1]
+    notnull = spec[2] if len(spec) > 2 else ()
+    return tuple(dims), measure, tuple(notnull)
+
+def specs_key(specs):
+    """집계 요청 목록의 해시 (큐브 캐시 키 계산용)"""
+    canonical = sorted(repr(_normalize_spec(spec)) for spec in specs)
+    return hashlib.sha1('|'.join(canonical).encode('utf-8')).hexdigest()
+
+def build_cube(df, specs):
+    """탭들이 요청한 집계를 최소한의 원본 스캔으로 계산한 집계 큐브 생성
+    
+    각 요청은 (차원 목록, 측정값[, 결측 제외 컬럼]) 형식이며 측정값 'rows'는 행 수이다.
+    다른 요청의 키를 모두 포함하는 집계만 원본에서 한 번씩 계산하고,
+    나머지는 그 결과를 재집계하여 만든다.
+    """
+    columns = set(df.columns)
+    specs = sorted(
+        {
+            spec for spec in map(_normalize_spec, specs)
+            if set(spec[0] + spec[2]) <= columns and (spec[1] == ROW_COUNT or spec[1] in columns)
+        },
+        key=repr
+    )
+    
+    # 다른 요청의 키 집합에 포함되지 않는 키 집합만 원본에서 집계
+    keysets = {frozenset(dims + notnull) for dims, _, notnull in specs}
+    bases = [keys for keys in keysets if not any(keys < other for other in keysets)]
+    measures = sorted({measure for _, measure, _ in specs if measure != ROW_COUNT})
+    
+    tables = {}
+    for keys in bases:
+        tables[keys] = group_sum(df, sorted(keys), measures, size=True, dropna=False).reset_index()
+    
+    slices = {}
+    for dims, measure, notnull in specs:
+        keys = frozenset(dims + notnull)
+        base = min((b for b in bases if keys <= b), key=lambda b: len(tables[b]))
+        table = tables[base]
+        if notnull:
+            table = table.dropna(subset=list(notnull))
+        slices[(dims, measure, notnull)] = group_sum(table, dims, [measure])[measure]
+    
+    return {'slices': slices, 'requested': len(specs), 'scans': len(bases), 'served': 0}
+
+def cached_cube(df, specs, cache, filter_key):
+    """build_cube 결과를 필터 상태 해시 기준으로 캐시하여 재사용 (탭 간, 재실행 간 공유)
+    
+    캐시된 큐브는 여러 세션이 함께 읽으므로 조회 횟수는 실행마다 새로 만든 얕은 사본에만 센다.
+    """
+    cube = cached_value(
+        cache,
+        f"cube:{filter_key}:{specs_key(specs)}",
+        lambda: build_cube(df, specs),
+        cube_nbytes
+    )
+    return {**cube, 'served': 0}
+
+def cube_series(cube, dims, measure, notnull=()):
+    """큐브에서 차원별 측정값 합계 Series 조회 (groupby(dims)[measure].sum()과 같은 형식)"""
+    cube['served'] += 1
+    return cube['slices'][(tuple(dims), measure, tuple(notnull))]
+
+def cube_frame(cube, dims, measures, notnull=()):
+    """큐브에서 차원별 측정값 합계 데이터프레임 조회 (groupby(dims)[measures].sum().reset_index() 형식)"""
+    cube['served'] += 1
+    return pd.DataFrame({
+        measure: cube['slices'][(tuple(dims), measure, tuple(notnull))]
+        for measure in measures
+    }).reset_index()
+
+def cube_nbytes(cube):
+    """큐브가 차지하는 메모리 (캐시 한도 계산용)"""
+    return sum(int(s.memory_usage(deep=False)) for s in cube['slices'].values())
+
+def cube_stats(cube):
+    """큐브 조회 횟수와 원본 스캔 횟수 (이번 실행에서 조회마다 원본을 집계했을 때 대비 절약한 스캔 수)"""
+    return {
+        'requested': cube['requested'],
+        'served': cube['served'],
+        'scans': cube['scans'],
+        'saved': max(cube['served'] - cube['scans'], 0)
+    }
@@ -0,0 +1,112 @@
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import plotly.graph_objects as go
+import streamlit as st
+from utils.data_filters import create_selection_cache, cached_value
+
+# 차트 스타일(레이아웃/색상/문구)을 바꾸면 올려서 캐시된 그림을 모두 무효화
+FIGURE_STYLE_VERSION = 1
+
+# 직렬화된 그림 JSON 캐시 한도
+FIGURE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+FIGURE_CACHE_MAX_ENTRIES = 512
+
+@st.cache_resource
+def get_figure_cache():
+    """그림 JSON LRU 캐시 (세션 간 공유, 키에 입력 데이터 해시 포함)"""
+    return create_selection_cache(max_bytes=FIGURE_CACHE_MAX_BYTES, max_entries=FIGURE_CACHE_MAX_ENTRIES)
+
+def _update_hash(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        # 값/인덱스 해시와 함께 컬럼명·dtype도 반영 (같은 값이라도 라벨이 다르면 다른 그림)
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        digest.update(repr(value.dtypes if isinstance(value, pd.DataFrame) else value.dtype).encode('utf-8'))
+        digest.update(repr(list(value.columns) if isinstance(value, pd.DataFrame) else value.name).encode('utf-8'))
+    elif isinstance(value, np.ndarray):
+        digest.update(repr((value.dtype, value.shape)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode('utf-8'))
+        for item in value:
+            _update_hash(digest, item)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            digest.update(repr(key).encode('utf-8'))
+            _update_hash(digest, value[key])
+    else:
+        digest.update(repr(value).encode('utf-8'))
+
+def figure_key(chart_id, inputs, style_version=FIGURE_STYLE_VERSION):
+    """(차트 ID, 집계 입력 해시, 스타일 버전) 캐시 키"""
+    digest = hashlib.sha1()
+    _update_hash(digest, inputs)
+    return f"figure:{chart_id}:v{style_version}:{digest.hexdigest()}"
+
+def cached_figure(chart_id, inputs, build, style_version=FIGURE_STYLE_VERSION, cache=None):
+    """그림 JSON을 (차트 ID, 입력 해시, 스타일 버전) 기준으로 캐시
+
+    build()는 plotly Figure를 만들어 반환하며 캐시에 없을 때만 호출된다.
+    inputs에는 그림을 결정하는 집계 결과와 옵션을 모두 넣는다 (원본 행 단위 데이터는 넣지 않음).
+    """
+    cache = get_figure_cache() if cache is None else cache
+    return cached_value(
+        cache,
+        figure_key(chart_id, inputs, style_version),
+        lambda: pio.to_json(build(), validate=False),
+        len
+    )
+
+class _FigureSpec(go.Figure):
+    """이미 검증·직렬화된 그림 사양을 그대로 전달하는 Figure
+    
+    st.plotly_chart는 Figure를 받으면 검증 없이 to_dict() 결과를 JSON으로 보내므로, 캐시 적중 시
+    Figure 객체를 다시 만들고 속성을 검증하는 비용(pio.from_json)을 건너뛴다.
+    dict로 넘기면 다시 검증하고 트레이스가 없는 그림에서 오류가 나므로 Figure 형식을 유지한다.
+    """
+    def __init__(self, spec):
+        self._spec = spec
+    
+    def to_dict(self):
+        return self._spec
+
+def plotly_chart_cached(chart_id, inputs, build, **kwargs):
+    """cached_figure로 얻은 그림 출력 (캐시 적중 시 Plotly Express 생성과 Figure 복원·검증 없이 사양만 전송)
+    
+    캐시 키가 inputs의 해시이므로 inputs를 만드는 집계는 적중 시에도 실행된다.
+    """
+    spec = json.loads(cached_figure(chart_id, inputs, build))
+    st.plotly_chart(_FigureSpec(spec), **kwargs)
+
+@st.fragment
+def year_stepper_chart(chart_id, frame, years, build, inputs=(), year_col='year', label="연도 선택", **kwargs):
+    """연도 슬라이더로 고른 한 연도의 그림만 전송 (animation_frame처럼 전 연도 프레임을 한 번에 보내지 않음)
+    
+    frame은 연도 컬럼이 있는 집계 결과이고 build(year_frame, year)는 해당 연도 그림을 만든다.
+    years는 frame에 실제로 있는 연도로 넘기며, 고른 연도의 행이 없으면 그림 대신 안내 문구를 표시한다.
+    inputs에는 build가 참조하는 나머지 옵션(색상 순서 등)을 넣는다. 슬라이더를 움직이면
+    이 프래그먼트만 다시 실행되며, 연도별 그림은 그림 캐시에 보관된다.
+    """
+    years = list(years)
+    if not years:
+        return
+    
+    # 필터 변경으로 이전에 고른 연도가 사라졌으면 최근 연도로 되돌림
+    key = f"year_stepper:{chart_id}"
+    if key in st.session_state and st.session_state[key] not in years:
+        del st.session_state[key]
+    
+    year = st.select_slider(label, options=years, value=years[-1], key=key)
+    year_frame = frame[frame[year_col] == year]
+    if year_frame.empty:
+        st.info("선택한 연도의 데이터가 없습니다.")
+        return
+    
+    plotly_chart_cached(
+        chart_id,
+        [year_frame, year, list(inputs)],
+        lambda: build(year_frame, year),
+        **kwargs
+    )
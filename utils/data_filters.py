@@ -1,36 +1,332 @@
+import numpy as np
 import pandas as pd
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from utils.data_processing import NULL_OPTION
 
-def filter_dataframe(df, filter_config):
-    """필터 설정에 따라 데이터프레임 필터링"""
-    filtered_df = df.copy()
+# 비트맵 인덱스를 만들 차원 컬럼
+INDEX_COLUMNS = [
+    'year',
+    'performance_year',
+    'ministry',
+    'research_area',
+    'research_area_medium',
+    'research_area_small',
+    'institute',
+    'performance_type'
+]
+
+# 값 종류가 이 이하인 차원은 값별 비트맵을 미리 만들어 두고, 그보다 많으면 코드 배열에서 비트맵 생성
+DENSE_BITMAP_MAX_VALUES = 64
+
+# 사이드바에 값별 건수/예산을 표시할 차원 컬럼
+FACET_COLUMNS = [
+    'ministry',
+    'research_area',
+    'research_area_medium',
+    'research_area_small',
+    'institute'
+]
+
+# 필터 결과(행 위치) 캐시 한도
+SELECTION_CACHE_MAX_BYTES = 256 * 1024 * 1024
+SELECTION_CACHE_MAX_ENTRIES = 128
+
+# 필터 결과에 영향을 주는 설정 키 (캐시 키 계산용)
+FILTER_KEYS = [
+    'selected_years',
+    'year_column',
+    'selected_ministries',
+    'selected_areas',
+    'selected_medium',
+    'selected_small',
+    'selected_institutes',
+    'selected_performance_types'
+]
+
+def build_filter_index(df):
+    """차원 컬럼별 값 → 행 비트맵 인덱스 생성 (데이터 로드 시 한 번)"""
+    index = {'rows': len(df), 'columns': {}}
+    
+    for col in INDEX_COLUMNS:
+        if col not in df.columns:
+            continue
+        
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            codes = df[col].cat.codes.to_numpy()
+            values = df[col].cat.categories
+        else:
+            codes, values = pd.factorize(df[col], sort=True)
+            values = pd.Index(values)
+        
+        entry = {
+            'values': values,
+            'codes': codes,
+            'notnull': np.packbits(codes >= 0),
+            'null': np.packbits(codes < 0),
+            'nulls': int((codes < 0).sum()),
+            'counts': np.bincount(codes[codes >= 0], minlength=len(values))
+        }
+        if len(values) <= DENSE_BITMAP_MAX_VALUES:
+            entry['bitmaps'] = [np.packbits(codes == code) for code in range(len(values))]
+        index['columns'][col] = entry
+    
+    # 패싯 예산 합계용 측정값
+    index['budget'] = df['budget_billion'].to_numpy(dtype=float) if 'budget_billion' in df.columns else None
+    
+    return index
+
+def index_options(index, col, include_null=True):
+    """인덱스에서 실제 행이 있는 값 목록 (정렬, include_null이면 결측 행이 있을 때 NULL_OPTION을 마지막에 추가)
+    
+    매 실행마다 원본 컬럼을 훑지 않고 로드 시 계산한 값별 행 수로 선택지를 만든다.
+    """
+    entry = index['columns'][col]
+    options = sorted(entry['values'][entry['counts'] > 0])
+    if include_null and entry['nulls']:
+        options.append(NULL_OPTION)
+    return options
+
+def _or_bitmaps(bitmaps, like):
+    result = np.zeros_like(like)
+    for bitmap in bitmaps:
+        np.bitwise_or(result, bitmap, out=result)
+    return result
+
+def _dimension_bitmap(entry, positions):
+    """선택된 값 위치들의 행 비트맵 (차원 내 OR)"""
+    n_values = len(entry['values'])
+    if len(positions) == n_values:
+        return entry['notnull']
+    
+    if 'bitmaps' in entry:
+        # 선택이 절반을 넘으면 선택되지 않은 값들의 비트맵을 OR한 뒤 반전
+        if len(positions) * 2 > n_values:
+            excluded = np.setdiff1d(np.arange(n_values), positions)
+            excluded_bitmap = _or_bitmaps((entry['bitmaps'][p] for p in excluded), entry['notnull'])
+            return entry['notnull'] & ~excluded_bitmap
+        return _or_bitmaps((entry['bitmaps'][p] for p in positions), entry['notnull'])
+    
+    # 값 종류가 많은 차원은 코드 조회표로 한 번에 마스크 생성 (-1 코드는 마지막 칸 = False)
+    lut = np.zeros(n_values + 1, dtype=bool)
+    lut[positions] = True
+    return np.packbits(lut[entry['codes']])
+
+def _filter_steps(filter_config):
+    """(컬럼, 선택값, 결측값 유지 여부) 목록 - 기존 필터 적용 순서 유지
     
-    # 연도 필터
+    부처/연구분야/수행주체는 선택값에 NULL_OPTION이 있을 때만 해당 컬럼이 결측인 행을 남긴다.
+    """
+    steps = []
+    
+    # 연도 필터 (투자년도 또는 성과발생년도)
     if 'selected_years' in filter_config and filter_config['selected_years']:
-        # 연도 컬럼 선택 (투자년도 또는 성과발생년도)
-        year_col = filter_config.get('year_column', 'year')
-        if year_col in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df[year_col].isin(filter_config['selected_years'])]
-    
-    # 부처 필터
-    if 'selected_ministries' in filter_config and filter_config['selected_ministries']:
-        filtered_df = filtered_df[filtered_df['ministry'].isin(filter_config['selected_ministries'])]
-    
-    # 연구분야 필터
-    if 'selected_areas' in filter_config and filter_config['selected_areas']:
-        filtered_df = filtered_df[filtered_df['research_area'].isin(filter_config['selected_areas'])]
-    
-    # 연구분야(중분류) 필터
-    if 'selected_medium' in filter_config and filter_config['selected_medium'] and 'research_area_medium' in filtered_df.columns:
-        # 중분류가 선택되었고, 중분류 컬럼이 있는 경우에만 필터링
-        filtered_df = filtered_df[filtered_df['research_area_medium'].isin(filter_config['selected_medium'])]
-    
-    # 연구분야(소분류) 필터
-    if 'selected_small' in filter_config and filter_config['selected_small'] and 'research_area_small' in filtered_df.columns:
-        # 소분류가 선택되었고, 소분류 컬럼이 있는 경우에만 필터링
-        filtered_df = filtered_df[filtered_df['research_area_small'].isin(filter_config['selected_small'])]
-    
-    # 수행주체 필터
-    if 'selected_institutes' in filter_config and filter_config['selected_institutes']:
-        filtered_df = filtered_df[filtered_df['institute'].isin(filter_config['selected_institutes'])]
-    
-    return filtered_df
\ No newline at end of file
+        steps.append((filter_config.get('year_column', 'year'), filter_config['selected_years'], False))
+    
+    # 부처/연구분야(대·중·소)/수행주체 필터
+    for key, col in [
+        ('selected_ministries', 'ministry'),
+        ('selected_areas', 'research_area'),
+        ('selected_medium', 'research_area_medium'),
+        ('selected_small', 'research_area_small'),
+        ('selected_institutes', 'institute')
+    ]:
+        if key in filter_config and filter_config[key]:
+            steps.append((col, filter_config[key], NULL_OPTION in filter_config[key]))
+    
+    # 성과 유형 필터 (선택이 비어 있으면 결과도 비어 있음)
+    if 'selected_performance_types' in filter_config:
+        steps.append(('performance_type', filter_config['selected_performance_types'], False))
+    
+    return steps
+
+def _applied_filters(index, filter_config):
+    """실제로 적용되는 (컬럼, 차원 비트맵) 목록과 최종 선택 비트맵 (None이면 전체 행)
+    
+    값이 모두 선택되고 결측 행도 남기는(또는 결측 행이 없는) 차원은 아무 행도 빼지 않으므로 건너뛴다.
+    """
+    applied = []
+    selection = None
+    
+    for col, selected, keep_null in _filter_steps(filter_config):
+        entry = index['columns'].get(col)
+        if entry is None:
+            continue
+        
+        positions = entry['values'].get_indexer(list(selected))
+        positions = np.unique(positions[positions >= 0])
+        if len(positions) == len(entry['values']) and (keep_null or not entry['nulls']):
+            continue
+        
+        dimension = _dimension_bitmap(entry, positions)
+        if keep_null:
+            dimension = dimension | entry['null']
+        
+        applied.append((col, dimension))
+        selection = dimension if selection is None else selection & dimension
+    
+    return applied, selection
+
+def select_rows(index, filter_config):
+    """필터 설정에 해당하는 행 위치 배열 반환 (차원 내 OR, 차원 간 AND)"""
+    _, selection = _applied_filters(index, filter_config)
+    if selection is None:
+        return np.arange(index['rows'])
+    return np.flatnonzero(np.unpackbits(selection, count=index['rows']))
+
+def compute_facets(index, filter_config, columns=FACET_COLUMNS):
+    """차원별 값의 행 수/예산 합계 (각 차원은 자기 필터를 뺀 나머지 필터 기준)
+    
+    적용된 필터별로 통과하지 못한 행을 한 번에 세어, 모두 통과한 행은 모든 차원에 집계하고
+    한 필터만 통과하지 못한 행은 그 필터의 차원에만 집계한다. 결측 행은 null_rows/null_budget에 따로 센다.
+    """
+    n_rows = index['rows']
+    applied, _ = _applied_filters(index, filter_config)
+    applied_columns = [col for col, _ in applied]
+    
+    failures = np.zeros(n_rows, dtype=np.uint8)
+    failed_filter = np.zeros(n_rows, dtype=np.uint8)
+    for position, (_, bitmap) in enumerate(applied):
+        failed = np.unpackbits(bitmap, count=n_rows) == 0
+        failures += failed
+        failed_filter[failed] = position
+    passed = failures == 0
+    
+    facets = {}
+    for col in columns:
+        entry = index['columns'].get(col)
+        if entry is None:
+            continue
+        
+        if col in applied_columns:
+            rows = passed | ((failures == 1) & (failed_filter == applied_columns.index(col)))
+        else:
+            rows = passed
+        
+        codes = entry['codes'][rows]
+        valid = codes >= 0
+        n_values = len(entry['values'])
+        budget = index['budget'][rows] if index['budget'] is not None else np.zeros(len(codes))
+        facets[col] = {
+            'values': entry['values'],
+            'rows': np.bincount(codes[valid], minlength=n_values),
+            'budget': np.bincount(codes[valid], weights=budget[valid], minlength=n_values),
+            'null_rows': int((~valid).sum()),
+            'null_budget': float(np.nansum(budget[~valid]))
+        }
+    
+    return facets
+
+def filter_cache_key(filter_config, data_version=None, rows=None):
+    """필터 상태의 정규화 해시 (선택값 순서와 무관, 데이터 버전 포함)"""
+    canonical = {}
+    for key in FILTER_KEYS:
+        if key not in filter_config:
+            continue
+        value = filter_config[key]
+        if isinstance(value, (list, tuple, set)):
+            canonical[key] = sorted({str(v) for v in value})
+        else:
+            canonical[key] = str(value)
+    
+    payload = json.dumps(
+        {'filters': canonical, 'data_version': str(data_version), 'rows': rows},
+        sort_keys=True, ensure_ascii=False
+    )
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def create_selection_cache(max_bytes=SELECTION_CACHE_MAX_BYTES, max_entries=SELECTION_CACHE_MAX_ENTRIES):
+    """필터 결과(행 위치 배열, 패싯/집계 큐브) LRU 캐시 생성"""
+    return {
+        'entries': OrderedDict(),
+        'bytes': 0,
+        'max_bytes': max_bytes,
+        'max_entries': max_entries,
+        'hits': 0,
+        'misses': 0,
+        'evictions': 0,
+        'lock': threading.Lock()
+    }
+
+def _cache_get(cache, key):
+    with cache['lock']:
+        item = cache['entries'].get(key)
+        if item is None:
+            cache['misses'] += 1
+            return None
+        cache['entries'].move_to_end(key)
+        cache['hits'] += 1
+        return item[0]
+
+def _cache_put(cache, key, value, nbytes):
+    with cache['lock']:
+        if key in cache['entries']:
+            cache['bytes'] -= cache['entries'].pop(key)[1]
+        cache['entries'][key] = (value, nbytes)
+        cache['bytes'] += nbytes
+        
+        # 메모리/개수 한도를 넘으면 가장 오래 사용하지 않은 결과부터 제거 (방금 넣은 결과는 유지)
+        while len(cache['entries']) > 1 and (
+            cache['bytes'] > cache['max_bytes'] or len(cache['entries']) > cache['max_entries']
+        ):
+            _, (_, evicted_bytes) = cache['entries'].popitem(last=False)
+            cache['bytes'] -= evicted_bytes
+            cache['evictions'] += 1
+
+def selection_cache_stats(cache):
+    """캐시 적중/미적중 횟수와 사용량"""
+    with cache['lock']:
+        lookups = cache['hits'] + cache['misses']
+        return {
+            'hits': cache['hits'],
+            'misses': cache['misses'],
+            'hit_rate': cache['hits'] / lookups if lookups else 0.0,
+            'entries': len(cache['entries']),
+            'bytes': cache['bytes'],
+            'evictions': cache['evictions']
+        }
+
+def cached_select_rows(index, filter_config, cache, data_version=None):
+    """select_rows 결과를 필터 상태 해시 기준으로 캐시하여 재사용"""
+    key = filter_cache_key(filter_config, data_version, index['rows'])
+    rows = _cache_get(cache, key)
+    if rows is None:
+        rows = select_rows(index, filter_config)
+        # 행 위치는 int32로 충분하면 줄여서 보관
+        if index['rows'] < np.iinfo(np.int32).max:
+            rows = rows.astype(np.int32)
+        rows.flags.writeable = False
+        _cache_put(cache, key, rows, rows.nbytes)
+    return rows
+
+def cached_value(cache, key, compute, sizeof):
+    """캐시에 있으면 재사용하고, 없으면 compute()로 계산하여 sizeof(값) 바이트로 보관"""
+    value = _cache_get(cache, key)
+    if value is None:
+        value = compute()
+        _cache_put(cache, key, value, sizeof(value))
+    return value
+
+def cached_facets(index, filter_config, cache, data_version=None):
+    """compute_facets 결과를 필터 상태 해시 기준으로 캐시하여 재사용"""
+    return cached_value(
+        cache,
+        'facets:' + filter_cache_key(filter_config, data_version, index['rows']),
+        lambda: compute_facets(index, filter_config),
+        lambda facets: sum(facet['rows'].nbytes + facet['budget'].nbytes for facet in facets.values())
+    )
+
+def filter_dataframe(df, filter_config, index=None, cache=None, data_version=None):
+    """필터 설정에 따라 데이터프레임 필터링 (비트맵 인덱스로 행을 고른 뒤 한 번만 추출)"""
+    if index is None:
+        index = build_filter_index(df)
+    
+    if cache is None:
+        rows = select_rows(index, filter_config)
+    else:
+        rows = cached_select_rows(index, filter_config, cache, data_version)
+    if len(rows) == len(df):
+        return df
+    return df.iloc[rows]
@@ -0,0 +1,190 @@
+import numpy as np
+import pandas as pd
+
+# 범주형(사전 인코딩)으로 관리하는 차원 컬럼
+DIMENSION_COLUMNS = [
+    'ministry',
+    'research_area',
+    'research_area_medium',
+    'research_area_small',
+    'project_type',
+    'institute',
+    'performance_type',
+    'region',
+    'region_confidence',
+    'climate_category'
+]
+
+# 정수로 줄일 컬럼 / 손실이 없을 때만 float32로 줄일 측정값 컬럼
+INTEGER_COLUMNS = ['year', 'performance_year', 'project_count']
+MEASURE_COLUMNS = ['budget_billion', 'performance_value', 'employment']
+
+# 문자열 변환 과정에서 생긴 결측값 표현 (로드 시 한 번만 결측값으로 통일)
+NULL_SENTINELS = {'nan', 'NaN', 'None', 'none', 'null', 'NULL', '<NA>', 'NaT'}
+
+# 결측값을 나타내는 필터 선택지 (결측 행을 다른 값과 별개로 남기거나 뺄 수 있음)
+NULL_OPTION = '(미지정)'
+
+def _valid_labels(values):
+    """결측값/결측 문자열을 제외한 문자열 라벨 목록"""
+    labels = []
+    for value in values:
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            continue
+        label = str(value)
+        if label not in NULL_SENTINELS:
+            labels.append(label)
+    return labels
+
+def build_dictionary(series, base=None):
+    """차원 컬럼의 전역 사전 생성 (기존 사전 순서 유지, 새 값은 정렬하여 뒤에 추가)"""
+    base = list(base or [])
+    known = set(base)
+    uniques = series.cat.categories if isinstance(series.dtype, pd.CategoricalDtype) else pd.unique(series)
+    new_labels = sorted({label for label in _valid_labels(uniques) if label not in known})
+    return base + new_labels
+
+def collect_dictionaries(df, base=None):
+    """데이터프레임의 차원 컬럼별 사전 생성 (저장소 매니페스트 기록용)"""
+    base = base or {}
+    return {
+        col: build_dictionary(df[col], base.get(col))
+        for col in DIMENSION_COLUMNS if col in df.columns
+    }
+
+def encode_dimension(series, dictionary):
+    """차원 컬럼을 주어진 사전의 범주형으로 인코딩 (사전에 없는 값/결측 문자열은 결측값)"""
+    codes, uniques = pd.factorize(series)
+    
+    # 고유값 단위로 사전 코드를 구한 뒤 행 단위로 한 번에 매핑 (-1은 결측값)
+    positions = {label: code for code, label in enumerate(dictionary)}
+    lut = np.full(len(uniques) + 1, -1, dtype=np.int32)
+    for i, value in enumerate(uniques):
+        if value is None or (isinstance(value, float) and np.isnan(value)):
+            continue
+        lut[i] = positions.get(str(value), -1)
+    
+    return pd.Series(
+        pd.Categorical.from_codes(lut[codes], categories=dictionary),
+        index=series.index,
+        name=series.name
+    )
+
+def _downcast_integer(series):
+    values = pd.to_numeric(series, errors='coerce')
+    if values.isna().any():
+        return values
+    return pd.to_numeric(values, downcast='integer')
+
+def _downcast_measure(series):
+    """float32로 변환해도 값이 그대로인 경우에만 축소 (합계 정밀도 유지)"""
+    values = pd.to_numeric(series, errors='coerce').astype(float)
+    narrowed = values.astype(np.float32)
+    if np.array_equal(narrowed.to_numpy(dtype=float), values.to_numpy(), equal_nan=True):
+        return narrowed
+    return values
+
+def apply_schema(df, dictionaries=None):
+    """차원 컬럼은 전역 사전 기반 범주형으로, 측정값 컬럼은 작은 숫자형으로 변환"""
+    if df is None:
+        return None
+    
+    dictionaries = dictionaries or {}
+    converted = {}
+    
+    for col in DIMENSION_COLUMNS:
+        if col in df.columns:
+            dictionary = build_dictionary(df[col], dictionaries.get(col))
+            converted[col] = encode_dimension(df[col], dictionary)
+    
+    for col in INTEGER_COLUMNS:
+        if col in df.columns:
+            converted[col] = _downcast_integer(df[col])
+    
+    for col in MEASURE_COLUMNS:
+        if col in df.columns:
+            converted[col] = _downcast_measure(df[col])
+    
+    return df.assign(**converted)
+
+# 연구분야 분류 체계 (수준명, 컬럼)
+TAXONOMY_LEVELS = [
+    ('대분류', 'research_area'),
+    ('중분류', 'research_area_medium'),
+    ('소분류', 'research_area_small')
+]
+
+def _new_node():
+    return {'rows': 0, 'budget': 0.0, 'children': []}
+
+def build_taxonomy_tree(df):
+    """대분류→중분류→소분류 트리 생성 (노드별 행 수/예산 합계, 데이터 로드 시 한 번)
+    
+    노드는 루트부터의 분류값 경로 튜플로 찾으며, 결측 분류값은 None으로 둔다.
+    """
+    # 상위 수준부터 연속으로 존재하는 컬럼만 사용
+    columns = []
+    for _, col in TAXONOMY_LEVELS:
+        if col not in df.columns:
+            break
+        columns.append(col)
+    
+    nodes = {(): _new_node()}
+    tree = {'levels': columns, 'nodes': nodes}
+    if not columns:
+        return tree
+    
+    values = df['budget_billion'] if 'budget_billion' in df.columns else pd.Series(0.0, index=df.index)
+    grouped = values.groupby([df[col] for col in columns], observed=True, dropna=False).agg(['size', 'sum'])
+    
+    for key, rows, budget in zip(grouped.index, grouped['size'], grouped['sum']):
+        key = key if isinstance(key, tuple) else (key,)
+        path = ()
+        nodes[path]['rows'] += int(rows)
+        nodes[path]['budget'] += float(budget)
+        for label in key:
+            label = None if pd.isna(label) else label
+            parent = nodes[path]
+            path = path + (label,)
+            if path not in nodes:
+                nodes[path] = _new_node()
+                parent['children'].append(label)
+            nodes[path]['rows'] += int(rows)
+            nodes[path]['budget'] += float(budget)
+    
+    # 하위 분류는 이름순 정렬 (결측값은 마지막)
+    for node in nodes.values():
+        node['children'].sort(key=lambda label: (label is None, label if label is not None else ''))
+    
+    return tree
+
+def taxonomy_paths(tree, selections):
+    """수준별 선택값을 따라 내려간 노드 경로 목록 (selections[i]는 i번째 수준의 선택값)"""
+    paths = [()]
+    for selected in selections:
+        selected = {None if label == NULL_OPTION else label for label in selected}
+        paths = [
+            path + (label,)
+            for path in paths
+            for label in tree['nodes'][path]['children']
+            if label in selected
+        ]
+    return paths
+
+def taxonomy_children(tree, paths=((),), include_null=False):
+    """주어진 노드들의 하위 분류값 목록 (정렬, include_null이면 결측 하위 분류가 있을 때 NULL_OPTION을 마지막에 추가)"""
+    nodes = tree['nodes']
+    children = [label for path in paths if path in nodes for label in nodes[path]['children']]
+    labels = sorted({label for label in children if label is not None})
+    if include_null and None in children:
+        labels.append(NULL_OPTION)
+    return labels
+
+def taxonomy_levels(tree, selections):
+    """선택된 노드가 있는 분류 수준명 목록 (예: ['대분류', '중분류'])"""
+    levels = []
+    for depth in range(1, min(len(selections), len(tree['levels'])) + 1):
+        if not taxonomy_paths(tree, selections[:depth]):
+            break
+        levels.append(TAXONOMY_LEVELS[depth - 1][0])
+    return levels
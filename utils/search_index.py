@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from collections import defaultdict
+
+# 검색 결과로 보여줄 최대 항목 수
+SEARCH_MAX_RESULTS = 50
+
+def _ngrams(text, sizes=(1, 2)):
+    return {text[i:i + n] for n in sizes for i in range(len(text) - n + 1)}
+
+def build_search_index(series):
+    """차원 값 검색 인덱스 생성 (1·2글자 n-gram → 값 코드, 데이터 로드 시 한 번)
+    
+    범주형 컬럼은 범주 코드를 그대로 값 코드로 사용하므로 전역 사전과 코드가 일치한다.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        labels = [str(label) for label in series.cat.categories]
+    else:
+        codes, uniques = pd.factorize(series, sort=True)
+        labels = [str(label) for label in uniques]
+    
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    lowered = [label.lower() for label in labels]
+    
+    # 실제 데이터에 있는 값만 이름순으로 보관
+    present = sorted(np.flatnonzero(counts).tolist(), key=lambda code: labels[code])
+    
+    postings = defaultdict(set)
+    for code in present:
+        for gram in _ngrams(lowered[code]):
+            postings[gram].add(code)
+    
+    return {
+        'labels': labels,
+        'lowered': lowered,
+        'counts': counts,
+        'nulls': int((codes < 0).sum()),
+        'codes': present,
+        'postings': {gram: frozenset(codes) for gram, codes in postings.items()}
+    }
+
+def search_values(index, query):
+    """검색어를 포함하는 값 코드를 순위순으로 반환
+    
+    완전 일치 → 접두어 일치 → 부분 일치 순이며, 같은 순위에서는 행 수가 많은 값이 먼저 온다.
+    검색어가 비어 있으면 전체 값을 행 수 순으로 반환한다.
+    """
+    query = (query or '').strip().lower()
+    counts = index['counts']
+    
+    if not query:
+        return sorted(index['codes'], key=lambda code: -counts[code])
+    
+    # 검색어의 n-gram 목록을 모두 포함하는 후보만 확인 (작은 목록부터 교집합)
+    grams = _ngrams(query, sizes=(2,)) if len(query) > 1 else {query}
+    postings = sorted((index['postings'].get(gram, frozenset()) for gram in grams), key=len)
+    candidates = set(postings[0]).intersection(*postings[1:])
+    
+    lowered = index['lowered']
+    matches = [code for code in candidates if query in lowered[code]]
+    
+    def rank(code):
+        label = lowered[code]
+        return (0 if label == query else 1 if label.startswith(query) else 2, -counts[code], index['labels'][code])
+    
+    return sorted(matches, key=rank)
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+
+def year_panel(frame, group, measure, year='year', years=None):
+    """긴 형식 집계(그룹, 연도, 측정값)를 (그룹 × 연도) 2차원 배열로 한 번 변환
+    
+    years를 주지 않으면 최소~최대 연도를 빠짐없이 채우며, 값이 없는 연도는 NaN이다.
+    group이 None이면 전체 합계 한 줄짜리 패널을 만든다.
+    """
+    year_values = frame[year].to_numpy()
+    if years is None:
+        years = np.arange(year_values.min(), year_values.max() + 1) if len(frame) else np.array([], dtype=int)
+    years = np.asarray(years)
+    
+    if group is None:
+        group_codes, groups = np.zeros(len(frame), dtype=np.intp), pd.Index([None])
+    else:
+        group_codes, groups = pd.factorize(frame[group], sort=True)
+        groups = pd.Index(groups, name=group)
+    year_codes = np.searchsorted(years, year_values)
+    
+    # 범위 밖 연도/결측 그룹은 제외하고 같은 칸은 합산
+    keep = (group_codes >= 0) & (year_codes < len(years))
+    keep[keep] = years[year_codes[keep]] == year_values[keep]
+    cells = group_codes[keep] * len(years) + year_codes[keep]
+    n_cells = len(groups) * len(years)
+    measure_values = frame[measure].to_numpy()[keep].astype(np.float64)
+    sums = np.bincount(cells, weights=measure_values, minlength=n_cells)
+    present = np.bincount(cells, minlength=n_cells) > 0
+    values = np.where(present, sums, np.nan).reshape(len(groups), len(years))
+    
+    return {
+        'group': group,
+        'groups': groups,
+        'year': year,
+        'years': years,
+        'year_dtype': year_values.dtype,
+        'measure': measure,
+        'dtype': frame[measure].dtype,
+        'values': values
+    }
+
+def _previous_observed(values):
+    """각 칸 직전의 값이 있는 연도 값 (없으면 NaN)"""
+    n_years = values.shape[1]
+    positions = np.where(~np.isnan(values), np.arange(n_years), -1)
+    last_seen = np.maximum.accumulate(positions, axis=1)
+    previous = np.full_like(values, np.nan)
+    previous[:, 1:] = np.take_along_axis(values, np.maximum(last_seen[:, :-1], 0), axis=1)
+    previous[:, 1:][last_seen[:, :-1] < 0] = np.nan
+    return previous
+
+def year_over_year(panel, skip_missing=False):
+    """전년 대비 증감률(%) 배열 (직전 값이 없거나 0 이하이면 NaN)
+    
+    skip_missing=True면 바로 앞 연도 대신 값이 있는 직전 연도와 비교한다.
+    """
+    values = panel['values']
+    if skip_missing:
+        previous = _previous_observed(values)
+    else:
+        previous = np.full_like(values, np.nan)
+        previous[:, 1:] = values[:, :-1]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(previous > 0, (values / previous - 1) * 100, np.nan)
+
+def compound_growth(panel):
+    """그룹별 연평균증가율(CAGR, %) - 값이 있는 첫 연도와 마지막 연도 기준 (계산 불가는 NaN)"""
+    values, years = panel['values'], panel['years']
+    observed = ~np.isnan(values)
+    if not values.size:
+        return np.full(len(values), np.nan)
+    
+    first = np.argmax(observed, axis=1)
+    last = values.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    rows = np.arange(len(values))
+    start, end = values[rows, first], values[rows, last]
+    span = (years[last] - years[first]).astype(np.float64)
+    
+    valid = observed.any(axis=1) & (span > 0) & (start > 0) & (end >= 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(valid, (np.power(end / start, 1 / span) - 1) * 100, np.nan)
+
+def rolling_mean(panel, window, min_periods=1):
+    """연도 방향 이동평균 (값이 없는 연도는 건너뛰고 창 안의 값이 min_periods개 미만이면 NaN)"""
+    values = panel['values']
+    observed = ~np.isnan(values)
+    
+    # 누적합 차이로 창별 합계/개수를 한 번에 계산
+    sums = np.cumsum(np.where(observed, values, 0.0), axis=1)
+    counts = np.cumsum(observed, axis=1)
+    sums[:, window:] = sums[:, window:] - sums[:, :-window]
+    counts[:, window:] = counts[:, window:] - counts[:, :-window]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(counts >= min_periods, sums / counts, np.nan)
+
+def shares(panel):
+    """연도별 그룹 비중(%) - 같은 연도 전체 그룹 합계 대비 (값이 없는 칸은 NaN)"""
+    values = panel['values']
+    totals = np.nansum(values, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals > 0, values / totals * 100, np.nan)
+
+def panel_frame(panel, **metrics):
+    """패널과 지표 배열을 긴 형식 데이터프레임으로 변환 (값이 있는 칸만, 그룹→연도 순)
+    
+    측정값 컬럼은 원래 dtype으로 되돌리고, 지표는 키워드 인자 이름의 컬럼으로 붙인다.
+    """
+    group_codes, year_codes = np.nonzero(~np.isnan(panel['values']))
+    columns = {}
+    if panel['group'] is not None:
+        columns[panel['group']] = panel['groups'].take(group_codes)
+    columns[panel['year']] = panel['years'][year_codes].astype(panel['year_dtype'])
+    columns[panel['measure']] = panel['values'][group_codes, year_codes].astype(panel['dtype'])
+    for name, metric in metrics.items():
+        columns[name] = metric[group_codes, year_codes]
+    return pd.DataFrame(columns)
+
+def panel_series(panel, metric, name=None):
+    """그룹별 지표 벡터(compound_growth 결과 등)를 그룹 인덱스 Series로 변환"""
+    return pd.Series(metric, index=panel['groups'], name=name)